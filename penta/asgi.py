@@ -0,0 +1,152 @@
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence, Union
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIHandler, get_script_prefix
+from django.core.handlers.exception import convert_exception_to_response
+from django.http import HttpRequest
+from django.urls import URLResolver, path
+from django.urls.exceptions import Resolver404
+from django.urls.resolvers import RegexPattern, ResolverMatch
+from django.utils.module_loading import import_string
+
+from penta.request import Request
+
+if TYPE_CHECKING:
+    from penta import Penta  # pragma: no cover
+
+__all__ = ["PentaASGIHandler"]
+
+
+RESOLVER_MATCH_KEY = "penta.resolver_match"
+
+
+class PentaASGIHandler(ASGIHandler):
+    """
+    ASGI application that handles the requests to the api itself and passes
+    everything else to `application` (the regular django ASGI application).
+
+    Api requests skip the project middleware (only `middleware` passed here are
+    used) and the project url resolution. Everything else is the same as in
+    django's ASGIHandler: request_started/request_finished signals, ATOMIC_REQUESTS,
+    middleware hooks (process_view, process_exception, ...).
+    """
+
+    request_class = Request
+
+    def __init__(
+        self,
+        api: "Penta",
+        prefix: str,
+        application: Optional[Callable] = None,
+        middleware: Sequence[Union[str, Callable]] = (),
+    ) -> None:
+        if application is None:
+            from django.core.asgi import get_asgi_application
+
+            application = get_asgi_application()
+        self.api = api
+        self.application = application
+        self.middleware = list(middleware)
+        # not api.urls - the api is (usually) also included in the project urls
+        urls = (api._get_urls(), "penta", api.urls_namespace.split(":")[-1])
+        self.resolver = URLResolver(RegexPattern(r"^/"), [path(prefix, urls)])
+        super().__init__()
+
+    async def __call__(self, scope: Any, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http":
+            resolver_match = self._resolve(scope)
+            if resolver_match is not None:
+                scope[RESOLVER_MATCH_KEY] = resolver_match
+                await super().__call__(scope, receive, send)
+                return
+        await self.application(scope, receive, send)
+
+    def _resolve(self, scope: Any) -> Optional[ResolverMatch]:
+        # the same path_info as ASGIRequest gets
+        script_name = get_script_prefix(scope).rstrip("/")
+        path_info = scope["path"]
+        if script_name and path_info.startswith(script_name):
+            path_info = path_info.removeprefix(script_name)
+        try:
+            return self.resolver.resolve(path_info)
+        except Resolver404:
+            return None
+
+    def resolve_request(self, request: HttpRequest) -> ResolverMatch:
+        resolver_match: ResolverMatch = request.scope[RESOLVER_MATCH_KEY]  # type: ignore
+        request.resolver_match = resolver_match
+        return resolver_match
+
+    def load_middleware(self, is_async: bool = False) -> None:
+        """
+        The same as BaseHandler.load_middleware, for the given `middleware`
+        instead of settings.MIDDLEWARE
+        """
+        self._view_middleware: List[Callable] = []
+        self._template_response_middleware: List[Callable] = []
+        self._exception_middleware: List[Callable] = []
+
+        get_response = (
+            self._get_response_async  # type: ignore[attr-defined]
+            if is_async
+            else self._get_response  # type: ignore[attr-defined]
+        )
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(self.middleware):
+            middleware: Callable = (
+                import_string(middleware_path)
+                if isinstance(middleware_path, str)
+                else middleware_path
+            )
+            middleware_can_sync = getattr(middleware, "sync_capable", True)
+            middleware_can_async = getattr(middleware, "async_capable", False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise RuntimeError(
+                    f"Middleware {middleware} must have at least one of "
+                    "sync_capable/async_capable set to True."
+                )
+            elif not handler_is_async and middleware_can_sync:
+                middleware_is_async = False
+            else:
+                middleware_is_async = middleware_can_async
+            try:
+                adapted_handler = self.adapt_method_mode(
+                    middleware_is_async,
+                    handler,
+                    handler_is_async,
+                    debug=settings.DEBUG,
+                    name=f"middleware {middleware}",
+                )
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed:
+                continue
+
+            if mw_instance is None:
+                raise ImproperlyConfigured(
+                    f"Middleware factory {middleware} returned None."
+                )
+
+            if hasattr(mw_instance, "process_view"):
+                self._view_middleware.insert(
+                    0, self.adapt_method_mode(is_async, mw_instance.process_view)
+                )
+            if hasattr(mw_instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(
+                        is_async, mw_instance.process_template_response
+                    )
+                )
+            if hasattr(mw_instance, "process_exception"):
+                # same as django - the exception-handling stack is synchronous
+                self._exception_middleware.append(
+                    self.adapt_method_mode(False, mw_instance.process_exception)
+                )
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        self._middleware_chain = self.adapt_method_mode(
+            is_async, handler, handler_is_async
+        )
@@ -25,6 +25,25 @@ class Settings(BaseModel):
         alias="PENTA_DEFAULT_THROTTLE_RATES",
     )
 
+    # Renderer / Parser
+    RENDERER_CLASS: str = Field(
+        "penta.renderers.JSONRenderer", alias="PENTA_RENDERER_CLASS"
+    )
+    PARSER_CLASS: str = Field("penta.parser.Parser", alias="PENTA_PARSER_CLASS")
+
+    # Operations
+    COMPILE_OPERATIONS: bool = Field(False, alias="PENTA_COMPILE_OPERATIONS")
+    STREAM_CHUNK_SIZE: int = Field(1000, alias="PENTA_STREAM_CHUNK_SIZE")
+    # how sync operations run under ASGI: "thread_sensitive", "inline" or a pool name
+    SYNC_EXECUTOR: str = Field("thread_sensitive", alias="PENTA_SYNC_EXECUTOR")
+    # thread pools for sync operations: {name: max_workers}
+    SYNC_EXECUTORS: Dict[str, int] = Field({}, alias="PENTA_SYNC_EXECUTORS")
+    # request header with the client's time budget in seconds, e.g. "X-Request-Timeout"
+    DEADLINE_HEADER: Optional[str] = Field(None, alias="PENTA_DEADLINE_HEADER")
+
+    # Urls
+    RADIX_ROUTING: bool = Field(False, alias="PENTA_RADIX_ROUTING")
+
     FIX_REQUEST_FILES_METHODS: Set[str] = Field(
         {"PUT", "PATCH", "DELETE"}, alias="PENTA_FIX_REQUEST_FILES_METHODS"
     )
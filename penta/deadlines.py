@@ -0,0 +1,70 @@
+import math
+import time
+from typing import Optional
+
+from django.http import HttpRequest
+
+from penta import context
+from penta.errors import DeadlineExceeded
+
+__all__ = ["Deadline", "get_deadline", "remaining"]
+
+
+class Deadline:
+    """
+    The time budget of a request - the operation `timeout`, or less when the
+    client sent a shorter one in the deadline header.
+
+    Views and dependencies get it with `get_deadline(request)` (or `remaining()`)
+    to skip work that can't finish in time.
+    """
+
+    __slots__ = ("timeout", "started", "expires")
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.started = time.monotonic()
+        self.expires = self.started + timeout
+
+    def remaining(self) -> float:
+        "Seconds left, 0 when the deadline passed"
+        return max(0.0, self.expires - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def check(self) -> None:
+        "Raises `DeadlineExceeded` (504) when the deadline passed"
+        if self.expired:
+            raise DeadlineExceeded()
+
+    @staticmethod
+    def parse_header(value: Optional[str]) -> Optional[float]:
+        "The budget in a deadline header - seconds as a number, None if invalid"
+        if not value:
+            return None
+        try:
+            budget = float(value)
+        except ValueError:
+            return None
+        return budget if math.isfinite(budget) else None
+
+    def __repr__(self) -> str:
+        return f"<Deadline timeout={self.timeout} remaining={self.remaining():.3f}>"
+
+
+def get_deadline(request: Optional[HttpRequest] = None) -> Optional[Deadline]:
+    "The deadline of the request (the current one by default), None if it has none"
+    if request is None:
+        request = context.request.get()
+    return getattr(request, "deadline", None)
+
+
+def remaining(request: Optional[HttpRequest] = None) -> Optional[float]:
+    "Seconds left until the deadline of the request, None if it has none"
+    deadline = get_deadline(request)
+    return None if deadline is None else deadline.remaining()
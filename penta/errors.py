@@ -1,4 +1,5 @@
 import logging
+import math
 import traceback
 from functools import partial
 from typing import TYPE_CHECKING, Generic, List, Optional, TypeVar
@@ -84,6 +85,23 @@ class Throttled(HttpError):
         super().__init__(status_code=429, message="Too many requests.")
 
 
+class Overloaded(HttpError):
+    "The request was shed by an adaptive limiter or a fair scheduler"
+
+    def __init__(self, wait: Optional[float]) -> None:
+        self.wait = wait
+        super().__init__(
+            status_code=503, message="Service temporarily overloaded, try again later."
+        )
+
+
+class DeadlineExceeded(HttpError):
+    "The operation did not finish within its timeout (or the request deadline)"
+
+    def __init__(self) -> None:
+        super().__init__(status_code=504, message="Request deadline exceeded.")
+
+
 def set_default_exc_handlers(api: "Penta") -> None:
     api.add_exception_handler(
         Exception,
@@ -113,7 +131,13 @@ def _default_404(request: HttpRequest, exc: Exception, api: "Penta") -> HttpResp
 def _default_http_error(
     request: HttpRequest, exc: HttpError, api: "Penta"
 ) -> HttpResponse:
-    return api.create_response(request, {"detail": str(exc)}, status=exc.status_code)
+    response = api.create_response(
+        request, {"detail": str(exc)}, status=exc.status_code
+    )
+    wait = getattr(exc, "wait", None)
+    if wait is not None:
+        response["Retry-After"] = str(math.ceil(wait))
+    return response
 
 
 def _default_validation_error(
@@ -0,0 +1,151 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from penta.errors import ConfigError
+from penta.types import DictStrAny
+
+__all__ = [
+    "THREAD_SENSITIVE",
+    "INLINE",
+    "ExecutorPool",
+    "get_executor_pool",
+    "executor_stats",
+    "run_sync",
+    "validate_sync_executor",
+    "validate_atomic_requests",
+    "atomic_request_databases",
+]
+
+THREAD_SENSITIVE = "thread_sensitive"  # asgiref's sync_to_async default - one thread
+INLINE = "inline"  # in the event loop itself - only for views that never block
+
+
+class ExecutorPool:
+    """
+    A bounded thread pool for sync operations (under ASGI), with queue depth and
+    wait time (from submitting to a worker picking the call up) metrics.
+    """
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"penta-{name}"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def call() -> Any:
+            wait_time = time.perf_counter() - submitted
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.wait_time_total += wait_time
+                self.wait_time_max = max(self.wait_time_max, wait_time)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # the connections of pool threads are not handled by request_finished
+                close_old_connections()
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, context.run, call)
+
+    def stats(self) -> DictStrAny:
+        with self._lock:
+            started = self.completed + self.active
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_max": self.wait_time_max,
+                "wait_time_avg": self.wait_time_total / started if started else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+
+_pools: Dict[str, ExecutorPool] = {}
+_pools_lock = threading.Lock()
+
+
+def validate_sync_executor(name: str) -> None:
+    from penta.conf import settings
+
+    if name not in (THREAD_SENSITIVE, INLINE) and name not in settings.SYNC_EXECUTORS:
+        raise ConfigError(
+            f"Unknown sync executor '{name}': use '{THREAD_SENSITIVE}', '{INLINE}'"
+            f" or a pool from PENTA_SYNC_EXECUTORS {list(settings.SYNC_EXECUTORS)}"
+        )
+
+
+def atomic_request_databases() -> List[str]:
+    "Aliases of the databases with ATOMIC_REQUESTS - django rejects async views then"
+    from django.conf import settings
+
+    return [
+        alias for alias, db in settings.DATABASES.items() if db.get("ATOMIC_REQUESTS")
+    ]
+
+
+def validate_atomic_requests(name: str) -> None:
+    "Pool and inline executors need an async view, which ATOMIC_REQUESTS rejects"
+    databases = atomic_request_databases()
+    if databases:
+        raise ConfigError(
+            f"Sync executor '{name}' needs an async view, which django does not allow"
+            f" with ATOMIC_REQUESTS (databases {databases}): use '{THREAD_SENSITIVE}'"
+            " or transaction.atomic() in the view"
+        )
+
+
+def get_executor_pool(name: str) -> ExecutorPool:
+    "The pool `name` (sized by PENTA_SYNC_EXECUTORS), created on first use"
+    pool: Optional[ExecutorPool] = _pools.get(name)
+    if pool is None:
+        from penta.conf import settings
+
+        validate_sync_executor(name)
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = ExecutorPool(name, settings.SYNC_EXECUTORS[name])
+                _pools[name] = pool
+    return pool
+
+
+def executor_stats() -> Dict[str, DictStrAny]:
+    "Metrics of the pools created so far"
+    return {name: pool.stats() for name, pool in _pools.items()}
+
+
+async def run_sync(executor: str, func: Callable, *args: Any, **kwargs: Any) -> Any:
+    "Runs sync `func` from async code according to the `executor` policy"
+    if executor == THREAD_SENSITIVE:
+        return await sync_to_async(func)(*args, **kwargs)
+    if executor == INLINE:
+        return func(*args, **kwargs)
+    return await get_executor_pool(executor).run(func, *args, **kwargs)
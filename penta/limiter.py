@@ -0,0 +1,132 @@
+import math
+import threading
+from typing import Any, Optional
+
+from penta.types import DictStrAny
+
+__all__ = ["AdaptiveLimiter", "AIMDLimiter", "GradientLimiter"]
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of requests an operation (or a router) processes at the
+    same time; requests over the limit are shed with 503 before any work is done.
+
+    The limit is adapted from the latency of the completed requests by `update()`.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        retry_after: Optional[float] = 1,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.shed = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        "Takes a slot for a request - False if the request should be shed"
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        "Gives the slot back, adapting the limit to the request `latency` (seconds)"
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            self.completed += 1
+            limit = self.update(latency, failed, in_flight)
+            self.limit = min(max(limit, self.min_limit), self.max_limit)
+
+    def update(self, latency: float, failed: bool, in_flight: int) -> float:
+        """
+        Returns the new limit after a request completed in `latency` seconds
+        (`in_flight` - requests being processed, including this one)
+        """
+        raise NotImplementedError(".update() must be overridden")
+
+    def stats(self) -> DictStrAny:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "shed": self.shed,
+                "completed": self.completed,
+            }
+
+
+class AIMDLimiter(AdaptiveLimiter):
+    """
+    Additive increase, multiplicative decrease: the limit grows by one after
+    about `limit` requests faster than `target_latency` and is multiplied by
+    `backoff` when a request is slower or fails.
+    """
+
+    def __init__(
+        self, target_latency: float, backoff: float = 0.9, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.target_latency = target_latency
+        self.backoff = backoff
+
+    def update(self, latency: float, failed: bool, in_flight: int) -> float:
+        if failed or latency > self.target_latency:
+            return self.limit * self.backoff
+        if in_flight * 2 >= self.limit:
+            # only grows when the limit is actually used
+            return self.limit + 1 / self.limit
+        return self.limit
+
+
+class GradientLimiter(AdaptiveLimiter):
+    """
+    Compares the latency of each request with the long term average latency:
+    the limit shrinks by their ratio (the gradient) when requests get slower
+    than `tolerance` times the average and grows by `sqrt(limit)` (room for
+    queued requests) while they don't.
+    """
+
+    def __init__(
+        self,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        long_window: int = 600,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.long_window = long_window
+        self.long_latency: Optional[float] = None
+
+    def update(self, latency: float, failed: bool, in_flight: int) -> float:
+        if self.long_latency is None:
+            self.long_latency = latency
+        else:
+            factor = 2 / (self.long_window + 1)
+            self.long_latency += (latency - self.long_latency) * factor
+        if latency <= 0:
+            return self.limit
+
+        # the average recovers faster after the load is gone
+        if self.long_latency / latency > 2:
+            self.long_latency *= 0.95
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_latency / latency))
+        if failed:
+            gradient = 0.5
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        if in_flight * 2 < self.limit:
+            new_limit = min(new_limit, self.limit)
+        return self.limit * (1 - self.smoothing) + new_limit * self.smoothing
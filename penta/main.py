@@ -1,3 +1,4 @@
+import logging
 import os
 import warnings
 from typing import (
@@ -25,22 +26,30 @@ from penta.errors import (
     ValidationErrorContext,
     set_default_exc_handlers,
 )
+from penta.limiter import AdaptiveLimiter
 from penta.openapi import get_schema
 from penta.openapi.docs import DocsBase, Swagger
 from penta.openapi.schema import OpenAPISchema
 from penta.openapi.urls import get_openapi_urls, get_root_url
 from penta.parser import Parser
-from penta.renderers import BaseRenderer, JSONRenderer
-from penta.router import Router
+from penta.radix import radix_url_patterns
+from penta.renderers import BaseRenderer
+from penta.router import ReverseOnlyPattern, Router
+from penta.scheduling import FairScheduler
 from penta.throttling import BaseThrottle
 from penta.types import DictStrAny, TCallable
 from penta.utils import is_debug_server, normalize_path
 
 if TYPE_CHECKING:
+    from .asgi import PentaASGIHandler  # pragma: no cover
+    from .deadlines import Deadline  # pragma: no cover
     from .operation import Operation  # pragma: no cover
+    from .planner import ExecutionPlan  # pragma: no cover
 
 __all__ = ["Penta"]
 
+logger = logging.getLogger("django")
+
 _E = TypeVar("_E", bound=Exception)
 Exc = Union[_E, Type[_E]]
 ExcHandler = Callable[[HttpRequest, Exc[_E]], HttpResponse]
@@ -68,6 +77,8 @@ class Penta:
         parser: Optional[Parser] = None,
         default_router: Optional[Router] = None,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        compile_operations: Optional[bool] = None,
+        radix_routing: Optional[bool] = None,
     ):
         """
         Args:
@@ -81,9 +92,15 @@ class Penta:
             servers: List of target hosts used in openAPI spec.
             csrf: Require a CSRF token for unsafe request types. See <a href="../csrf">CSRF</a> docs.
             auth (Callable | Sequence[Callable] | NOT_SET | None): Authentication class
-            renderer: Default response renderer
-            parser: Default request parser
+            renderer: Default response renderer (defaults to `PENTA_RENDERER_CLASS`)
+            parser: Default request parser (defaults to `PENTA_PARSER_CLASS`)
+            compile_operations: Build a specialized executor for each operation
+                that only runs the stages it needs (defaults to `PENTA_COMPILE_OPERATIONS`)
+            radix_routing: Resolve the operation urls with a prefix tree mounted as a single
+                url pattern, instead of one django url pattern per path (defaults to `PENTA_RADIX_ROUTING`)
         """
+        from penta.conf import settings
+
         self.title = title
         self.version = version
         self.description = description
@@ -100,9 +117,17 @@ class Penta:
                 DeprecationWarning,
                 stacklevel=2,
             )
-        self.renderer = renderer or JSONRenderer()
-        self.parser = parser or Parser()
+        self.renderer = renderer or import_string(settings.RENDERER_CLASS)()
+        self.parser = parser or import_string(settings.PARSER_CLASS)()
         self.openapi_extra = openapi_extra or {}
+        self.compile_operations = (
+            settings.COMPILE_OPERATIONS
+            if compile_operations is None
+            else compile_operations
+        )
+        self.radix_routing = (
+            settings.RADIX_ROUTING if radix_routing is None else radix_routing
+        )
 
         self._exception_handlers: Dict[Exc, ExcHandler] = {}
         self.set_default_exception_handlers()
@@ -139,6 +164,12 @@ class Penta:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         """
         `GET` operation. See <a href="../operations-parameters">operations
@@ -161,6 +192,12 @@ class Penta:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def post(
@@ -182,6 +219,12 @@ class Penta:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         """
         `POST` operation. See <a href="../operations-parameters">operations
@@ -204,6 +247,12 @@ class Penta:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def delete(
@@ -225,6 +274,12 @@ class Penta:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         """
         `DELETE` operation. See <a href="../operations-parameters">operations
@@ -247,6 +302,12 @@ class Penta:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def patch(
@@ -268,6 +329,12 @@ class Penta:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         """
         `PATCH` operation. See <a href="../operations-parameters">operations
@@ -290,6 +357,12 @@ class Penta:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def put(
@@ -311,6 +384,12 @@ class Penta:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         """
         `PUT` operation. See <a href="../operations-parameters">operations
@@ -333,6 +412,12 @@ class Penta:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def api_operation(
@@ -355,6 +440,12 @@ class Penta:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         return self.default_router.api_operation(
             methods,
@@ -374,6 +465,12 @@ class Penta:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def add_router(
@@ -426,15 +523,51 @@ class Penta:
             # ^ if api included into nested urls, we only care about last bit here
         )
 
+    def asgi_app(
+        self,
+        prefix: str,
+        application: Optional[Callable] = None,
+        middleware: Sequence[Union[str, Callable]] = (),
+    ) -> "PentaASGIHandler":
+        """
+        ASGI application that serves the requests to this api (mounted at `prefix`)
+        directly, with only the given `middleware`, and passes all other requests
+        to `application` (defaults to django's `get_asgi_application()`)
+        """
+        from penta.asgi import PentaASGIHandler
+
+        return PentaASGIHandler(self, prefix, application, middleware)
+
     def _get_urls(self) -> List[Union[URLResolver, URLPattern]]:
         result = get_openapi_urls(self)
 
+        paths: List[URLPattern] = []
         for prefix, router in self._routers:
-            result.extend(router.urls_paths(prefix))
+            paths.extend(router.urls_paths(prefix))
+        if self.radix_routing:
+            paths = radix_url_patterns(paths)
+        result.extend(paths)
 
         result.append(get_root_url(self))
+        # reverse-only patterns go last so resolving never has to scan them:
+        result.sort(key=lambda p: isinstance(p.pattern, ReverseOnlyPattern))
         return result
 
+    def execution_plans(self) -> Dict[str, "ExecutionPlan"]:
+        "How each operation runs - sync/async stages and hops, by `'METHOD /path'`"
+        plans: Dict[str, ExecutionPlan] = {}
+        for prefix, router in self._routers:
+            for path, path_view in router.path_operations.items():
+                full_path = normalize_path(
+                    "/" + "/".join(i for i in (prefix, path) if i)
+                )
+                for operation in path_view.operations:
+                    if operation.plan is None:  # pragma: no cover
+                        continue
+                    for method in operation.methods:
+                        plans[f"{method} {full_path}"] = operation.plan
+        return plans
+
     def get_root_path(self, path_params: DictStrAny) -> str:
         name = f"{self.urls_namespace}:api-root"
         return reverse(name, kwargs=path_params)
@@ -466,6 +599,19 @@ class Penta:
     def create_temporal_response(self, request: HttpRequest) -> HttpResponse:
         return HttpResponse("", content_type=self.get_content_type())
 
+    def on_soft_timeout(self, request: HttpRequest, deadline: "Deadline") -> None:
+        """
+        Called when a sync operation finished after its deadline - sync views
+        can't be cancelled, so by default the overrun is only logged.
+        """
+        logger.warning(
+            "%s %s took %.3fs, over its %.3fs deadline",
+            request.method,
+            request.path,
+            deadline.elapsed(),
+            deadline.timeout,
+        )
+
     def get_content_type(self) -> str:
         return f"{self.renderer.media_type}; charset={self.renderer.charset}"
 
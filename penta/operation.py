@@ -1,14 +1,18 @@
+import asyncio
 import inspect
+import itertools
+import time
 from typing import (
     TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
-    Coroutine,
     Dict,
     Iterable,
     List,
     Optional,
     Sequence,
+    Tuple,
     Type,
     Union,
     cast,
@@ -16,25 +20,72 @@ from typing import (
 
 import pydantic
 from asgiref.sync import async_to_sync
-from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from django.db.models import QuerySet
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    StreamingHttpResponse,
+)
 from django.http.response import HttpResponseBase
 from fast_depends import inject
+from pydantic import TypeAdapter
+from typing_extensions import get_args
 
 from penta import context
 from penta.constants import NOT_SET, NOT_SET_TYPE
+from penta.deadlines import Deadline
 from penta.errors import (
     AuthenticationError,
     ConfigError,
+    DeadlineExceeded,
+    Overloaded,
     Throttled,
     ValidationErrorContext,
 )
-from penta.params.models import TModels
+from penta.executors import (
+    INLINE,
+    THREAD_SENSITIVE,
+    atomic_request_databases,
+    run_sync,
+    validate_atomic_requests,
+    validate_sync_executor,
+)
+from penta.limiter import AdaptiveLimiter
+from penta.params.models import FusedParamModel, TModels
+from penta.planner import (
+    AUTH_STRATEGIES,
+    AWAIT,
+    LOOP_BRIDGE,
+    RACE,
+    SEQUENTIAL,
+    THREAD,
+    ExecutionPlan,
+    plan_operation,
+    warn_about_hops,
+)
+from penta.renderers import ValidatedResponse
 from penta.request import Request
-from penta.schema import Schema, pydantic_version
+from penta.scheduling import FairScheduler
+from penta.schema import DjangoGetter, Schema, pydantic_version
 from penta.signature import ViewSignature, is_async
-from penta.throttling import BaseThrottle
+from penta.signature.details import is_collection_type
+from penta.streaming import (
+    ASYNC_STREAMING,
+    STREAM_FORMATS,
+    JSONArrayStream,
+    prefetch_stream,
+)
+from penta.throttling import (
+    BaseThrottle,
+    ConcurrencyThrottle,
+    acheck_throttles,
+    arelease_concurrency_slots,
+    check_throttles,
+    release_concurrency_slots,
+)
 from penta.types import DictStrAny
-from penta.utils import check_csrf, is_async_callable
+from penta.utils import check_csrf
 
 if TYPE_CHECKING:
     from penta import Penta, Router  # pragma: no cover
@@ -42,6 +93,10 @@ if TYPE_CHECKING:
 __all__ = ["Operation", "PathView", "ResponseObject"]
 
 
+async def _await(awaitable: Awaitable) -> Any:
+    return await awaitable
+
+
 class Operation:
     def __init__(
         self,
@@ -64,17 +119,25 @@ class Operation:
         include_in_schema: bool = True,
         url_name: Optional[str] = None,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> None:
         from penta.compatibility.files import (
             FIX_MIDDLEWARE_PATH,
             need_to_fix_request_files,
         )
+        from penta.conf import settings
 
         self.is_async = False
         self.path: str = path
         self.methods: List[str] = methods
         self.view_func: Callable = view_func
         self.api: Penta = cast("Penta", None)
+        self._executor: Optional[Callable] = None
         if url_name is not None:
             self.url_name = url_name
 
@@ -86,6 +149,12 @@ class Operation:
             throttle = [throttle]
         self.throttle_param = throttle
         self.throttle_objects: List[BaseThrottle] = []
+        self._concurrency_throttled = False
+        self._deadline_header: Optional[str] = None
+        self._guarded = False
+        self.plan: Optional[ExecutionPlan] = None
+        self._auth_plan: List[Tuple[Callable, str]] = []
+        self._race_auth = False
         if throttle is not NOT_SET:
             for th in throttle:  # type: ignore
                 assert isinstance(
@@ -95,8 +164,17 @@ class Operation:
 
         self.signature = ViewSignature(self.path, self.view_func)
         self.models: TModels = self.signature.models
+        self.fused_model = FusedParamModel.create(self.models)
+        self._unfused_models: TModels = [
+            m
+            for m in self.models
+            if not (
+                self.fused_model and m in self.fused_model.__penta_models__.values()
+            )
+        ]
 
         self.response_models: Dict[Any, Any]
+        self._response_adapters: Dict[Any, TypeAdapter] = {}
         if response is NOT_SET:
             self.response_models = {200: NOT_SET}
         elif isinstance(response, dict):
@@ -104,6 +182,33 @@ class Operation:
         else:
             self.response_models = {200: self._create_response_model(response)}
 
+        self.limiter = limiter
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.auth_strategy = auth_strategy
+        if auth_strategy is not None:
+            self._validate_auth_strategy(auth_strategy)
+        self.sync_executor = sync_executor
+        if sync_executor is not None:
+            validate_sync_executor(sync_executor)
+
+        self.stream = bool(stream)
+        self.stream_chunk_size: int = settings.STREAM_CHUNK_SIZE
+        self._stream_item_adapters: Dict[Any, TypeAdapter] = {}
+        stream_format = "json" if stream is True else stream or "json"
+        if stream_format not in STREAM_FORMATS:
+            raise ConfigError(
+                f"Operation '{path}' has unknown stream format {stream!r} "
+                f"(supported: {', '.join(STREAM_FORMATS)})"
+            )
+        self.stream_class = STREAM_FORMATS[stream_format]
+        if stream and not any(
+            self._is_stream_model(m) for m in self.response_models.values()
+        ):
+            raise ConfigError(
+                f"Operation '{path}' uses stream=True, that requires a collection response (e.g. response=List[SomeSchema])"
+            )
+
         if need_to_fix_request_files(methods, self.models):
             raise ConfigError(
                 f"Router '{path}' has method(s) {methods}  that require fixing request.FILES. "
@@ -131,6 +236,42 @@ class Operation:
                 callback(self)
 
     def run(self, request: HttpRequest, **kw: Any) -> HttpResponseBase:
+        self._set_request(request)
+        if not self._guarded:
+            return self._run(request, kw)
+        return self._run_guarded(request, kw, self.limiter)
+
+    async def run_from_async(self, request: HttpRequest, **kw: Any) -> HttpResponseBase:
+        """
+        `run` in the sync executor of the operation, for async path views.
+        The adaptive limiter is checked first, in the event loop - requests over
+        the limit are shed instead of waiting for a thread
+        """
+        executor = cast(str, self.sync_executor)
+        limiter = self.limiter
+        if limiter is None:
+            return cast(
+                HttpResponseBase, await run_sync(executor, self.run, request, **kw)
+            )
+        if not limiter.acquire():
+            self._set_request(request)
+            return self.api.on_exception(request, Overloaded(limiter.retry_after))
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await run_sync(executor, self._run_admitted, request, kw)
+            return cast(HttpResponseBase, response)
+        finally:
+            # the latency includes the wait for the executor
+            failed = response is None or response.status_code >= 500
+            limiter.release(time.perf_counter() - started, failed)
+
+    def _run_admitted(self, request: HttpRequest, kw: DictStrAny) -> HttpResponseBase:
+        "`run` for a request that `run_from_async` took a limiter slot for"
+        self._set_request(request)
+        return self._run_guarded(request, kw, None)
+
+    def _set_request(self, request: HttpRequest) -> None:
         # This is a trick to override the class of the request ... After the instanciation
         # `request` is an ASGIRequest instance from Django.
         # `Request` is our custom class, that inherit from ASGIRequest.
@@ -139,6 +280,54 @@ class Operation:
         request.__class__ = Request
         context.request.set(request)
 
+    def _run_guarded(
+        self,
+        request: HttpRequest,
+        kw: DictStrAny,
+        limiter: Optional[AdaptiveLimiter],
+    ) -> HttpResponseBase:
+        """
+        `_run` with the deadline, the adaptive limiter and the release of
+        concurrency throttles
+        """
+        deadline = self._start_deadline(request)
+        if deadline is not None and deadline.expired:
+            return self.api.on_exception(request, DeadlineExceeded())
+        if limiter is not None and not limiter.acquire():
+            # shed before any other work
+            return self.api.on_exception(request, Overloaded(limiter.retry_after))
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self._run(request, kw)
+            return response
+        finally:
+            if limiter is not None:
+                failed = response is None or response.status_code >= 500
+                limiter.release(time.perf_counter() - started, failed)
+            if self._concurrency_throttled:
+                release_concurrency_slots(request, response)
+            if deadline is not None and deadline.expired:
+                # a sync view can't be interrupted - the overrun is only reported
+                self.api.on_soft_timeout(request, deadline)
+
+    def _start_deadline(self, request: HttpRequest) -> Optional[Deadline]:
+        "The deadline of the request (`request.deadline`) - the timeout or the header"
+        timeout = self.timeout
+        if self._deadline_header is not None:
+            budget = Deadline.parse_header(request.headers.get(self._deadline_header))
+            if budget is not None and (timeout is None or budget < timeout):
+                timeout = budget
+        if timeout is None:
+            return None
+        deadline = Deadline(timeout)
+        request.deadline = deadline  # type: ignore
+        return deadline
+
+    def _run(self, request: HttpRequest, kw: DictStrAny) -> HttpResponseBase:
+        if self._executor is not None:
+            return cast(HttpResponseBase, self._executor(request, kw))
+
         error = self._run_checks(request)
         if error:
             return error
@@ -186,6 +375,194 @@ class Operation:
             if router.tags is not None:
                 self.tags = router.tags
 
+        if self.sync_executor is None:
+            from penta.conf import settings
+
+            self.sync_executor = router.sync_executor or settings.SYNC_EXECUTOR
+            validate_sync_executor(self.sync_executor)
+        if (
+            self.stream
+            and not self.is_async
+            and self.sync_executor not in (THREAD_SENSITIVE, INLINE)
+        ):
+            # a streamed QuerySet is read after the view returned - by django, in
+            # its thread sensitive thread; the pool would close the connection first
+            self.sync_executor = THREAD_SENSITIVE
+
+        if self.limiter is None:
+            self.limiter = router.limiter
+
+        if self.is_async:
+            if self.scheduler is None:
+                self.scheduler = router.scheduler
+        elif self.scheduler is not None:
+            raise ConfigError(
+                f"'{self.view_func.__name__}': scheduler works only with async operations"
+            )
+
+        self._concurrency_throttled = any(
+            isinstance(th, ConcurrencyThrottle) for th in self.throttle_objects
+        )
+
+        if self.auth_strategy is None:
+            self.auth_strategy = router.auth_strategy or SEQUENTIAL
+            self._validate_auth_strategy(self.auth_strategy)
+
+        if self.timeout is None:
+            self.timeout = router.timeout
+        from penta.conf import settings
+
+        self._deadline_header = settings.DEADLINE_HEADER
+        self._guarded = (
+            self.limiter is not None
+            or self._concurrency_throttled
+            or self.timeout is not None
+            or self._deadline_header is not None
+        )
+
+        self.plan = plan_operation(self)
+        warn_about_hops(self.plan, self.view_func)
+        self._auth_plan = list(zip(self.auth_callbacks, self.plan.auth_runs()))
+        self._race_auth = self.plan.auth_strategy == RACE
+        self._executor = self._build_executor() if api.compile_operations else None
+
+    def _validate_auth_strategy(self, auth_strategy: str) -> None:
+        if auth_strategy not in AUTH_STRATEGIES:
+            raise ConfigError(
+                f"'{self.view_func.__name__}': unknown auth_strategy {auth_strategy!r} "
+                f"(supported: {', '.join(AUTH_STRATEGIES)})"
+            )
+
+    def _build_executor(self) -> Callable[[HttpRequest, DictStrAny], Any]:
+        """
+        Builds a request executor specialized for this operation.
+        Only the stages this operation actually needs are included, so the
+        per request work is reduced to a flat sequence of calls.
+        """
+        checks = self._build_checks()
+        get_values = self._build_values_getter()
+        to_response = self._build_result_handler()
+        need_temporal_response = self._needs_temporal_response()
+        create_temporal_response = self.api.create_temporal_response
+        view_func = self.view_func
+        on_exception = self.api.on_exception
+
+        def executor(request: HttpRequest, path_params: DictStrAny) -> Any:
+            for check in checks:
+                error = check(request)
+                if error:
+                    return error
+            try:
+                temporal_response = (
+                    create_temporal_response(request)
+                    if need_temporal_response
+                    else None
+                )
+                values = get_values(request, path_params, temporal_response)
+                result = view_func(**values)
+                return to_response(request, result, temporal_response)
+            except Exception as e:
+                if isinstance(e, TypeError) and "required positional argument" in str(
+                    e
+                ):
+                    msg = "Did you fail to use functools.wraps() in a decorator?"
+                    msg = f"{e.args[0]}: {msg}" if e.args else msg
+                    e.args = (msg,) + e.args[1:]
+                return on_exception(request, e)
+
+        return executor
+
+    def _build_checks(self) -> List[Callable]:
+        "Returns the security/throttle stages in the order `_run_checks` runs them"
+        checks: List[Callable] = []
+        if self.api.csrf:
+            checks.append(self._check_csrf)
+        if self.auth_callbacks:
+            checks.append(self._run_authentication)
+        if self.throttle_objects:
+            checks.append(self._check_throttles)
+        return checks
+
+    def _check_csrf(self, request: HttpRequest) -> Optional[HttpResponse]:
+        return check_csrf(request, self.view_func)
+
+    def _needs_temporal_response(self) -> bool:
+        from penta.main import Penta
+
+        if self.signature.response_arg:
+            return True
+        # an overridden create_temporal_response may customize every response
+        return (
+            type(self.api).create_temporal_response
+            is not Penta.create_temporal_response
+        )
+
+    def _build_values_getter(self) -> Callable:
+        response_arg = self.signature.response_arg
+        if self.models:
+            return self._get_values
+
+        def get_values(
+            request: HttpRequest,
+            path_params: DictStrAny,
+            temporal_response: Optional[HttpResponse],
+        ) -> DictStrAny:
+            if response_arg:
+                return {response_arg: temporal_response}
+            return {}
+
+        return get_values
+
+    def _build_result_handler(self) -> Callable:
+        api = self.api
+
+        def generic(
+            request: HttpRequest,
+            result: Any,
+            temporal_response: Optional[HttpResponse],
+        ) -> HttpResponseBase:
+            if temporal_response is None:
+                temporal_response = api.create_temporal_response(request)
+            return self._result_to_response(request, result, temporal_response)
+
+        if len(self.response_models) != 1 or self.stream:
+            return generic
+
+        status, response_model = next(iter(self.response_models.items()))
+        if status is Ellipsis:
+            return generic
+
+        def to_response(
+            request: HttpRequest,
+            result: Any,
+            temporal_response: Optional[HttpResponse],
+        ) -> HttpResponseBase:
+            if isinstance(result, HttpResponseBase):
+                return result
+            if isinstance(result, tuple) and len(result) == 2:
+                # explicit status code - needs the full lookup
+                return generic(request, result, temporal_response)
+
+            if response_model is None:
+                if temporal_response is None:
+                    temporal_response = api.create_temporal_response(request)
+                temporal_response.status_code = status
+                return temporal_response
+
+            if response_model is not NOT_SET:
+                result = self._validate_response(
+                    request, result, status, response_model
+                )
+
+            if temporal_response is None:
+                return api.create_response(request, result, status=status)
+            temporal_response.status_code = status
+            return api.create_response(
+                request, result, temporal_response=temporal_response
+            )
+
+        return to_response
+
     def _set_auth(
         self, auth: Optional[Union[Sequence[Callable], Callable, object]]
     ) -> None:
@@ -217,14 +594,12 @@ class Operation:
         return None
 
     def _run_authentication(self, request: HttpRequest) -> Optional[HttpResponse]:
-        for callback in self.auth_callbacks:
+        for callback, runs in self._auth_plan:
             try:
-                if is_async_callable(callback) or getattr(callback, "is_async", False):
-                    result = callback(request)
-                    if inspect.iscoroutine(result):
-                        result = async_to_sync(callback)(request)
-                else:
-                    result = callback(request)
+                result = callback(request)
+                if runs == LOOP_BRIDGE and inspect.isawaitable(result):
+                    # (None without credentials) - awaited once, not called again
+                    result = async_to_sync(_await)(result)
             except Exception as exc:
                 return self.api.on_exception(request, exc)
 
@@ -234,11 +609,12 @@ class Operation:
         return self.api.on_exception(request, AuthenticationError())
 
     def _check_throttles(self, request: HttpRequest) -> Optional[HttpResponse]:
-        throttle_durations = []
-        for throttle in self.throttle_objects:
-            if not throttle.allow_request(request):
-                throttle_durations.append(throttle.wait())
+        throttle_durations = check_throttles(request, self.throttle_objects)
+        return self._throttled(request, throttle_durations)
 
+    def _throttled(
+        self, request: HttpRequest, throttle_durations: List[Optional[float]]
+    ) -> Optional[HttpResponse]:
         if throttle_durations:
             # Filter out `None` values which may happen in case of config / rate
             durations = [
@@ -281,6 +657,11 @@ class Operation:
 
         temporal_response.status_code = status
 
+        if self.stream and self._is_stream_model(response_model):
+            return self._create_streaming_response(
+                request, result, status, response_model, temporal_response
+            )
+
         if response_model is NOT_SET:
             return self.api.create_response(
                 request, result, temporal_response=temporal_response
@@ -290,6 +671,19 @@ class Operation:
             # Empty response.
             return temporal_response
 
+        result = self._validate_response(request, result, status, response_model)
+        return self.api.create_response(
+            request, result, temporal_response=temporal_response
+        )
+
+    def _validate_response(
+        self, request: HttpRequest, result: Any, status: int, response_model: Any
+    ) -> Any:
+        if self.api.renderer.accepts_validated:
+            return self._validate_response_value(
+                request, result, status, response_model
+            )
+
         resp_object = ResponseObject(result)
         # ^ we need object because getter_dict seems work only with model_validate
         validated_object = response_model.model_validate(
@@ -303,23 +697,118 @@ class Operation:
                 context={"request": request, "response_status": status}
             )
 
-        result = validated_object.model_dump(
+        return validated_object.model_dump(
             by_alias=self.by_alias,
             exclude_unset=self.exclude_unset,
             exclude_defaults=self.exclude_defaults,
             exclude_none=self.exclude_none,
             **model_dump_kwargs,
         )["response"]
-        return self.api.create_response(
-            request, result, temporal_response=temporal_response
+
+    def _validate_response_value(
+        self, request: HttpRequest, result: Any, status: int, response_model: Any
+    ) -> ValidatedResponse:
+        """
+        Validates the result against the response annotation only (no wrapping
+        schema), so the renderer can serialize it with a single pydantic-core call.
+        """
+        context = {"request": request, "response_status": status}
+        adapter = self._get_response_adapter(response_model)
+        # same conversions (querysets, managers, callables...) as the wrapping schema:
+        value = DjangoGetter(ResponseObject(result), response_model, context).response
+        value = adapter.validate_python(value, from_attributes=True, context=context)
+
+        dump_kwargs = self._get_dump_kwargs(request, status)
+        return ValidatedResponse(value, adapter, dump_kwargs)
+
+    def _get_dump_kwargs(self, request: HttpRequest, status: int) -> DictStrAny:
+        dump_kwargs: DictStrAny = {
+            "by_alias": self.by_alias,
+            "exclude_unset": self.exclude_unset,
+            "exclude_defaults": self.exclude_defaults,
+            "exclude_none": self.exclude_none,
+        }
+        if pydantic_version >= [2, 7]:
+            # pydantic added support for serialization context at 2.7
+            dump_kwargs["context"] = {"request": request, "response_status": status}
+        return dump_kwargs
+
+    def _is_stream_model(self, response_model: Any) -> bool:
+        if response_model is None or response_model is NOT_SET:
+            return False
+        return is_collection_type(response_model.__annotations__["response"])
+
+    def _get_stream_item_adapter(self, response_model: Any) -> TypeAdapter:
+        adapter = self._stream_item_adapters.get(response_model)
+        if adapter is None:
+            annotation = response_model.__annotations__["response"]
+            item_type = (get_args(annotation) or (Any,))[0]
+            adapter = TypeAdapter(item_type)
+            self._stream_item_adapters[response_model] = adapter
+        return adapter
+
+    def _create_streaming_response(
+        self,
+        request: HttpRequest,
+        result: Any,
+        status: int,
+        response_model: Any,
+        temporal_response: HttpResponse,
+    ) -> StreamingHttpResponse:
+        stream = self._create_stream(request, status, response_model)
+        content = stream.iter_content(result)
+        first_chunk = next(content)
+        # ^ produced eagerly so errors are still reported with a proper status
+
+        return self._streaming_response(
+            stream, itertools.chain([first_chunk], content), status, temporal_response
+        )
+
+    def _create_stream(
+        self, request: HttpRequest, status: int, response_model: Any
+    ) -> JSONArrayStream:
+        return self.stream_class(
+            self,
+            request,
+            status,
+            self._get_stream_item_adapter(response_model),
+            self._get_dump_kwargs(request, status),
         )
 
+    def _streaming_response(
+        self,
+        stream: JSONArrayStream,
+        content: Any,
+        status: int,
+        temporal_response: HttpResponse,
+    ) -> StreamingHttpResponse:
+        content_type = stream.content_type or temporal_response["Content-Type"]
+        response = StreamingHttpResponse(
+            content, status=status, content_type=content_type
+        )
+        for header, value in temporal_response.items():
+            if header != "Content-Type":
+                response[header] = value
+        response.cookies = temporal_response.cookies
+        return response
+
+    def _get_response_adapter(self, response_model: Any) -> TypeAdapter:
+        adapter = self._response_adapters.get(response_model)
+        if adapter is None:
+            adapter = TypeAdapter(response_model.__annotations__["response"])
+            self._response_adapters[response_model] = adapter
+        return adapter
+
     def _get_values(
         self, request: HttpRequest, path_params: Any, temporal_response: HttpResponse
     ) -> DictStrAny:
-        values = {}
+        values: DictStrAny = {}
         error_contexts: List[ValidationErrorContext] = []
-        for model in self.models:
+        if self.fused_model is not None:
+            values, error_contexts = self.fused_model.resolve_values(
+                request, self.api, path_params
+            )
+        for model in self._unfused_models:
             try:
                 data = model.resolve(request, self.api, path_params)
                 values.update(data)
@@ -328,6 +817,9 @@ class Operation:
                     ValidationErrorContext(pydantic_validation_error=e, model=model)
                 )
         if error_contexts:
+            if self.fused_model is not None:
+                # errors are reported in the order of the params
+                error_contexts.sort(key=lambda c: self.models.index(c.model))
             validation_error = self.api.validation_error_from_error_contexts(
                 error_contexts
             )
@@ -366,17 +858,154 @@ class AsyncOperation(Operation):
         # It like ... inheritence in the future ¯\_(ツ)_/¯
         request.__class__ = Request
         context.request.set(request)
+
+        if not self._guarded:
+            return await self._run(request, kw)
+        return await self._run_guarded(request, kw)
+
+    async def _run_guarded(  # type: ignore[override]
+        self, request: HttpRequest, kw: DictStrAny
+    ) -> HttpResponseBase:
+        deadline = self._start_deadline(request)
+        if deadline is not None and deadline.expired:
+            return self.api.on_exception(request, DeadlineExceeded())
+        limiter = self.limiter
+        if limiter is not None and not limiter.acquire():
+            return self.api.on_exception(request, Overloaded(limiter.retry_after))
+        started = time.perf_counter()
+        response = None
+        try:
+            if deadline is None:
+                response = await self._run(request, kw)
+            else:
+                response = await self._run_until(request, kw, deadline)
+            return response
+        finally:
+            if limiter is not None:
+                failed = response is None or response.status_code >= 500
+                limiter.release(time.perf_counter() - started, failed)
+            if self._concurrency_throttled:
+                await arelease_concurrency_slots(request, response)
+
+    async def _run_until(
+        self, request: HttpRequest, kw: DictStrAny, deadline: Deadline
+    ) -> HttpResponseBase:
+        "`_run`, cancelled when the deadline passes"
+        try:
+            return await asyncio.wait_for(self._run(request, kw), deadline.remaining())
+        except asyncio.TimeoutError:
+            return self.api.on_exception(request, DeadlineExceeded())
+
+    async def _run(self, request: HttpRequest, kw: DictStrAny) -> HttpResponseBase:  # type: ignore
+        if self._executor is not None:
+            return cast(HttpResponseBase, await self._executor(request, kw))
+
         error = await self._run_checks(request)
         if error:
             return error
+        if self.scheduler is not None:
+            try:
+                async with self.scheduler.admit(request):
+                    return await self._run_view(request, kw)
+            except Overloaded as e:
+                return self.api.on_exception(request, e)
+        return await self._run_view(request, kw)
+
+    async def _run_view(self, request: HttpRequest, kw: DictStrAny) -> HttpResponseBase:
         try:
             temporal_response = self.api.create_temporal_response(request)
             values = self._get_values(request, kw, temporal_response)
             result = await self.view_func(**values)
-            return self._result_to_response(request, result, temporal_response)
+            response = self._result_to_response(request, result, temporal_response)
+            if self.stream:
+                await prefetch_stream(response)
+            return response
         except Exception as e:
             return self.api.on_exception(request, e)
 
+    def _build_executor(self) -> Callable[[HttpRequest, DictStrAny], Any]:
+        checks = [
+            (check, inspect.iscoroutinefunction(check))
+            for check in self._build_checks()
+        ]
+        get_values = self._build_values_getter()
+        to_response = self._build_result_handler()
+        need_temporal_response = self._needs_temporal_response()
+        create_temporal_response = self.api.create_temporal_response
+        view_func = self.view_func
+        on_exception = self.api.on_exception
+        stream = self.stream
+        scheduler = self.scheduler
+
+        async def executor(request: HttpRequest, path_params: DictStrAny) -> Any:
+            for check, check_is_async in checks:
+                error = check(request)
+                if check_is_async:
+                    error = await error
+                if error:
+                    return error
+            if scheduler is not None:
+                try:
+                    async with scheduler.admit(request):
+                        return await run_view(request, path_params)
+                except Overloaded as e:
+                    return on_exception(request, e)
+            return await run_view(request, path_params)
+
+        async def run_view(request: HttpRequest, path_params: DictStrAny) -> Any:
+            try:
+                temporal_response = (
+                    create_temporal_response(request)
+                    if need_temporal_response
+                    else None
+                )
+                values = get_values(request, path_params, temporal_response)
+                result = await view_func(**values)
+                response = to_response(request, result, temporal_response)
+                if stream:
+                    await prefetch_stream(response)
+                return response
+            except Exception as e:
+                return on_exception(request, e)
+
+        return executor
+
+    def _create_streaming_response(
+        self,
+        request: HttpRequest,
+        result: Any,
+        status: int,
+        response_model: Any,
+        temporal_response: HttpResponse,
+    ) -> StreamingHttpResponse:
+        if not isinstance(result, QuerySet) and not hasattr(result, "__aiter__"):
+            return super()._create_streaming_response(
+                request, result, status, response_model, temporal_response
+            )
+        # async iterables (and querysets - those can't be iterated synchronously here)
+        # are consumed by the ASGI handler; the first chunk is taken in `prefetch_stream`
+        if not ASYNC_STREAMING:
+            raise ConfigError(
+                f"'{self.view_func.__name__}': streaming an async iterable or a "
+                "QuerySet from an async operation requires Django 4.2+ - return a "
+                "list, or make the operation sync"
+            )
+        stream = self._create_stream(request, status, response_model)
+        return self._streaming_response(
+            stream, stream.aiter_content(result), status, temporal_response
+        )
+
+    def _build_checks(self) -> List[Callable]:
+        "Same stages as the sync version, in the order of `AsyncOperation._run_checks`"
+        checks: List[Callable] = []
+        if self.auth_callbacks:
+            checks.append(self._run_authentication)
+        if self.api.csrf:
+            checks.append(self._check_csrf)
+        if self.throttle_objects:
+            checks.append(self._check_throttles)
+        return checks
+
     async def _run_checks(self, request: HttpRequest) -> Optional[HttpResponse]:  # type: ignore
         "Runs security checks for each operation"
         # NOTE: if you change anything in this function - do this also in Sync Operation
@@ -395,23 +1024,22 @@ class AsyncOperation(Operation):
 
         # Throttling:
         if self.throttle_objects:
-            error = self._check_throttles(request)
+            error = await self._check_throttles(request)
             if error:
                 return error
 
         return None
 
+    async def _check_throttles(self, request: HttpRequest) -> Optional[HttpResponse]:  # type: ignore
+        throttle_durations = await acheck_throttles(request, self.throttle_objects)
+        return self._throttled(request, throttle_durations)
+
     async def _run_authentication(self, request: HttpRequest) -> Optional[HttpResponse]:  # type: ignore
-        for callback in self.auth_callbacks:
+        if self._race_auth:
+            return await self._race_authentication(request)
+        for callback, runs in self._auth_plan:
             try:
-                if is_async_callable(callback) or getattr(callback, "is_async", False):
-                    cor: Optional[Coroutine] = callback(request)
-                    if cor is None:
-                        result = None
-                    else:
-                        result = await cor
-                else:
-                    result = callback(request)
+                result = await self._authenticate(callback, runs, request)
             except Exception as exc:
                 return self.api.on_exception(request, exc)
 
@@ -420,12 +1048,60 @@ class AsyncOperation(Operation):
                 return None
         return self.api.on_exception(request, AuthenticationError())
 
+    async def _race_authentication(
+        self, request: HttpRequest
+    ) -> Optional[HttpResponse]:
+        """
+        auth_strategy="race": awaited callbacks start together, but results are
+        still taken in the declared order - a callback wins only once all the
+        callbacks before it failed, and an exception of a callback is returned
+        only if it would have been reached sequentially. Threaded callbacks are
+        not started early - they share the sync_executor thread and can't be
+        cancelled - they run in order, like the ones called directly.
+        """
+        tasks: Dict[int, asyncio.Future] = {
+            index: asyncio.ensure_future(self._authenticate(callback, runs, request))
+            for index, (callback, runs) in enumerate(self._auth_plan)
+            if runs == AWAIT
+        }
+        try:
+            for index, (callback, runs) in enumerate(self._auth_plan):
+                try:
+                    if index in tasks:
+                        result = await tasks[index]
+                    else:
+                        result = await self._authenticate(callback, runs, request)
+                except Exception as exc:
+                    return self.api.on_exception(request, exc)
+
+                if result:
+                    request.auth = result  # type: ignore
+                    return None
+            return self.api.on_exception(request, AuthenticationError())
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # a lost race is not an unretrieved error
+
+    async def _authenticate(
+        self, callback: Callable, runs: str, request: HttpRequest
+    ) -> Any:
+        if runs == THREAD:
+            return await run_sync(self.sync_executor, callback, request)  # type: ignore[arg-type]
+        result = callback(request)
+        if runs == AWAIT and result is not None:
+            result = await result
+        return result
+
 
 class PathView:
     def __init__(self) -> None:
         self.operations: List[Operation] = []
         self.is_async = False  # if at least one operation is async - will become True
         self.url_name: Optional[str] = None
+        self.operations_by_method: Dict[str, Operation] = {}
 
     def add_operation(
         self,
@@ -448,6 +1124,12 @@ class PathView:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Operation:
         if url_name:
             self.url_name = url_name
@@ -478,9 +1160,18 @@ class PathView:
             include_in_schema=include_in_schema,
             url_name=url_name,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
         self.operations.append(operation)
+        for method in methods:
+            # the first operation registered for a method handles it
+            self.operations_by_method.setdefault(method, operation)
         view_func._penta_operation = operation  # type: ignore
         return operation
 
@@ -490,11 +1181,20 @@ class PathView:
             op.set_api_instance(api, router)
 
     def get_view(self) -> Callable:
-        view: Callable
+        view: Callable = self._sync_view
         if self.is_async:
             view = self._async_view
-        else:
-            view = self._sync_view
+        for op in self.operations:
+            if op.is_async:
+                continue
+            if op.sync_executor not in (None, THREAD_SENSITIVE):
+                # sync operations with their own executor need an async view to pick
+                # it - under WSGI too, where it costs an async_to_sync (see the plan)
+                validate_atomic_requests(op.sync_executor)  # type: ignore[arg-type]
+                view = self._async_view
+            elif op.limiter is not None and not atomic_request_databases():
+                # to shed in the event loop, before the hop to a thread
+                view = self._async_view
 
         view.__func__.csrf_exempt = True  # type: ignore
         return view
@@ -508,26 +1208,20 @@ class PathView:
     async def _async_view(
         self, request: HttpRequest, *a: Any, **kw: Any
     ) -> HttpResponseBase:
-        from asgiref.sync import sync_to_async
-
         operation = self._find_operation(request)
         if operation is None:
             return self._not_allowed()
         if operation.is_async:
             return await cast(AsyncOperation, operation).run(request, *a, **kw)
-        return await sync_to_async(operation.run)(request, *a, **kw)
+        return await operation.run_from_async(request, **kw)
 
     def _find_operation(self, request: HttpRequest) -> Optional[Operation]:
-        for op in self.operations:
-            if request.method in op.methods:
-                return op
-        return None
+        return self.operations_by_method.get(request.method)  # type: ignore
 
     def _not_allowed(self) -> HttpResponse:
-        allowed_methods = set()
-        for op in self.operations:
-            allowed_methods.update(op.methods)
-        return HttpResponseNotAllowed(allowed_methods, content=b"Method not allowed")
+        return HttpResponseNotAllowed(
+            self.operations_by_method, content=b"Method not allowed"
+        )
 
 
 class ResponseObject:
@@ -13,12 +13,15 @@ from typing import (
     Union,
 )
 
+import pydantic
 from django.conf import settings
 from django.http import HttpRequest
-from pydantic import BaseModel
+from django.utils.datastructures import MultiValueDict
+from pydantic import BaseModel, TypeAdapter
 from pydantic.fields import FieldInfo
 
-from penta.errors import HttpError
+from penta.errors import HttpError, ValidationErrorContext
+from penta.parser import ORJSONParser, Parser
 from penta.types import DictStrAny
 
 if TYPE_CHECKING:
@@ -33,6 +36,7 @@ __all__ = [
     "BodyModel",
     "FormModel",
     "FileModel",
+    "FusedParamModel",
 ]
 
 TModel = TypeVar("TModel", bound="ParamModel")
@@ -73,6 +77,13 @@ class ParamModel(BaseModel, ABC):
         if not flatten_map:
             return data
 
+        flat_map = getattr(cls, "__penta_flat_map__", None)
+        if flat_map is not None:
+            # no nested schemas - just picking (and renaming) the declared keys
+            return {
+                name: data[k] for k, name in flat_map.items() if data.get(k) is not None
+            }
+
         mapped_data: DictStrAny = NestedDict()
         for k in flatten_map:
             if k in data:
@@ -90,14 +101,29 @@ class ParamModel(BaseModel, ABC):
         else:
             cls._map_data_path(data[path[0]], value, path[1:])
 
+    @classmethod
+    def _parse_querydict(
+        cls, data: MultiValueDict, api: "Penta", request: HttpRequest
+    ) -> DictStrAny:
+        list_fields = getattr(cls, "__penta_collection_fields__", [])
+        flatten_map = getattr(cls, "__penta_flatten_map__", None)
+        if flatten_map and type(api.parser).parse_querydict is Parser.parse_querydict:
+            # the same as Parser.parse_querydict, but only for the declared keys
+            # (`_map_data_paths` drops the rest anyway)
+            return {
+                key: data.getlist(key) if key in list_fields else data[key]
+                for key in flatten_map
+                if key in data
+            }
+        return api.parser.parse_querydict(data, list_fields, request)
+
 
 class QueryModel(ParamModel):
     @classmethod
     def get_request_data(
         cls, request: HttpRequest, api: "Penta", path_params: DictStrAny
     ) -> Optional[DictStrAny]:
-        list_fields = getattr(cls, "__penta_collection_fields__", [])
-        return api.parser.parse_querydict(request.GET, list_fields, request)
+        return cls._parse_querydict(request.GET, api, request)
 
 
 class PathModel(ParamModel):
@@ -131,8 +157,53 @@ class CookieModel(ParamModel):
         return request.COOKIES
 
 
+# parsers that read request.body as plain JSON - pydantic can do the same by itself
+JSON_BODY_PARSERS = (Parser.parse_body, ORJSONParser.parse_body)
+
+
 class BodyModel(ParamModel):
     __read_from_single_attr__: str
+    __penta_body_adapter__: Optional[TypeAdapter]
+
+    @classmethod
+    def resolve(
+        cls: Type[TModel],
+        request: HttpRequest,
+        api: "Penta",
+        path_params: DictStrAny,
+    ) -> TModel:
+        adapter = cls._get_body_adapter()  # type: ignore
+        if (
+            adapter is not None
+            and request.body
+            and type(api.parser).parse_body in JSON_BODY_PARSERS
+        ):
+            try:
+                value = adapter.validate_json(
+                    request.body, context={"request": request}
+                )
+            except pydantic.ValidationError:
+                # the regular path below reports the error
+                # (400 for invalid json, field locations relative to the model)
+                pass
+            else:
+                return cls.model_construct(**{cls.__read_from_single_attr__: value})  # type: ignore
+        return super().resolve(request, api, path_params)
+
+    @classmethod
+    def _get_body_adapter(cls) -> Optional[TypeAdapter]:
+        """
+        For a single body param (without field constraints) the raw body can be
+        validated by pydantic-core directly, skipping the python dict in between
+        """
+        if "__penta_body_adapter__" not in cls.__dict__:
+            adapter = None
+            varname = getattr(cls, "__read_from_single_attr__", None)
+            field = cls.model_fields.get(varname) if varname else None
+            if field and not field.metadata and field.discriminator is None:
+                adapter = TypeAdapter(field.annotation)
+            cls.__penta_body_adapter__ = adapter
+        return cls.__penta_body_adapter__
 
     @classmethod
     def get_request_data(
@@ -160,8 +231,7 @@ class FormModel(ParamModel):
     def get_request_data(
         cls, request: HttpRequest, api: "Penta", path_params: DictStrAny
     ) -> Optional[DictStrAny]:
-        list_fields = getattr(cls, "__penta_collection_fields__", [])
-        return api.parser.parse_querydict(request.POST, list_fields, request)
+        return cls._parse_querydict(request.POST, api, request)
 
 
 class FileModel(ParamModel):
@@ -197,6 +267,66 @@ class _MultiPartBodyModel(BodyModel):
         return results
 
 
+class FusedParamModel(BaseModel):
+    """
+    Validates the params of several sources (one field per ParamModel) with
+    a single pydantic call, instead of resolving the models one by one.
+    """
+
+    __penta_models__: Dict[str, Any]
+
+    @classmethod
+    def create(cls, models: TModels) -> Optional[Type["FusedParamModel"]]:
+        fusable = {
+            m.__penta_param_source__: m
+            for m in models
+            if getattr(m.resolve, "__func__", None) in FUSABLE_RESOLVERS
+            and not (issubclass(m, BodyModel) and m._get_body_adapter() is not None)
+            # ^ validated straight from request.body by BodyModel.resolve
+        }
+        if len(fusable) < 2:
+            return None
+        attrs = {
+            "__annotations__": dict(fusable),
+            "__penta_models__": fusable,
+        }
+        return type("PentaFusedParams", (cls,), attrs)
+
+    @classmethod
+    def resolve_values(
+        cls, request: HttpRequest, api: "Penta", path_params: DictStrAny
+    ) -> Tuple[DictStrAny, List[ValidationErrorContext]]:
+        data = {}
+        for source, model in cls.__penta_models__.items():
+            model_data = model.get_request_data(request, api, path_params)
+            data[source] = (
+                {} if model_data is None else model._map_data_paths(model_data)
+            )
+
+        context = {"request": request}
+        values: DictStrAny = {}
+        try:
+            fused = cls.model_validate(data, context=context)
+        except pydantic.ValidationError:
+            # reporting errors the same way as separate models do
+            error_contexts = []
+            for source, model in cls.__penta_models__.items():
+                try:
+                    model.model_validate(data[source], context=context)
+                except pydantic.ValidationError as e:
+                    error_contexts.append(
+                        ValidationErrorContext(pydantic_validation_error=e, model=model)
+                    )
+            return values, error_contexts
+
+        for source in cls.__penta_models__:
+            values.update(getattr(fused, source))
+        return values, []
+
+
+FUSABLE_RESOLVERS = (ParamModel.resolve.__func__, BodyModel.resolve.__func__)  # type: ignore
+
+
 class Param(FieldInfo):
     def __init__(
         self,
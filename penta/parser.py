@@ -4,9 +4,15 @@ from typing import List, cast
 from django.http import HttpRequest
 from django.utils.datastructures import MultiValueDict
 
+from penta.errors import ConfigError
 from penta.types import DictStrAny
 
-__all__ = ["Parser"]
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+__all__ = ["Parser", "ORJSONParser"]
 
 
 class Parser:
@@ -25,3 +31,14 @@ class Parser:
             else:
                 result[key] = data[key]
         return result
+
+
+class ORJSONParser(Parser):
+    "JSON parser backed by orjson (`pip install orjson`), reads request.body bytes directly"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ConfigError("ORJSONParser requires orjson: pip install orjson")
+
+    def parse_body(self, request: HttpRequest) -> DictStrAny:
+        return cast(DictStrAny, orjson.loads(request.body))
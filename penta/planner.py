@@ -0,0 +1,220 @@
+import inspect
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Optional
+
+from fast_depends.dependencies import model
+from typing_extensions import Annotated, get_args, get_origin
+
+from penta.executors import INLINE, THREAD_SENSITIVE, atomic_request_databases
+from penta.throttling import has_aallow_request
+from penta.types import DictStrAny
+from penta.utils import is_async_callable
+
+if TYPE_CHECKING:
+    from penta.operation import Operation  # pragma: no cover
+
+__all__ = ["ExecutionPlan", "Step", "ExecutionPlanWarning", "plan_operation"]
+
+SYNC = "sync"
+ASYNC = "async"
+
+# how a step runs
+CALL = "call"  # called directly (in the thread of a sync view, or in the event loop)
+AWAIT = "await"  # awaited in the event loop
+THREAD = "thread"  # a sync callable moved out of the event loop
+LOOP_BRIDGE = "loop_bridge"  # an async callable run with async_to_sync
+
+HOPS = (THREAD, LOOP_BRIDGE)
+
+# how auth callbacks are evaluated (`auth_strategy`)
+SEQUENTIAL = "sequential"  # one after another until one succeeds
+RACE = "race"  # awaited callbacks concurrently, the first success by priority
+AUTH_STRATEGIES = (SEQUENTIAL, RACE)
+
+
+class ExecutionPlanWarning(RuntimeWarning):
+    "An operation mixes sync and async code in a way that costs a thread/loop hop"
+
+
+class Step(NamedTuple):
+    stage: str  # "auth", "throttle", "dependency" or "view"
+    name: str
+    mode: str  # "sync" or "async"
+    runs: str  # CALL, AWAIT, THREAD or LOOP_BRIDGE
+
+
+class ExecutionPlan:
+    """
+    How the stages of an operation run - decided once, when the operation is
+    bound to the api. `Operation.plan` (and `Penta.execution_plans()`).
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        is_async: bool,
+        steps: List[Step],
+        auth_strategy: str = SEQUENTIAL,
+        notes: Optional[List[str]] = None,
+    ) -> None:
+        self.operation = operation
+        self.is_async = is_async
+        self.steps = steps
+        self.auth_strategy = auth_strategy
+        self.notes = notes or []  # what the steps can't tell
+
+    @property
+    def hops(self) -> List[Step]:
+        "Steps that move between the event loop and a thread on every request"
+        return [step for step in self.steps if step.runs in HOPS]
+
+    def auth_runs(self) -> List[str]:
+        return [step.runs for step in self.steps if step.stage == "auth"]
+
+    def dict(self) -> DictStrAny:
+        return {
+            "operation": self.operation,
+            "mode": ASYNC if self.is_async else SYNC,
+            "steps": [step._asdict() for step in self.steps],
+            "auth_strategy": self.auth_strategy,
+            "notes": self.notes,
+            "hops": len(self.hops),
+        }
+
+    def __repr__(self) -> str:
+        mode = ASYNC if self.is_async else SYNC
+        return f"<ExecutionPlan {self.operation} {mode} hops={len(self.hops)}>"
+
+
+def callable_name(obj: Any) -> str:
+    if inspect.isfunction(obj) or inspect.ismethod(obj):
+        return obj.__qualname__
+    return type(obj).__qualname__
+
+
+def is_async_auth(callback: Callable) -> bool:
+    return is_async_callable(callback) or bool(getattr(callback, "is_async", False))
+
+
+def is_blocking(callback: Any) -> bool:
+    "Sync auth callables and throttles may do I/O unless they declare `blocking = False`"
+    return bool(getattr(callback, "blocking", True))
+
+
+def plan_operation(operation: "Operation") -> ExecutionPlan:
+    is_async = operation.is_async
+    steps: List[Step] = []
+
+    for callback in operation.auth_callbacks:
+        name = callable_name(callback)
+        if is_async_auth(callback):
+            runs = AWAIT if is_async else LOOP_BRIDGE
+            steps.append(Step("auth", name, ASYNC, runs))
+        elif is_async and is_blocking(callback):
+            steps.append(Step("auth", name, SYNC, THREAD))
+        else:
+            steps.append(Step("auth", name, SYNC, CALL))
+
+    for throttle in operation.throttle_objects:
+        name = callable_name(throttle)
+        if is_async and has_aallow_request(throttle):
+            steps.append(Step("throttle", name, ASYNC, AWAIT))
+        elif is_async and is_blocking(throttle):
+            # cache round-trips of a sync throttle would block the event loop
+            steps.append(Step("throttle", name, SYNC, THREAD))
+        else:
+            steps.append(Step("throttle", name, SYNC, CALL))
+
+    for param in operation.signature.signature.parameters.values():
+        dependency = _dependency(param)
+        if dependency is None:
+            continue
+        name = callable_name(dependency)
+        if is_async_callable(dependency):
+            steps.append(Step("dependency", name, ASYNC, AWAIT))
+        else:
+            # fast_depends runs sync dependencies of async views in a thread pool
+            steps.append(Step("dependency", name, SYNC, THREAD if is_async else CALL))
+
+    auth_strategy = SEQUENTIAL
+    if is_async and operation.auth_strategy == RACE:
+        # nothing to overlap unless at least two callbacks are awaited - threaded
+        # ones share the sync_executor thread (and can't be cancelled) anyway
+        concurrent = [s for s in steps if s.stage == "auth" and s.runs == AWAIT]
+        if len(concurrent) > 1:
+            auth_strategy = RACE
+
+    notes: List[str] = []
+    view_name = callable_name(operation.view_func)
+    if is_async:
+        steps.append(Step("view", view_name, ASYNC, AWAIT))
+    elif operation.sync_executor in (None, THREAD_SENSITIVE, INLINE):
+        steps.append(Step("view", view_name, SYNC, CALL))
+        if (
+            operation.limiter is not None
+            and operation.sync_executor != INLINE
+            and not atomic_request_databases()
+        ):
+            notes.append(
+                "checks its limiter in an async path view, before the hop to a "
+                "thread - under WSGI every request also goes through async_to_sync"
+            )
+    else:
+        # a dedicated pool - the path view is async and hands the operation over
+        steps.append(Step("view", view_name, SYNC, THREAD))
+        notes.append(
+            f"runs in the '{operation.sync_executor}' pool from an async path view - "
+            "under WSGI every request also goes through async_to_sync"
+        )
+
+    return ExecutionPlan(view_name, is_async, steps, auth_strategy, notes)
+
+
+def _dependency(param: inspect.Parameter) -> Any:
+    "The dependency function of a `Depends(...)` parameter (default or Annotated)"
+    candidates = [param.default]
+    if get_origin(param.annotation) is Annotated:
+        candidates.extend(get_args(param.annotation)[1:])
+    for candidate in candidates:
+        if isinstance(candidate, model.Depends):
+            return candidate.dependency
+    return None
+
+
+def warn_about_hops(plan: ExecutionPlan, view_func: Callable) -> None:
+    "Emits an ExecutionPlanWarning for each hop, pointing at the view definition"
+    view = inspect.unwrap(view_func)
+    code = getattr(view, "__code__", None)
+
+    def warn(message: str) -> None:
+        if code is None:
+            warnings.warn(message, ExecutionPlanWarning, stacklevel=3)
+            return
+        warnings.warn_explicit(
+            message,
+            ExecutionPlanWarning,
+            filename=code.co_filename,
+            lineno=code.co_firstlineno,
+            module=getattr(view, "__module__", None),
+        )
+
+    for step in plan.hops:
+        if step.stage == "view":
+            continue  # chosen with sync_executor
+        if step.runs == LOOP_BRIDGE:
+            advice = "make the operation async or use a sync version"
+        elif step.stage == "auth":
+            advice = (
+                "use an async version, or set `blocking = False` if it never does I/O"
+            )
+        elif step.stage == "throttle":
+            advice = (
+                "implement aallow_request, or set `blocking = False` if it never "
+                "does I/O"
+            )
+        else:
+            advice = "use an async version"
+        warn(
+            f"{plan.operation}: {step.stage} {step.name} is {step.mode} and runs "
+            f"via {step.runs} on every request - {advice}"
+        )
@@ -0,0 +1,172 @@
+import re
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from django.http import Http404, HttpRequest
+from django.urls import URLPattern
+from django.urls.converters import (
+    IntConverter,
+    SlugConverter,
+    StringConverter,
+    UUIDConverter,
+    get_converters,
+)
+from django.urls.resolvers import ResolverMatch, RoutePattern
+
+from penta.router import ReverseOnlyPattern
+
+__all__ = ["RadixTree", "RadixURLPattern", "radix_url_patterns"]
+
+
+# same as django.urls.resolvers._PATH_PARAMETER_COMPONENT_RE
+PATH_PARAMETER_RE = re.compile(r"<(?:(?P<converter>[^>:]+):)?(?P<parameter>[^>]+)>")
+
+# converters that never match a "/" - so params can be matched segment by segment
+SEGMENT_REGEXES = {
+    IntConverter.regex,
+    SlugConverter.regex,
+    StringConverter.regex,
+    UUIDConverter.regex,
+}
+
+
+class _Node:
+    __slots__ = ("static", "dynamic", "endpoints")
+
+    def __init__(self) -> None:
+        self.static: Dict[str, _Node] = {}
+        self.dynamic: Dict[str, Tuple[Pattern, _Node]] = {}
+        self.endpoints: List[int] = []
+
+
+class RadixTree:
+    """
+    Prefix tree of url routes (django `path()` syntax), split by "/".
+    Static segments are looked up in a dict, segments with params are matched
+    with a regex built from the converters.
+
+    Routes with converters that can match "/" (like `path`) can't be split by
+    segment - those are kept aside and are always returned as candidates.
+    """
+
+    def __init__(self) -> None:
+        self.root = _Node()
+        self.fallback: List[int] = []
+
+    def add(self, route: str, index: int) -> None:
+        "Adds `route`; `match()` returns `index` for the paths it matches"
+        segments = []
+        for segment in route.split("/"):
+            segment_regex = self._segment_regex(segment)
+            if segment_regex is False:
+                self.fallback.append(index)
+                return
+            segments.append((segment, segment_regex))
+
+        node = self.root
+        for segment, segment_regex in segments:
+            if segment_regex is None:
+                node = node.static.setdefault(segment, _Node())
+            else:
+                if segment_regex not in node.dynamic:
+                    node.dynamic[segment_regex] = (re.compile(segment_regex), _Node())
+                node = node.dynamic[segment_regex][1]
+        node.endpoints.append(index)
+
+    def match(self, path: str) -> List[int]:
+        "Indexes of the routes that can match `path`, in the order they were added"
+        result = list(self.fallback)
+        self._match(self.root, path.split("/"), 0, result)
+        result.sort()
+        return result
+
+    def _match(self, node: _Node, segments: List[str], i: int, result: List) -> None:
+        if i == len(segments):
+            result.extend(node.endpoints)
+            return
+        segment = segments[i]
+        child = node.static.get(segment)
+        if child is not None:
+            self._match(child, segments, i + 1, result)
+        for regex, child in node.dynamic.values():
+            if regex.fullmatch(segment):
+                self._match(child, segments, i + 1, result)
+
+    def _segment_regex(self, segment: str) -> Any:
+        """
+        None for static segments, regex string for segments with params,
+        False if the segment can't be matched on its own
+        """
+        if "<" not in segment:
+            return None
+        parts: List[str] = []
+        position = 0
+        for match in PATH_PARAMETER_RE.finditer(segment):
+            converter = get_converters()[match.group("converter") or "str"]
+            if converter.regex not in SEGMENT_REGEXES:
+                return False
+            parts.extend((
+                re.escape(segment[position : match.start()]),
+                f"(?:{converter.regex})",
+            ))
+            position = match.end()
+        parts.append(re.escape(segment[position:]))
+        return "".join(parts)
+
+
+def _radix_view(request: HttpRequest, **kwargs: Any) -> None:
+    # never called - RadixURLPattern resolves to the views of the matched patterns
+    raise Http404()  # pragma: no cover
+
+
+class RadixPattern(RoutePattern):
+    """
+    The pattern of RadixURLPattern (that resolves by itself). Not reverse only -
+    the url patterns keep it in the place of the patterns it replaced.
+    """
+
+    def match(self, path: str) -> None:
+        return None
+
+
+class RadixURLPattern(URLPattern):
+    """
+    A single url pattern that resolves all the given url patterns
+    with a RadixTree instead of trying them one by one.
+    """
+
+    def __init__(self, patterns: List[URLPattern]) -> None:
+        super().__init__(RadixPattern("", is_endpoint=True), _radix_view)
+        self.patterns = patterns
+        self.tree = RadixTree()
+        for index, pattern in enumerate(patterns):
+            self.tree.add(str(pattern.pattern), index)
+
+    def resolve(self, path: str) -> Optional[ResolverMatch]:
+        for index in self.tree.match(path):
+            # the pattern itself does the final match and converts the params
+            match = self.patterns[index].resolve(path)
+            if match:
+                return match
+        return None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} ({len(self.patterns)} patterns)>"
+
+
+def radix_url_patterns(patterns: List[URLPattern]) -> List[URLPattern]:
+    """
+    Replaces the (route) url patterns with a single RadixURLPattern;
+    the originals are kept as reverse only patterns for `reverse()`
+    """
+    resolving = []
+    result = []
+    for p in patterns:
+        if isinstance(p.pattern, RoutePattern) and not isinstance(
+            p.pattern, ReverseOnlyPattern
+        ):
+            resolving.append(p)
+            route = str(p.pattern)
+            pattern = ReverseOnlyPattern(route, name=p.name, is_endpoint=True)
+            p = URLPattern(pattern, p.callback, p.default_args, p.name)
+        result.append(p)
+    return [RadixURLPattern(resolving), *result]
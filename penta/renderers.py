@@ -1,16 +1,53 @@
 import json
-from typing import Any, Mapping, Optional, Type
+from enum import Enum
+from typing import Any, Callable, Mapping, Optional, Type
 
 from django.http import HttpRequest
+from pydantic import TypeAdapter
 
+from penta.errors import ConfigError
 from penta.responses import PentaJSONEncoder
+from penta.types import DictStrAny
 
-__all__ = ["BaseRenderer", "JSONRenderer"]
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+__all__ = [
+    "BaseRenderer",
+    "JSONRenderer",
+    "ORJSONRenderer",
+    "PydanticJSONRenderer",
+    "ValidatedResponse",
+]
+
+
+class ValidatedResponse:
+    """
+    A response value that was already validated against the operation response
+    schema, along with the TypeAdapter and the dump options needed to serialize it.
+    Renderers with `accepts_validated = True` receive this instead of a dict.
+    """
+
+    __slots__ = ("value", "adapter", "dump_kwargs")
+
+    def __init__(self, value: Any, adapter: TypeAdapter, dump_kwargs: DictStrAny):
+        self.value = value
+        self.adapter = adapter
+        self.dump_kwargs = dump_kwargs
+
+    def dump_json(self) -> bytes:
+        return self.adapter.dump_json(self.value, **self.dump_kwargs)
+
+    def dump_python(self) -> Any:
+        return self.adapter.dump_python(self.value, **self.dump_kwargs)
 
 
 class BaseRenderer:
     media_type: Optional[str] = None
     charset: str = "utf-8"
+    accepts_validated: bool = False
 
     def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
         raise NotImplementedError("Please implement .render() method")
@@ -23,3 +60,62 @@ class JSONRenderer(BaseRenderer):
 
     def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
         return json.dumps(data, cls=self.encoder_class, **self.json_dumps_params)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson (`pip install orjson`).
+
+    Values orjson does not handle natively (pydantic models, Url, IP addresses,
+    Decimal...) go through `encoder_class.default`, and datetimes are passed
+    through to it as well, so they are formatted exactly like with JSONRenderer.
+    Differences: the output is compact, and plain Enum members (not str/int/float
+    ones) are rendered by value - orjson never defers them to `default`.
+    Set `convert_enums = True` to walk the data and convert them like
+    JSONRenderer (`str(member)`) - that walk costs more than orjson saves.
+    """
+
+    convert_enums: bool = False
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ConfigError("ORJSONRenderer requires orjson: pip install orjson")
+        self.encoder = self.encoder_class()
+        self.option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        self.default: Callable[[Any], Any] = self.encoder.default
+        if self.convert_enums:
+            # the values `default` returns too (e.g. fields of pydantic models)
+            self.default = lambda o: self.prepare(self.encoder.default(o))
+
+    def prepare(self, data: Any) -> Any:
+        "Converts plain Enum members the way encoder_class does"
+        if isinstance(data, dict):
+            return {key: self.prepare(value) for key, value in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [self.prepare(value) for value in data]
+        if isinstance(data, Enum) and not isinstance(data, (str, int, float)):
+            return self.encoder.default(data)
+        return data
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
+        if self.convert_enums:
+            data = self.prepare(data)
+        return orjson.dumps(data, default=self.default, option=self.option)
+
+
+class PydanticJSONRenderer(JSONRenderer):
+    """
+    Serializes responses that have a response schema straight to JSON bytes
+    with pydantic-core (no intermediate dict and no json.dumps pass).
+    Everything else (no schema, error details) is rendered like JSONRenderer.
+
+    Note: the output is compact and follows pydantic's JSON mode
+    (e.g. enums are rendered by value).
+    """
+
+    accepts_validated = True
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
+        if isinstance(data, ValidatedResponse):
+            return data.dump_json()
+        return super().render(request, data, response_status=response_status)
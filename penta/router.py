@@ -13,10 +13,13 @@ from typing import (
 
 from django.urls import URLPattern
 from django.urls import path as django_path
+from django.urls.resolvers import RoutePattern
 
 from penta.constants import NOT_SET, NOT_SET_TYPE
 from penta.errors import ConfigError
+from penta.limiter import AdaptiveLimiter
 from penta.operation import PathView
+from penta.scheduling import FairScheduler
 from penta.throttling import BaseThrottle
 from penta.types import TCallable
 from penta.utils import normalize_path, replace_path_param_notation
@@ -28,6 +31,13 @@ if TYPE_CHECKING:
 __all__ = ["Router"]
 
 
+class ReverseOnlyPattern(RoutePattern):
+    "Route that is only used to reverse urls (it never matches on resolve)"
+
+    def match(self, path: str) -> None:
+        return None
+
+
 class Router:
     def __init__(
         self,
@@ -39,6 +49,11 @@ class Router:
         exclude_unset: Optional[bool] = None,
         exclude_defaults: Optional[bool] = None,
         exclude_none: Optional[bool] = None,
+        sync_executor: Union[str, None, NOT_SET_TYPE] = NOT_SET,
+        limiter: Union[AdaptiveLimiter, None, NOT_SET_TYPE] = NOT_SET,
+        scheduler: Union[FairScheduler, None, NOT_SET_TYPE] = NOT_SET,
+        timeout: Union[float, None, NOT_SET_TYPE] = NOT_SET,
+        auth_strategy: Union[str, None, NOT_SET_TYPE] = NOT_SET,
     ) -> None:
         self.api: Optional[Penta] = None
         self.auth = auth
@@ -48,6 +63,26 @@ class Router:
         self.exclude_unset = exclude_unset
         self.exclude_defaults = exclude_defaults
         self.exclude_none = exclude_none
+        self.sync_executor: Optional[str] = None
+        self.limiter: Optional[AdaptiveLimiter] = None
+        self.scheduler: Optional[FairScheduler] = None
+        self.timeout: Optional[float] = None
+        self.auth_strategy: Optional[str] = None
+        # options left NOT_SET take the value of the parent router,
+        # None resets an option to the default
+        options = {
+            "sync_executor": sync_executor,
+            "limiter": limiter,
+            "scheduler": scheduler,
+            "timeout": timeout,
+            "auth_strategy": auth_strategy,
+        }
+        self._inherited: List[str] = []
+        for name, value in options.items():
+            if value is NOT_SET:
+                self._inherited.append(name)
+            else:
+                setattr(self, name, value)
 
         self.path_operations: Dict[str, PathView] = {}
         self._routers: List[Tuple[str, Router]] = []
@@ -71,6 +106,12 @@ class Router:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         return self.api_operation(
             ["GET"],
@@ -90,6 +131,12 @@ class Router:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def post(
@@ -111,6 +158,12 @@ class Router:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         return self.api_operation(
             ["POST"],
@@ -130,6 +183,12 @@ class Router:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def delete(
@@ -151,6 +210,12 @@ class Router:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         return self.api_operation(
             ["DELETE"],
@@ -170,6 +235,12 @@ class Router:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def patch(
@@ -191,6 +262,12 @@ class Router:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         return self.api_operation(
             ["PATCH"],
@@ -210,6 +287,12 @@ class Router:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def put(
@@ -231,6 +314,12 @@ class Router:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         return self.api_operation(
             ["PUT"],
@@ -250,6 +339,12 @@ class Router:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
 
     def api_operation(
@@ -272,6 +367,12 @@ class Router:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> Callable[[TCallable], TCallable]:
         def decorator(view_func: TCallable) -> TCallable:
             self.add_api_operation(
@@ -293,6 +394,12 @@ class Router:
                 url_name=url_name,
                 include_in_schema=include_in_schema,
                 openapi_extra=openapi_extra,
+                stream=stream,
+                sync_executor=sync_executor,
+                limiter=limiter,
+                scheduler=scheduler,
+                timeout=timeout,
+                auth_strategy=auth_strategy,
             )
             return view_func
 
@@ -319,6 +426,12 @@ class Router:
         url_name: Optional[str] = None,
         include_in_schema: bool = True,
         openapi_extra: Optional[Dict[str, Any]] = None,
+        stream: Union[bool, str] = False,
+        sync_executor: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        timeout: Optional[float] = None,
+        auth_strategy: Optional[str] = None,
     ) -> None:
         path = re.sub(r"\{uuid:(\w+)\}", r"{uuidstr:\1}", path, flags=re.IGNORECASE)
         # django by default convert strings to UUIDs
@@ -358,6 +471,12 @@ class Router:
             url_name=url_name,
             include_in_schema=include_in_schema,
             openapi_extra=openapi_extra,
+            stream=stream,
+            sync_executor=sync_executor,
+            limiter=limiter,
+            scheduler=scheduler,
+            timeout=timeout,
+            auth_strategy=auth_strategy,
         )
         if self.api:
             path_view.set_api_instance(self.api, self)
@@ -369,6 +488,9 @@ class Router:
     ) -> None:
         if self.auth is NOT_SET and parent_router:
             self.auth = parent_router.auth
+        if parent_router:
+            for option in self._inherited:
+                setattr(self, option, getattr(parent_router, option))
         self.api = api
         for path_view in self.path_operations.values():
             path_view.set_api_instance(self.api, self)
@@ -376,20 +498,32 @@ class Router:
             router.set_api_instance(api, self)
 
     def urls_paths(self, prefix: str) -> Iterator[URLPattern]:
+        """
+        One url pattern per path (the view dispatches by method). Names of the other
+        operations of the path are registered with patterns that never match,
+        they are only there for `reverse()`
+        """
         prefix = replace_path_param_notation(prefix)
         for path, path_view in self.path_operations.items():
-            for operation in path_view.operations:
-                path = replace_path_param_notation(path)
-                route = "/".join([i for i in (prefix, path) if i])
-                # to skip lot of checks we simply treat double slash as a mistake:
-                route = normalize_path(route)
-                route = route.lstrip("/")
+            path = replace_path_param_notation(path)
+            route = "/".join([i for i in (prefix, path) if i])
+            # to skip lot of checks we simply treat double slash as a mistake:
+            route = normalize_path(route)
+            route = route.lstrip("/")
 
+            url_names: List[str] = []
+            for operation in path_view.operations:
                 url_name = getattr(operation, "url_name", "")
                 if not url_name and self.api:
                     url_name = self.api.get_operation_url_name(operation, router=self)
+                if url_name not in url_names:
+                    url_names.append(url_name)
 
-                yield django_path(route, path_view.get_view(), name=url_name)
+            view = path_view.get_view()
+            yield django_path(route, view, name=url_names[0])
+            for url_name in url_names[1:]:
+                pattern = ReverseOnlyPattern(route, name=url_name, is_endpoint=True)
+                yield URLPattern(pattern, view, name=url_name)
 
     def add_router(
         self,
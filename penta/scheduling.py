@@ -0,0 +1,184 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from django.http import HttpRequest
+
+from penta.errors import Overloaded
+from penta.types import DictStrAny
+
+__all__ = ["FairScheduler"]
+
+
+class _KeyState:
+    __slots__ = ("finish", "queued", "admitted", "delay_total", "delay_max")
+
+    def __init__(self) -> None:
+        self.finish = 0.0  # virtual finish time of the last request of the key
+        self.queued = 0
+        self.admitted = 0
+        self.delay_total = 0.0
+        self.delay_max = 0.0
+
+
+def default_key(request: HttpRequest) -> Hashable:
+    "The authenticated user/key (`request.auth`), or the client address"
+    auth = getattr(request, "auth", None)
+    if auth is None:
+        from penta.throttling import BaseThrottle
+
+        return ("ident", BaseThrottle().get_ident(request))
+    pk = getattr(auth, "pk", None)
+    if pk is not None:
+        return (type(auth).__name__, pk)
+    return ("auth", auth if isinstance(auth, Hashable) else repr(auth))
+
+
+class FairScheduler:
+    """
+    Admits the requests of async operations by weighted fair queuing, so one
+    client flooding the operations does not delay the requests of the others.
+
+    At most `max_concurrency` requests run at the same time; the rest wait in
+    per key queues (by default a key is the `request.auth` of the request, or
+    the client address) and are admitted in the order of their virtual start
+    time - each request of a key moves the key `1 / weight` forward, so a key
+    with weight 2 gets twice as many slots as a key with weight 1 when both
+    have requests waiting.
+
+    A key with `max_queue` requests waiting gets 503 for the next ones.
+    The scheduler works within one event loop (one ASGI worker process).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        key: Optional[Callable[[HttpRequest], Hashable]] = None,
+        weights: Optional[Mapping[Hashable, float]] = None,
+        default_weight: float = 1.0,
+        max_queue: Optional[int] = None,
+        retry_after: Optional[float] = 1,
+        max_keys: int = 10000,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.key_func = key or default_key
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.max_keys = max_keys
+        self.running = 0
+        self.virtual_time = 0.0
+        self._keys: OrderedDict[Hashable, _KeyState] = OrderedDict()
+        self._queue: List[Tuple[float, int, Hashable, asyncio.Future, float]] = []
+        self._sequence = itertools.count()
+
+    def get_key(self, request: HttpRequest) -> Hashable:
+        return self.key_func(request)
+
+    def get_weight(self, key: Hashable) -> float:
+        return self.weights.get(key, self.default_weight)
+
+    @asynccontextmanager
+    async def admit(self, request: HttpRequest) -> AsyncIterator[None]:
+        "Waits for a slot for the request, holds it for the body of the block"
+        await self.acquire(self.get_key(request))
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, key: Hashable) -> None:
+        state = self._key_state(key)
+        start = max(self.virtual_time, state.finish)
+        if self.running < self.max_concurrency and not self._queue:
+            state.finish = start + 1 / self.get_weight(key)
+            state.admitted += 1
+            self.virtual_time = start
+            self.running += 1
+            return
+
+        if self.max_queue is not None and state.queued >= self.max_queue:
+            raise Overloaded(self.retry_after)
+        state.finish = start + 1 / self.get_weight(key)
+        future = asyncio.get_running_loop().create_future()
+        entry = (start, next(self._sequence), key, future, time.perf_counter())
+        heapq.heappush(self._queue, entry)
+        state.queued += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was given just before the cancellation
+                self.release()
+            else:
+                state.queued -= 1
+            raise
+
+    def release(self) -> None:
+        self.running -= 1
+        while self._queue and self.running < self.max_concurrency:
+            start, _seq, key, future, queued_at = heapq.heappop(self._queue)
+            if future.done():  # cancelled while waiting
+                continue
+            delay = time.perf_counter() - queued_at
+            state = self._keys[key]
+            state.queued -= 1
+            state.admitted += 1
+            state.delay_total += delay
+            state.delay_max = max(state.delay_max, delay)
+            self.virtual_time = max(self.virtual_time, start)
+            self.running += 1
+            future.set_result(None)
+
+    def _key_state(self, key: Hashable) -> _KeyState:
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState()
+            if len(self._keys) > self.max_keys:
+                self._forget_idle_keys()
+        else:
+            self._keys.move_to_end(key)
+        return state
+
+    def _forget_idle_keys(self) -> None:
+        # least recently used first - an idle key starts at the virtual time anyway
+        for key in list(self._keys)[:-1]:
+            if len(self._keys) <= self.max_keys // 2:
+                break
+            if self._keys[key].queued == 0:
+                del self._keys[key]
+
+    def stats(self) -> DictStrAny:
+        """
+        Running and queued requests, and per key: requests admitted, waiting and
+        the average/max queue delay (seconds)
+        """
+        keys: Dict[Hashable, DictStrAny] = {}
+        for key, state in self._keys.items():
+            keys[key] = {
+                "admitted": state.admitted,
+                "queued": state.queued,
+                "delay_avg": state.delay_total / state.admitted
+                if state.admitted
+                else 0.0,
+                "delay_max": state.delay_max,
+            }
+        return {
+            "running": self.running,
+            "queued": sum(state.queued for state in self._keys.values()),
+            "keys": keys,
+        }
@@ -1,6 +1,14 @@
 from penta.security.apikey import APIKeyCookie, APIKeyHeader, APIKeyQuery
 from penta.security.http import HttpBasicAuth, HttpBearer
-from penta.security.session import SessionAuth, SessionAuthIsStaff, SessionAuthSuperUser
+from penta.security.session import (
+    CachedSessionAuth,
+    CachedSessionAuthIsStaff,
+    CachedSessionAuthSuperUser,
+    SessionAuth,
+    SessionAuthIsStaff,
+    SessionAuthSuperUser,
+)
+from penta.security.tokens import SignedTokenBearer
 
 __all__ = [
     "APIKeyCookie",
@@ -8,8 +16,12 @@ __all__ = [
     "APIKeyQuery",
     "HttpBasicAuth",
     "HttpBearer",
+    "SignedTokenBearer",
     "SessionAuth",
     "SessionAuthSuperUser",
+    "CachedSessionAuth",
+    "CachedSessionAuthSuperUser",
+    "CachedSessionAuthIsStaff",
     "django_auth",
     "django_auth_superuser",
     "django_auth_is_staff",
@@ -4,6 +4,7 @@ from typing import Any, Optional
 from django.http import HttpRequest
 
 from penta.errors import ConfigError
+from penta.security.cache import AuthCache
 from penta.utils import is_async_callable
 
 __all__ = ["SecuritySchema", "AuthBase"]
@@ -15,6 +16,17 @@ class SecuritySchema(dict):
 
 
 class AuthBase(ABC):
+    # cache the results of `authenticate` for `cache_ttl` seconds (off by default)
+    cache_ttl: Optional[float] = None
+    cache_size: int = 1024
+    # a django cache alias to share the cached results between processes
+    cache_alias: Optional[str] = None
+    # instances with the same namespace share cached results - by default the
+    # n-th instance of a class has its own (the same in every process)
+    cache_namespace: Optional[str] = None
+    # a sync `authenticate` may do I/O - async operations run it in a thread
+    blocking: bool = True
+
     def __init__(self) -> None:
         if not hasattr(self, "openapi_type"):
             raise ConfigError("If you extend AuthBase you need to define openapi_type")
@@ -26,10 +38,44 @@ class AuthBase(ABC):
                 kwargs[name] = getattr(self, attr)
         self.openapi_security_schema = SecuritySchema(**kwargs)
 
+        self.auth_cache: Optional[AuthCache] = None
+        if self.cache_ttl and hasattr(self, "authenticate"):
+            self.auth_cache = AuthCache.for_auth(self)
+            authenticate = self.auth_cache.wrap(self.authenticate)  # type: ignore[has-type]
+            self.authenticate = authenticate
+
         self.is_async = False
         if hasattr(self, "authenticate"):  # pragma: no branch
             self.is_async = is_async_callable(self.authenticate)
 
+    def invalidate(self, *credentials: Any) -> None:
+        """
+        Drops the cached result of `authenticate` for the credentials, e.g.
+        `auth.invalidate(token)` when the token is revoked
+        """
+        if self.auth_cache is not None:
+            self.auth_cache.invalidate(*credentials)
+
+    async def ainvalidate(self, *credentials: Any) -> None:
+        if self.auth_cache is not None:
+            await self.auth_cache.ainvalidate(*credentials)
+
+    def invalidate_principal(self, principal: Any) -> None:
+        """
+        Drops every cached result of `principal` (see `cache_principal`), e.g.
+        `auth.invalidate_principal(user.pk)` when the user changes their password
+        """
+        if self.auth_cache is not None:
+            self.auth_cache.invalidate_principal(principal)
+
+    async def ainvalidate_principal(self, principal: Any) -> None:
+        if self.auth_cache is not None:
+            await self.auth_cache.ainvalidate_principal(principal)
+
+    def cache_principal(self, result: Any) -> Any:
+        "Who a result of `authenticate` is - the pk of model instances, else itself"
+        return getattr(result, "pk", result)
+
     @abstractmethod
     def __call__(self, request: HttpRequest) -> Optional[Any]:
         pass  # pragma: no cover
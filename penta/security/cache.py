@@ -0,0 +1,240 @@
+import copy
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from django.core.cache import BaseCache, caches
+from django.utils.crypto import salted_hmac
+
+from penta.utils import is_async_callable
+
+__all__ = ["AuthCache"]
+
+MISSING = object()
+# keys of the shared cache kept per principal (the oldest are dropped)
+MAX_PRINCIPAL_KEYS = 100
+
+_instance_counters: Dict[str, Iterator[int]] = {}
+_counters_lock = threading.Lock()
+
+
+def _default_namespace(auth: Any) -> str:
+    """
+    `module.Class#n` for the n-th instance of an auth class - instances created
+    in the same order (at import) get the same namespace in every process
+    """
+    name = f"{type(auth).__module__}.{type(auth).__qualname__}"
+    with _counters_lock:
+        counter = _instance_counters.setdefault(name, itertools.count(1))
+        return f"{name}#{next(counter)}"
+
+
+class AuthCache:
+    """
+    Results of an `authenticate()` method by credentials (token, api key,
+    username and password) - in a bounded in-process LRU, and optionally in a
+    django cache shared between processes.
+
+    Credentials are never stored: entries are keyed by an HMAC of them (with
+    the SECRET_KEY). Failed authentications (None) are not cached. Every
+    request gets its own (shallow) copy of a cached result.
+
+    `principal` maps a result to what `invalidate_principal` drops it by.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        size: int = 1024,
+        cache: Optional[BaseCache] = None,
+        namespace: str = "",
+        principal: Callable[[Any], Any] = lambda result: result,
+    ) -> None:
+        self.ttl = ttl
+        self.size = size
+        self.cache = cache
+        self.namespace = namespace
+        self.principal = principal
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._principals: Dict[str, Set[str]] = {}  # principal key -> keys
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_auth(cls, auth: Any) -> "AuthCache":
+        "The cache configured by the `cache_*` attributes of an auth instance"
+        alias = auth.cache_alias
+        return cls(
+            auth.cache_ttl,
+            auth.cache_size,
+            cache=None if alias is None else caches[alias],
+            namespace=auth.cache_namespace or _default_namespace(auth),
+            principal=auth.cache_principal,
+        )
+
+    def make_key(self, credentials: Tuple[Any, ...]) -> str:
+        value = "\0".join(str(c) for c in credentials)
+        digest = salted_hmac(self.namespace, value, algorithm="sha256").hexdigest()
+        return f"penta_auth:{digest}"
+
+    def principal_key(self, principal: Any) -> str:
+        "The key listing the cached results of `principal` (in the shared cache)"
+        digest = salted_hmac(
+            self.namespace, f"principal\0{principal}", algorithm="sha256"
+        ).hexdigest()
+        return f"penta_auth_principal:{digest}"
+
+    def get(self, key: str) -> Any:
+        "The cached result, or `MISSING`"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                self._remove(key)
+        return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        principal_key = self.principal_key(self.principal(value))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._principals.setdefault(principal_key, set()).add(key)
+            while len(self._entries) > self.size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        "Drops an entry and its place in the principal index (with the lock held)"
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        principal_key = self.principal_key(self.principal(entry[1]))
+        keys = self._principals.get(principal_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._principals[principal_key]
+
+    def share(self, key: str, value: Any) -> None:
+        "Stores a result in the shared cache, listed under its principal"
+        assert self.cache is not None
+        self.cache.set(key, value, self.ttl)
+        principal_key = self.principal_key(self.principal(value))
+        keys = self._listed(self.cache.get(principal_key, []), key)
+        self.cache.set(principal_key, keys, self.ttl)
+
+    async def ashare(self, key: str, value: Any) -> None:
+        assert self.cache is not None
+        await self.cache.aset(key, value, self.ttl)
+        principal_key = self.principal_key(self.principal(value))
+        keys = self._listed(await self.cache.aget(principal_key, []), key)
+        await self.cache.aset(principal_key, keys, self.ttl)
+
+    def _listed(self, keys: List[str], key: str) -> List[str]:
+        # not atomic - concurrent writers may drop a key, which then expires
+        # with its ttl instead
+        keys = [k for k in keys if k != key]
+        keys.append(key)
+        return keys[-MAX_PRINCIPAL_KEYS:]
+
+    def invalidate(self, *credentials: Any) -> None:
+        "Forgets the result for the credentials (a revoked token, a logout...)"
+        key = self.make_key(credentials)
+        with self._lock:
+            self._remove(key)
+        if self.cache is not None:
+            self.cache.delete(key)
+
+    async def ainvalidate(self, *credentials: Any) -> None:
+        key = self.make_key(credentials)
+        with self._lock:
+            self._remove(key)
+        if self.cache is not None:
+            await self.cache.adelete(key)
+
+    def invalidate_principal(self, principal: Any) -> None:
+        """
+        Forgets every result of `principal` (a user pk, a username...), here and
+        in the shared cache - without the credentials
+        """
+        principal_key = self.principal_key(principal)
+        with self._lock:
+            for key in list(self._principals.get(principal_key, ())):
+                self._remove(key)
+        if self.cache is not None:
+            keys = self.cache.get(principal_key, [])
+            self.cache.delete_many([*keys, principal_key])
+
+    async def ainvalidate_principal(self, principal: Any) -> None:
+        principal_key = self.principal_key(principal)
+        with self._lock:
+            for key in list(self._principals.get(principal_key, ())):
+                self._remove(key)
+        if self.cache is not None:
+            keys = await self.cache.aget(principal_key, [])
+            await self.cache.adelete_many([*keys, principal_key])
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        "Forgets the results cached in this process for which `predicate` is true"
+        with self._lock:
+            for key in [k for k, (_e, v) in self._entries.items() if predicate(v)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        "Forgets the results cached in this process"
+        with self._lock:
+            self._entries.clear()
+            self._principals.clear()
+
+    def wrap(self, authenticate: Callable) -> Callable:
+        """
+        Caches the results of an `authenticate(request, *credentials)` method;
+        each call gets its own copy, so changes made by one request don't leak
+        into the others
+        """
+        if is_async_callable(authenticate):
+
+            @wraps(authenticate)
+            async def async_cached(request: Any, *credentials: Any) -> Any:
+                if None in credentials:
+                    return await authenticate(request, *credentials)
+                key = self.make_key(credentials)
+                result = self.get(key)
+                if result is MISSING and self.cache is not None:
+                    result = await self.cache.aget(key, MISSING)
+                    if result is not MISSING:
+                        self.set(key, result)
+                if result is MISSING:
+                    result = await authenticate(request, *credentials)
+                    if result is None:
+                        return None
+                    self.set(key, result)
+                    if self.cache is not None:
+                        await self.ashare(key, result)
+                return copy.copy(result)
+
+            return async_cached
+
+        @wraps(authenticate)
+        def cached(request: Any, *credentials: Any) -> Any:
+            if None in credentials:
+                return authenticate(request, *credentials)
+            key = self.make_key(credentials)
+            result = self.get(key)
+            if result is MISSING and self.cache is not None:
+                result = self.cache.get(key, MISSING)
+                if result is not MISSING:
+                    self.set(key, result)
+            if result is MISSING:
+                result = authenticate(request, *credentials)
+                if result is None:
+                    return None
+                self.set(key, result)
+                if self.cache is not None:
+                    self.share(key, result)
+            return copy.copy(result)
+
+        return cached
@@ -1,11 +1,25 @@
+import weakref
+from importlib import import_module
 from typing import Any, Optional
 
 from django.conf import settings
+from django.contrib.auth import get_user
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
 from django.http import HttpRequest
 
 from penta.security.apikey import APIKeyCookie
 
-__all__ = ["SessionAuth", "SessionAuthSuperUser", "SessionAuthIsStaff"]
+__all__ = [
+    "SessionAuth",
+    "SessionAuthSuperUser",
+    "SessionAuthIsStaff",
+    "CachedSessionAuth",
+    "CachedSessionAuthSuperUser",
+    "CachedSessionAuthIsStaff",
+]
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
 
 
 class SessionAuth(APIKeyCookie):
@@ -42,3 +56,94 @@ class SessionAuthIsStaff(SessionAuthSuperUser):
             return request.user
 
         return None
+
+
+_cached_session_auths: "weakref.WeakSet[CachedSessionAuth]" = weakref.WeakSet()
+
+
+class CachedSessionAuth(APIKeyCookie):
+    """
+    Django session authentication with the session key -> user mapping cached
+    for `cache_ttl` seconds, so the session and the user are not loaded from
+    the database for every request.
+
+    Cached users are dropped when they log out and when the user is saved
+    (password change, deactivation...) or deleted - in this process and in
+    the shared cache of `cache_alias`.
+    """
+
+    param_name: str = settings.SESSION_COOKIE_NAME
+    cache_ttl: Optional[float] = 10
+
+    def __init__(self, csrf: bool = True) -> None:
+        super().__init__(csrf=csrf)
+        _connect_signals()
+        _cached_session_auths.add(self)
+
+    def __call__(self, request: HttpRequest) -> Optional[Any]:
+        user = super().__call__(request)
+        if user is not None:
+            # the view (and django) use it instead of loading it again - a copy
+            # of the cached user (AuthCache copies results for each request)
+            request.user = user
+        return user
+
+    def _get_key(self, request: HttpRequest) -> Optional[str]:
+        if request.method in SAFE_METHODS:
+            # the csrf middleware accepts them without any checks
+            return request.COOKIES.get(self.param_name)
+        return super()._get_key(request)
+
+    def authenticate(self, request: HttpRequest, key: Optional[str]) -> Optional[Any]:
+        if not key:
+            return None
+        if getattr(request, "session", None) is None:
+            engine = import_module(settings.SESSION_ENGINE)
+            request.session = engine.SessionStore(key)
+        user = get_user(request)
+        if user.is_authenticated and self.is_allowed(user):
+            return user
+        return None
+
+    def is_allowed(self, user: Any) -> bool:
+        return True
+
+
+class CachedSessionAuthSuperUser(CachedSessionAuth):
+    def is_allowed(self, user: Any) -> bool:
+        return bool(getattr(user, "is_superuser", None))
+
+
+class CachedSessionAuthIsStaff(CachedSessionAuth):
+    def is_allowed(self, user: Any) -> bool:
+        return bool(
+            getattr(user, "is_superuser", None) or getattr(user, "is_staff", None)
+        )
+
+
+def _invalidate_session(sender: Any, request: Any, **kwargs: Any) -> None:
+    session = getattr(request, "session", None)
+    session_key = session and session.session_key
+    if session_key:
+        for auth in list(_cached_session_auths):
+            auth.invalidate(session_key)
+
+
+def _invalidate_user(sender: Any, instance: Any, **kwargs: Any) -> None:
+    for auth in list(_cached_session_auths):
+        # also from the shared cache (cache_alias)
+        auth.invalidate_principal(instance.pk)
+
+
+def _connect_signals() -> None:
+    user_logged_out.connect(_invalidate_session, dispatch_uid="penta_session_logout")
+    post_save.connect(
+        _invalidate_user,
+        sender=settings.AUTH_USER_MODEL,
+        dispatch_uid="penta_session_user_save",
+    )
+    post_delete.connect(
+        _invalidate_user,
+        sender=settings.AUTH_USER_MODEL,
+        dispatch_uid="penta_session_user_delete",
+    )
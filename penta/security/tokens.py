@@ -0,0 +1,175 @@
+import hashlib
+import hmac
+import json
+import math
+import threading
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils.crypto import salted_hmac
+
+from penta.errors import ConfigError
+from penta.security.http import HttpBearer
+
+__all__ = ["SignedTokenBearer"]
+
+
+def _b64encode(data: bytes) -> str:
+    return urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _time_claim(claims: Dict[str, Any], name: str, default: float) -> float:
+    "A timestamp claim - ValueError if it's not a number"
+    value = claims.get(name)
+    if value is None:
+        return default
+    is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if not is_number or not math.isfinite(value):
+        raise ValueError(f"Invalid '{name}' claim")
+    return float(value)
+
+
+class SignedTokenBearer(HttpBearer):
+    """
+    Bearer auth with stateless tokens - claims signed with HMAC-SHA256, checked
+    without any database (or cache) lookup; `request.auth` is the claims dict.
+
+    A token is `<key id>.<claims>.<signature>` (the claims are base64 JSON with
+    the expiry time in `exp`). `keys` maps key ids to secrets: tokens are signed
+    with `signing_key` (the first key by default) and verified with any of them,
+    so keys are rotated by adding a new key, signing with it, and removing the
+    old one once its tokens expired.
+
+        auth = SignedTokenBearer(keys={"2024-06": "...", "2024-01": "..."})
+        token = auth.create_token({"sub": "billing-service"}, expires_in=3600)
+    """
+
+    blocking = False  # no I/O - async operations call it in the event loop
+
+    def __init__(
+        self,
+        keys: Optional[Mapping[str, Union[str, bytes]]] = None,
+        signing_key: Optional[str] = None,
+        leeway: float = 0,
+        verify_cache_size: int = 1024,
+    ) -> None:
+        self.leeway = leeway
+        self.verify_cache_size = verify_cache_size
+        self._verified: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        if keys is None:
+            # derived - the SECRET_KEY itself is never a key of these tokens
+            keys = {"default": self.default_key()}
+        self.set_keys(keys, signing_key)
+        super().__init__()
+
+    @staticmethod
+    def default_key() -> bytes:
+        "A key derived from the SECRET_KEY for these tokens only"
+        return salted_hmac(
+            "penta.security.tokens.SignedTokenBearer",
+            "signing key",
+            secret=settings.SECRET_KEY,
+            algorithm="sha256",
+        ).digest()
+
+    def set_keys(
+        self,
+        keys: Mapping[str, Union[str, bytes]],
+        signing_key: Optional[str] = None,
+    ) -> None:
+        "Replaces the keys (e.g. to retire one) - tokens verified before are checked again"
+        if not keys:
+            raise ConfigError("SignedTokenBearer needs at least one key")
+        for key_id in keys:
+            if "." in key_id:
+                raise ConfigError(f"Key id '{key_id}' can't contain '.'")
+        signing_key = signing_key or next(iter(keys))
+        if signing_key not in keys:
+            raise ConfigError(f"Unknown signing key '{signing_key}'")
+        self.keys = {
+            key_id: secret.encode() if isinstance(secret, str) else secret
+            for key_id, secret in keys.items()
+        }
+        self.signing_key = signing_key
+        with self._lock:
+            self._verified.clear()
+
+    def create_token(
+        self,
+        claims: Mapping[str, Any],
+        expires_in: Optional[float] = 3600,
+        key_id: Optional[str] = None,
+    ) -> str:
+        "Signs the claims - adds `iat` and `exp` (unless `expires_in` is None)"
+        key_id = key_id or self.signing_key
+        now = int(time.time())
+        payload: Dict[str, Any] = {"iat": now, **claims}
+        if expires_in is not None:
+            payload["exp"] = now + expires_in
+        body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        signed = f"{key_id}.{body}"
+        return f"{signed}.{self._sign(key_id, signed)}"
+
+    def authenticate(self, request: HttpRequest, token: str) -> Optional[Any]:
+        return self.verify(token)
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        "The claims of a valid token, None if it's invalid or expired"
+        now = time.time()
+        with self._lock:
+            cached = self._verified.get(token)
+            if cached is not None:
+                if now > cached[0] + self.leeway:
+                    del self._verified[token]
+                    return None
+                self._verified.move_to_end(token)
+                return dict(cached[1])
+
+        claims = self._decode(token)
+        if claims is None:
+            return None
+        try:
+            expires = _time_claim(claims, "exp", float("inf"))
+            not_before = _time_claim(claims, "nbf", float("-inf"))
+        except ValueError:
+            return None
+        if now > expires + self.leeway:
+            return None
+        if now < not_before - self.leeway:
+            return None  # not cached - it becomes valid later
+
+        with self._lock:
+            self._verified[token] = (expires, claims)
+            if len(self._verified) > self.verify_cache_size:
+                self._verified.popitem(last=False)
+        return dict(claims)
+
+    def _decode(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            key_id, body, signature = token.split(".")
+        except ValueError:
+            return None
+        if key_id not in self.keys:
+            return None
+        expected = self._sign(key_id, f"{key_id}.{body}")
+        # compare bytes - compare_digest raises TypeError for non-ASCII str
+        if not hmac.compare_digest(expected.encode(), signature.encode()):
+            return None
+        try:
+            claims = json.loads(_b64decode(body))
+        except ValueError:  # pragma: no cover - signed with our key
+            return None
+        return claims if isinstance(claims, dict) else None
+
+    def _sign(self, key_id: str, value: str) -> str:
+        digest = hmac.new(self.keys[key_id], value.encode(), hashlib.sha256).digest()
+        return _b64encode(digest)
@@ -0,0 +1,228 @@
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+__all__ = ["SharedMemoryCache"]
+
+
+# digest of the key, expiry time, value (int64 or float64 by kind), kind
+SLOT = struct.Struct("<16sd8sB7x")
+EMPTY, INT, FLOAT = 0, 1, 2
+SLOTS_PER_BUCKET = 8
+BUCKET_SIZE = SLOT.size * SLOTS_PER_BUCKET
+THREAD_LOCKS = 64
+
+
+class SharedMemoryCache(BaseCache):
+    """
+    Cache for numbers (throttle counters and timestamps) in a memory-mapped file,
+    shared by the worker processes of one host without a cache server.
+
+    The file is a fixed hash table: a key is hashed to a bucket of 8 slots, each
+    bucket has its own lock (a `fcntl` byte-range lock between processes, plus
+    a thread lock inside the process). When a bucket is full, the entry that
+    expires first is evicted.
+
+    Use it as a django cache backend:
+
+        CACHES = {
+            "throttle": {
+                "BACKEND": "penta.shared_memory.SharedMemoryCache",
+                "LOCATION": "/dev/shm/penta-throttle",
+                "OPTIONS": {"buckets": 8192},
+            }
+        }
+
+    or directly - `SharedMemoryCache("/dev/shm/penta-throttle")`.
+    Only int and float values are supported.
+    """
+
+    def __init__(self, location: str, params: Optional[Dict[str, Any]] = None):
+        params = params or {}
+        super().__init__(params)
+        self.location = location
+        self.buckets: int = params.get("OPTIONS", {}).get("buckets", 8192)
+        self.size = self.buckets * BUCKET_SIZE
+        self._thread_locks = [threading.Lock() for _i in range(THREAD_LOCKS)]
+        self._pid: Optional[int] = None
+        self._open_lock = threading.Lock()
+
+    def _open(self) -> None:
+        # (re)opened in every process - fcntl locks are not inherited on fork
+        with self._open_lock:
+            if self._pid == os.getpid():
+                return
+            fd = os.open(self.location, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size < self.size:
+                    os.ftruncate(fd, self.size)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+            self._fd = fd
+            self._map = mmap.mmap(fd, self.size)
+            self._pid = os.getpid()
+
+    @contextmanager
+    def _bucket(self, key: str, version: Optional[int]) -> Iterator[Tuple[bytes, int]]:
+        "Locks the bucket of the key, yields the key digest and the bucket offset"
+        if self._pid != os.getpid():
+            self._open()
+        key = self.make_and_validate_key(key, version=version)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        bucket = int.from_bytes(digest[:8], "little") % self.buckets
+        offset = bucket * BUCKET_SIZE
+        with self._thread_locks[bucket % THREAD_LOCKS]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, BUCKET_SIZE, offset)
+            try:
+                yield digest, offset
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, BUCKET_SIZE, offset)
+
+    def _find(self, digest: bytes, offset: int) -> Tuple[int, Any]:
+        """
+        Returns the slot offset of the key and its value (None if missing/expired),
+        or the offset of the slot to write the key to
+        """
+        now = time.time()
+        free, free_expires = -1, math.inf
+        for position in range(offset, offset + BUCKET_SIZE, SLOT.size):
+            slot_digest, expires, raw, kind = SLOT.unpack_from(self._map, position)
+            if kind != EMPTY and slot_digest == digest:
+                if expires <= now:
+                    return position, None
+                value = struct.unpack("<q" if kind == INT else "<d", raw)[0]
+                return position, value
+            # a free slot, or else the entry that expires first is evicted
+            priority = -math.inf if kind == EMPTY or expires <= now else expires
+            if priority < free_expires:
+                free, free_expires = position, priority
+        return free, None
+
+    def _write(self, position: int, digest: bytes, value: Any, expires: float) -> None:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{self.__class__.__name__} stores only numbers")
+        if isinstance(value, int):
+            raw, kind = struct.pack("<q", value), INT
+        else:
+            raw, kind = struct.pack("<d", value), FLOAT
+        SLOT.pack_into(self._map, position, digest, expires, raw, kind)
+
+    def _expires(self, timeout: Any) -> float:
+        expires = self.get_backend_timeout(timeout)
+        return math.inf if expires is None else expires
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        with self._bucket(key, version) as (digest, offset):
+            position, current = self._find(digest, offset)
+            if current is not None:
+                return False
+            self._write(position, digest, value, self._expires(timeout))
+            return True
+
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        with self._bucket(key, version) as (digest, offset):
+            value = self._find(digest, offset)[1]
+        return default if value is None else value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        with self._bucket(key, version) as (digest, offset):
+            position = self._find(digest, offset)[0]
+            self._write(position, digest, value, self._expires(timeout))
+
+    def touch(
+        self, key: str, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> bool:
+        with self._bucket(key, version) as (digest, offset):
+            position, value = self._find(digest, offset)
+            if value is None:
+                return False
+            self._write(position, digest, value, self._expires(timeout))
+            return True
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        with self._bucket(key, version) as (digest, offset):
+            position, value = self._find(digest, offset)
+            if value is None:
+                return False
+            SLOT.pack_into(self._map, position, b"", 0, b"", EMPTY)
+            return True
+
+    def incr(self, key: str, delta: int = 1, version: Optional[int] = None) -> Any:
+        "Atomic (between threads and processes), keeps the expiry time"
+        with self._bucket(key, version) as (digest, offset):
+            position, value = self._find(digest, offset)
+            if value is None:
+                raise ValueError(f"Key '{key}' not found")
+            expires = SLOT.unpack_from(self._map, position)[1]
+            value += delta
+            self._write(position, digest, value, expires)
+            return value
+
+    def clear(self) -> None:
+        if self._pid != os.getpid():
+            self._open()
+        for bucket in range(self.buckets):
+            offset = bucket * BUCKET_SIZE
+            with self._thread_locks[bucket % THREAD_LOCKS]:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, BUCKET_SIZE, offset)
+                self._map[offset : offset + BUCKET_SIZE] = bytes(BUCKET_SIZE)
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, BUCKET_SIZE, offset)
+
+    # no I/O to wait for - the async versions run in the event loop
+
+    async def aadd(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        return self.add(key, value, timeout, version)
+
+    async def aget(
+        self, key: str, default: Any = None, version: Optional[int] = None
+    ) -> Any:
+        return self.get(key, default, version)
+
+    async def aset(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        self.set(key, value, timeout, version)
+
+    async def adelete(self, key: str, version: Optional[int] = None) -> bool:
+        return self.delete(key, version)
+
+    async def aincr(
+        self, key: str, delta: int = 1, version: Optional[int] = None
+    ) -> Any:
+        return self.incr(key, delta, version)
+
+    def close(self, **kwargs: Any) -> None:
+        # the file stays mapped for the life of the process
+        pass
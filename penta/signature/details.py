@@ -162,6 +162,10 @@ class ViewSignature:
                 attrs["__penta_flatten_map_reverse__"] = {
                     v: (k,) for k, v in flatten_map.items()
                 }
+                if all(len(path) == 1 for path in flatten_map.values()):
+                    attrs["__penta_flat_map__"] = {
+                        k: path[0] for k, path in flatten_map.items()
+                    }
 
             else:
                 assert attrs["__penta_param_source__"] == "body"
@@ -0,0 +1,195 @@
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    cast,
+)
+
+import django
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from pydantic import TypeAdapter
+
+from penta.renderers import ValidatedResponse
+from penta.types import DictStrAny
+
+if TYPE_CHECKING:
+    from penta.operation import Operation  # pragma: no cover
+
+__all__ = [
+    "ASYNC_STREAMING",
+    "JSONArrayStream",
+    "NDJSONStream",
+    "STREAM_FORMATS",
+    "prefetch_stream",
+]
+
+
+logger = logging.getLogger("django")
+
+# StreamingHttpResponse takes async iterators since django 4.2 (QuerySet.aiterator - 4.1)
+ASYNC_STREAMING = django.VERSION >= (4, 2)
+
+
+class JSONArrayStream:
+    """
+    Serializes the items of a `stream=True` operation result into a JSON array,
+    `chunk_size` items at a time, so the whole result never has to be in memory.
+
+    The first chunk is produced before the response starts (so validation errors
+    in it are handled by the regular exception handlers). An error in a later chunk
+    is logged and ends the stream without the closing bracket - the client gets
+    an invalid document instead of a silently truncated one.
+
+    Results of async operations can also be async iterables (including querysets),
+    see `aiter_content`.
+    """
+
+    content_type: Optional[str] = None  # None - the renderer's media type
+    empty = b"[]"
+    opening = b"["
+    separator = b","
+    closing = b"]"
+
+    def __init__(
+        self,
+        operation: "Operation",
+        request: HttpRequest,
+        status: int,
+        item_adapter: Optional[TypeAdapter],
+        dump_kwargs: DictStrAny,
+    ) -> None:
+        self.request = request
+        self.status = status
+        self.item_adapter = item_adapter
+        self.dump_kwargs = dump_kwargs
+        self.renderer = operation.api.renderer
+        self.chunk_size = operation.stream_chunk_size
+        self.context = {"request": request, "response_status": status}
+
+    def serialize(self, item: Any) -> bytes:
+        data = item
+        if self.item_adapter is not None:
+            value = self.item_adapter.validate_python(
+                item, from_attributes=True, context=self.context
+            )
+            if self.renderer.accepts_validated:
+                data = ValidatedResponse(value, self.item_adapter, self.dump_kwargs)
+            else:
+                data = self.item_adapter.dump_python(value, **self.dump_kwargs)
+        content = self.renderer.render(self.request, data, response_status=self.status)
+        if isinstance(content, str):
+            return content.encode()
+        return cast(bytes, content)
+
+    def iter_items(self, result: Iterable) -> Iterator:
+        if isinstance(result, QuerySet):
+            return result.iterator(chunk_size=self.chunk_size)
+        return iter(result)
+
+    def next_chunk(self, items: Iterator) -> List[bytes]:
+        chunk = []
+        for item in items:
+            chunk.append(self.serialize(item))
+            if len(chunk) >= self.chunk_size:
+                break
+        return chunk
+
+    def iter_content(self, result: Iterable) -> Iterator[bytes]:
+        items = self.iter_items(result)
+        chunk = self.next_chunk(items)
+        if not chunk:
+            yield self.empty
+            return
+        yield self.opening + self.separator.join(chunk)
+
+        try:
+            while True:
+                chunk = self.next_chunk(items)
+                if not chunk:
+                    break
+                yield self.separator + self.separator.join(chunk)
+        except Exception:
+            logger.exception(f"Error while streaming response for {self.request.path}")
+            return
+        yield self.closing
+
+    def aiter_items(self, result: Any) -> AsyncIterator:
+        if isinstance(result, QuerySet):
+            return result.aiterator(chunk_size=self.chunk_size)
+        return cast(AsyncIterator, result.__aiter__())
+
+    async def anext_chunk(self, items: AsyncIterator) -> List[bytes]:
+        chunk = []
+        async for item in items:
+            chunk.append(self.serialize(item))
+            if len(chunk) >= self.chunk_size:
+                break
+        return chunk
+
+    async def aiter_content(self, result: Any) -> AsyncIterator[bytes]:
+        "Same as `iter_content`, for async iterables"
+        items = self.aiter_items(result)
+        chunk = await self.anext_chunk(items)
+        if not chunk:
+            yield self.empty
+            return
+        yield self.opening + self.separator.join(chunk)
+
+        try:
+            while True:
+                chunk = await self.anext_chunk(items)
+                if not chunk:
+                    break
+                yield self.separator + self.separator.join(chunk)
+        except Exception:
+            logger.exception(f"Error while streaming response for {self.request.path}")
+            return
+        yield self.closing
+
+
+class NDJSONStream(JSONArrayStream):
+    """
+    Newline delimited JSON - one item per line. A stream interrupted by an error
+    ends without the trailing newline.
+    """
+
+    content_type = "application/x-ndjson"
+    empty = b""
+    opening = b""
+    separator = b"\n"
+    closing = b"\n"
+
+
+STREAM_FORMATS: Dict[str, Type[JSONArrayStream]] = {
+    "json": JSONArrayStream,
+    "ndjson": NDJSONStream,
+}
+
+
+async def prefetch_stream(response: HttpResponseBase) -> None:
+    """
+    Produces the first chunk of an async streaming response before it is returned,
+    so errors in it are still handled by the regular exception handlers.
+    """
+    if not isinstance(response, StreamingHttpResponse):
+        return
+    if not getattr(response, "is_async", False):  # django < 4.2
+        return
+    content = response.streaming_content
+    first_chunk = await content.__anext__()  # type: ignore
+
+    async def chain() -> AsyncIterator[bytes]:
+        yield first_chunk
+        async for chunk in content:  # type: ignore
+            yield chunk
+
+    response.streaming_content = chain()
@@ -4,12 +4,14 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from unittest.mock import Mock
 from urllib.parse import urljoin
 
+from asgiref.sync import async_to_sync
 from django.http import QueryDict, StreamingHttpResponse
 from django.http.request import HttpHeaders, HttpRequest
 
 from penta import Penta, Router
 from penta.responses import PentaJSONEncoder
 from penta.responses import Response as HttpResponse
+from penta.utils import is_async_callable
 
 
 def build_absolute_uri(location: Optional[str] = None) -> str:
@@ -190,6 +192,9 @@ class PentaClientBase:
 
 class TestClient(PentaClientBase):
     def _call(self, func: Callable, request: Mock, kwargs: Dict) -> "PentaResponse":
+        if is_async_callable(func):
+            # async path views of sync operations, as django's WSGI handler runs them
+            func = async_to_sync(func)
         return PentaResponse(func(request, **kwargs))
 
 
@@ -197,7 +202,16 @@ class TestAsyncClient(PentaClientBase):
     async def _call(
         self, func: Callable, request: Mock, kwargs: Dict
     ) -> "PentaResponse":
-        return PentaResponse(await func(request, **kwargs))
+        http_response = await func(request, **kwargs)
+        if isinstance(http_response, StreamingHttpResponse) and getattr(
+            http_response, "is_async", False
+        ):  # django < 4.2 has no async streaming
+            # consuming async content the way ASGI handler does:
+            http_response.streaming_content = [
+                chunk
+                async for chunk in http_response.streaming_content  # type: ignore
+            ]
+        return PentaResponse(http_response)
 
 
 class PentaResponse:
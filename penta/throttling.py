@@ -1,10 +1,46 @@
+import asyncio
 import hashlib
+import logging
+import math
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache as default_cache
+from django.core.cache.backends.base import BaseCache
 from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+logger = logging.getLogger("django")
+
+CONCURRENCY_SLOTS = "_penta_concurrency_slots"
+LOCK_RETRY_DELAY = 0.002  # seconds between the attempts to take a key lock
+
+
+async def _aincr(cache: BaseCache, key: str, delta: int = 1) -> int:
+    """
+    `cache.aincr()` - but the sync `incr()` in a thread if the backend implements
+    only that one: the default `BaseCache.aincr` is a get and a set, not atomic
+    under concurrent requests (locmem, redis and memcached backends of django)
+    """
+    aincr = getattr(cache.aincr, "__func__", None)
+    if aincr is BaseCache.aincr and cache.incr.__func__ is not BaseCache.incr:  # type: ignore[attr-defined]
+        return await sync_to_async(cache.incr)(key, delta)
+    return await cache.aincr(key, delta)
 
 
 class BaseThrottle:
@@ -12,12 +48,25 @@ class BaseThrottle:
     Rate throttling of requests.
     """
 
+    # a sync `allow_request` may do I/O - async operations run it in a thread
+    blocking: bool = True
+
     def allow_request(self, request: HttpRequest) -> bool:
         """
         Return `True` if the request should be allowed, `False` otherwise.
         """
         raise NotImplementedError(".allow_request() must be overridden")
 
+    async def aallow_request(self, request: HttpRequest) -> bool:
+        """
+        Async version of `allow_request`, used by async operations - by default
+        `allow_request` in a thread (or directly if the throttle is not `blocking`).
+        Override it to do the cache (or any other) I/O without a thread.
+        """
+        if not self.blocking:
+            return self.allow_request(request)
+        return await sync_to_async(self.allow_request)(request)
+
     def get_ident(self, request: HttpRequest) -> Optional[str]:
         """
         Identify the machine making the request by parsing HTTP_X_FORWARDED_FOR
@@ -26,9 +75,21 @@ class BaseThrottle:
         """
         from penta.conf import settings
 
+        num_proxies = settings.NUM_PROXIES
+        # computed once per request - all the throttles of an operation need it
+        cached = getattr(request, "_throttle_ident", None)
+        if cached is not None and cached[0] == num_proxies:
+            return cached[1]  # type: ignore
+
+        ident = self._parse_ident(request, num_proxies)
+        request._throttle_ident = (num_proxies, ident)  # type: ignore
+        return ident
+
+    def _parse_ident(
+        self, request: HttpRequest, num_proxies: Optional[int]
+    ) -> Optional[str]:
         xff = request.META.get("HTTP_X_FORWARDED_FOR")
         remote_addr = request.META.get("REMOTE_ADDR")
-        num_proxies = settings.NUM_PROXIES
 
         if num_proxies is not None:
             if num_proxies == 0 or xff is None:
@@ -58,12 +119,20 @@ class SimpleRateThrottle(BaseThrottle):
     Period should be one of: ('s', 'sec', 'm', 'min', 'h', 'hour', 'd', 'day')
 
     Previous request information used for throttling is stored in the cache.
+    It is read and written under a lock of the key, taken with the atomic
+    `cache.add`, so concurrent requests of a client can't take the same slot.
     """
 
     cache = default_cache
     timer = time.time
     cache_format = "throttle_%(scope)s_%(ident)s"
     scope: Optional[str] = None
+    # False - no lock: one cache round-trip less, and checked in one
+    # `get_many`/`set_many` with the other throttles of the operation, but
+    # concurrent requests may be over-admitted
+    lock_state = True
+    # seconds a lock is held at most (if the request holding it died)
+    lock_timeout = 1
 
     _PERIODS = {
         "s": 1,
@@ -148,16 +217,96 @@ class SimpleRateThrottle(BaseThrottle):
         if self.key is None:
             return True
 
-        self.history = self.cache.get(self.key, [])
+        with self._locked(self.key):
+            self.history = self.cache.get(self.key, [])
+            if self._history_is_full():
+                return self.throttle_failure()
+            return self.throttle_success()
+
+    async def aallow_request(self, request: HttpRequest) -> bool:
+        allowed, _wait = await self._acheck(request)
+        return allowed
+
+    @contextmanager
+    def _locked(self, key: str) -> Iterator[None]:
+        """
+        Holds the lock of `key` (if `lock_state`) - or nothing if it was not
+        released within `lock_timeout`, when it expires anyway
+        """
+        lock_key = f"{key}:lock"
+        locked = False
+        if self.lock_state:
+            deadline = time.monotonic() + self.lock_timeout
+            while not (locked := self.cache.add(lock_key, 1, self.lock_timeout)):
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(LOCK_RETRY_DELAY)
+        try:
+            yield
+        finally:
+            if locked:
+                self.cache.delete(lock_key)
+
+    @asynccontextmanager
+    async def _alocked(self, key: str) -> AsyncIterator[None]:
+        "Async version of `_locked`"
+        lock_key = f"{key}:lock"
+        locked = False
+        if self.lock_state:
+            deadline = time.monotonic() + self.lock_timeout
+            while not (locked := await self.cache.aadd(lock_key, 1, self.lock_timeout)):
+                if time.monotonic() > deadline:
+                    break
+                await asyncio.sleep(LOCK_RETRY_DELAY)
+        try:
+            yield
+        finally:
+            if locked:
+                await self.cache.adelete(lock_key)
+
+    async def _acheck(self, request: HttpRequest) -> Tuple[bool, Optional[float]]:
+        """
+        `aallow_request` that also returns the `wait()` of a rejected request.
+        The state of the request is kept in locals - the throttle is shared by
+        the concurrent requests of the operation, that run between the awaits.
+        """
+        key = self.get_cache_key(request)
+        if key is None:
+            return True, None
+
+        async with self._alocked(key):
+            history = await self.cache.aget(key, [])
+            now = self.timer()  # type: ignore
+            self._drop_expired(history, now)
+            if len(history) >= self.num_requests:  # type: ignore
+                self.history, self.now = history, now  # for `wait()`
+                return self.throttle_failure(), self._history_wait(history, now)
+            history.insert(0, now)
+            await self.cache.aset(key, history, self.duration)
+        return True, None
+
+    def allow_cached(self, cached: Any) -> Tuple[bool, Any]:
+        """
+        The check of `allow_request` for the already fetched cache value of
+        `self.key` (None if missing), used by `check_throttles`.
+        Returns whether the request is allowed and the value to store (None - nothing).
+        """
+        self.history = [] if cached is None else cached
+        if self._history_is_full():
+            return self.throttle_failure(), None
+        self.history.insert(0, self.now)
+        return True, self.history
+
+    def _history_is_full(self) -> bool:
         self.now = self.timer()  # type: ignore
+        self._drop_expired(self.history, self.now)
+        return len(self.history) >= self.num_requests  # type: ignore
 
+    def _drop_expired(self, history: List[float], now: float) -> None:
         # Drop any requests from the history which have now passed the
         # throttle duration
-        while self.history and self.history[-1] <= self.now - self.duration:  # type: ignore
-            self.history.pop()
-        if len(self.history) >= self.num_requests:  # type: ignore
-            return self.throttle_failure()
-        return self.throttle_success()
+        while history and history[-1] <= now - self.duration:  # type: ignore
+            history.pop()
 
     def throttle_success(self) -> bool:
         """
@@ -178,16 +327,19 @@ class SimpleRateThrottle(BaseThrottle):
         """
         Returns the recommended next request time in seconds.
         """
-        if self.history:
-            remaining_duration = self.duration - (self.now - self.history[-1])
+        return self._history_wait(self.history, self.now)
+
+    def _history_wait(self, history: List[float], now: float) -> Optional[float]:
+        if history:
+            remaining_duration = self.duration - (now - history[-1])  # type: ignore
         else:
-            remaining_duration = self.duration
+            remaining_duration = self.duration  # type: ignore
 
-        available_requests = self.num_requests - len(self.history) + 1  # type: ignore
+        available_requests = self.num_requests - len(history) + 1  # type: ignore
         if available_requests <= 0:
             return None
 
-        return remaining_duration / float(available_requests)  # type: ignore
+        return remaining_duration / float(available_requests)
 
 
 class AnonRateThrottle(SimpleRateThrottle):
@@ -248,3 +400,679 @@ class UserRateThrottle(SimpleRateThrottle):
             ident = self.get_ident(request)
 
         return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class GCRARateThrottle(SimpleRateThrottle):
+    """
+    Generic cell rate algorithm (a token bucket measured in time): the only state
+    per key is the theoretical arrival time (TAT) of the next request - a single
+    float, whatever the rate is.
+
+    Allows bursts of up to `num_requests` requests, then one request every
+    `duration / num_requests` seconds.
+
+    Use together with a scope throttle - `class MyThrottle(GCRARateThrottle, AnonRateThrottle)`
+    or with one of the builtin `AnonGCRAThrottle`, `AuthGCRAThrottle`, `UserGCRAThrottle`
+    """
+
+    cache_format = "throttle_gcra_%(scope)s_%(ident)s"
+
+    def __init__(self, rate: Optional[str] = None):
+        super().__init__(rate)
+        self.interval: Optional[float] = None
+        if self.num_requests is not None:
+            self.interval = self.duration / self.num_requests  # type: ignore
+
+    def allow_request(self, request: HttpRequest) -> bool:
+        if self.interval is None:
+            return True
+
+        self.key = self.get_cache_key(request)
+        if self.key is None:
+            return True
+
+        with self._locked(self.key):
+            self.now = self.timer()  # type: ignore
+            self.tat = max(self.cache.get(self.key, self.now), self.now)
+            if self.tat + self.interval - self.now > self.duration:
+                return self.throttle_failure()
+            return self.throttle_success()
+
+    async def aallow_request(self, request: HttpRequest) -> bool:
+        allowed, _wait = await self._acheck(request)
+        return allowed
+
+    async def _acheck(self, request: HttpRequest) -> Tuple[bool, Optional[float]]:
+        if self.interval is None:
+            return True, None
+
+        key = self.get_cache_key(request)
+        if key is None:
+            return True, None
+
+        async with self._alocked(key):
+            now = self.timer()  # type: ignore
+            tat = max(await self.cache.aget(key, now), now)
+            if tat + self.interval - now > self.duration:
+                self.tat, self.now = tat, now  # for `wait()`
+                return self.throttle_failure(), self._tat_wait(tat, now)
+            tat += self.interval
+            await self.cache.aset(key, tat, math.ceil(tat - now))
+        return True, None
+
+    def throttle_success(self) -> bool:
+        self.tat += self.interval
+        self.cache.set(self.key, self.tat, math.ceil(self.tat - self.now))
+        return True
+
+    def allow_cached(self, cached: Any) -> Tuple[bool, Any]:
+        self.now = self.timer()  # type: ignore
+        self.tat = self.now if cached is None else max(cached, self.now)
+        if self.tat + self.interval - self.now > self.duration:
+            return self.throttle_failure(), None
+        self.tat += self.interval
+        return True, self.tat
+
+    def wait(self) -> Optional[float]:
+        """
+        Returns the seconds until the next request is allowed.
+        """
+        return self._tat_wait(self.tat, self.now)
+
+    def _tat_wait(self, tat: float, now: float) -> float:
+        return max(0.0, tat + self.interval - now - self.duration)  # type: ignore
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding window counter: the count of the current fixed window plus the count
+    of the previous one, weighted by how much of it the sliding window still covers.
+
+    Every window is a counter in the cache, updated with atomic `add`/`incr`
+    (in async operations too) - so the limit holds under
+    concurrent requests, as long as the cache backend's `incr` is atomic
+    (memcached, redis, locmem).
+
+    Use together with a scope throttle - `class MyThrottle(SlidingWindowRateThrottle, AnonRateThrottle)`
+    or with one of the builtin `AnonSlidingWindowThrottle`, `AuthSlidingWindowThrottle`,
+    `UserSlidingWindowThrottle`
+    """
+
+    cache_format = "throttle_sliding_%(scope)s_%(ident)s"
+
+    def allow_request(self, request: HttpRequest) -> bool:
+        if self.num_requests is None:
+            return True
+
+        self.key = self.get_cache_key(request)
+        if self.key is None:
+            return True
+
+        current_key, previous_key = self._start_window()
+        # counters of the windows are needed till the end of the next window
+        self.cache.add(current_key, 0, 2 * self.duration)  # type: ignore
+        self.current = self.cache.incr(current_key)
+        self.previous = self.cache.get(previous_key, 0)
+        if self._window_count() > self.num_requests:
+            self.cache.decr(current_key)
+            self.current -= 1
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    async def aallow_request(self, request: HttpRequest) -> bool:
+        allowed, _wait = await self._acheck(request)
+        return allowed
+
+    async def _acheck(self, request: HttpRequest) -> Tuple[bool, Optional[float]]:
+        if self.num_requests is None:
+            return True, None
+
+        key = self.get_cache_key(request)
+        if key is None:
+            return True, None
+
+        now = self.timer()  # type: ignore
+        current_key, previous_key, window = self._windows(key, now)
+        await self.cache.aadd(current_key, 0, 2 * self.duration)  # type: ignore
+        current = await _aincr(self.cache, current_key)
+        previous = await self.cache.aget(previous_key, 0)
+        elapsed = now - window
+        if self._count(elapsed, current, previous) > self.num_requests:
+            await _aincr(self.cache, current_key, -1)
+            # for `wait()`
+            self.now, self.window, self.current, self.previous = (
+                now,
+                window,
+                current - 1,
+                previous,
+            )
+            return self.throttle_failure(), self._window_wait(
+                elapsed, current - 1, previous
+            )
+        return self.throttle_success(), None
+
+    def throttle_success(self) -> bool:
+        return True
+
+    def _start_window(self) -> Tuple[str, str]:
+        "Returns the cache keys of the current and the previous windows"
+        self.now = self.timer()  # type: ignore
+        current_key, previous_key, self.window = self._windows(self.key, self.now)  # type: ignore
+        return current_key, previous_key
+
+    def _windows(self, key: str, now: float) -> Tuple[str, str, float]:
+        "The cache keys of the current and the previous windows, and the start of the current one"
+        index = int(now // self.duration)  # type: ignore
+        return f"{key}:{index}", f"{key}:{index - 1}", index * self.duration  # type: ignore
+
+    def _window_count(self) -> float:
+        return self._count(self.now - self.window, self.current, self.previous)
+
+    def _count(self, elapsed: float, current: int, previous: int) -> float:
+        return previous * (1 - elapsed / self.duration) + current  # type: ignore
+
+    def wait(self) -> Optional[float]:
+        """
+        Returns the seconds until the next request is allowed.
+        """
+        return self._window_wait(self.now - self.window, self.current, self.previous)
+
+    def _window_wait(self, elapsed: float, current: int, previous: int) -> float:
+        duration: int = self.duration  # type: ignore
+        allowed = self.num_requests - 1  # type: ignore
+        if current > allowed:
+            # the current window becomes the previous one in the next window
+            return duration - elapsed + duration * (1 - allowed / current)
+        if not previous:
+            return 0.0
+        return max(0.0, duration * (1 - (allowed - current) / previous) - elapsed)
+
+
+class TwoTierRateThrottle(SimpleRateThrottle):
+    """
+    Fixed window counter shared through the cache, but checked mostly in memory:
+    each process leases a budget of requests from the shared counter (one atomic
+    `incr` per lease) and spends it locally, going back to the cache only when the
+    budget is used up.
+
+    The limit is never exceeded; a process can hold an unused budget of up to
+    `tolerance * num_requests` requests, so the other ones may be rejected a bit
+    earlier than the exact limit.
+
+    If the cache fails, the request is allowed (`fail_open=True`, the default)
+    or rejected (`fail_open=False`) instead of raising.
+
+    Use together with a scope throttle - `class MyThrottle(TwoTierRateThrottle, AnonRateThrottle)`
+    or with one of the builtin `AnonTwoTierThrottle`, `AuthTwoTierThrottle`,
+    `UserTwoTierThrottle`
+    """
+
+    cache_format = "throttle_tiered_%(scope)s_%(ident)s"
+    tolerance = 0.1
+    fail_open = True
+    max_local_keys = 10000  # the least recently used budgets are dropped
+
+    def __init__(
+        self,
+        rate: Optional[str] = None,
+        tolerance: Optional[float] = None,
+        fail_open: Optional[bool] = None,
+    ):
+        super().__init__(rate)
+        if tolerance is not None:
+            self.tolerance = tolerance
+        if fail_open is not None:
+            self.fail_open = fail_open
+        self.lease_size = max(1, int((self.num_requests or 0) * self.tolerance))
+        # key -> [window index, requests left in the budget (-1: window is used up)]
+        self._budgets: OrderedDict[str, List[int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow_request(self, request: HttpRequest) -> bool:
+        if self.num_requests is None:
+            return True
+
+        key = self.key = self.get_cache_key(request)
+        if key is None:
+            return True
+
+        index = self._start_window()
+        allowed = self._spend_budget(key, index)
+        if allowed is not None:
+            return allowed or self.throttle_failure()
+
+        shared_key = f"{key}:{index}"
+        try:
+            self.cache.add(shared_key, 0, self.duration)
+            total = self.cache.incr(shared_key, self.lease_size)
+        except Exception:
+            return self._cache_failed()
+        return self._lease(key, index, total)
+
+    async def aallow_request(self, request: HttpRequest) -> bool:
+        allowed, _wait = await self._acheck(request)
+        return allowed
+
+    async def _acheck(self, request: HttpRequest) -> Tuple[bool, Optional[float]]:
+        if self.num_requests is None:
+            return True, None
+
+        # in locals - concurrent requests of other clients run between the awaits
+        key = self.get_cache_key(request)
+        if key is None:
+            return True, None
+
+        now = self.timer()  # type: ignore
+        index = int(now // self.duration)  # type: ignore
+        allowed = self._spend_budget(key, index)
+        if allowed is False:
+            allowed = self.throttle_failure()
+        elif allowed is None:
+            shared_key = f"{key}:{index}"
+            try:
+                await self.cache.aadd(shared_key, 0, self.duration)
+                total = await _aincr(self.cache, shared_key, self.lease_size)
+            except Exception:
+                allowed = self._cache_failed()
+            else:
+                allowed = self._lease(key, index, total)
+        if allowed:
+            return True, None
+
+        # for `wait()`
+        self.now, self.window_end = now, (index + 1) * self.duration  # type: ignore
+        return False, self.window_end - now
+
+    def _start_window(self) -> int:
+        self.now = self.timer()  # type: ignore
+        index = int(self.now // self.duration)  # type: ignore
+        self.window_end = (index + 1) * self.duration  # type: ignore
+        return index
+
+    def _spend_budget(self, key: str, index: int) -> Optional[bool]:
+        "Decides from the local budget; None if a new lease is needed"
+        with self._lock:
+            budget = self._budgets.get(key)
+            if budget is None or budget[0] != index or budget[1] == 0:
+                return None
+            if budget[1] < 0:
+                return False
+            budget[1] -= 1
+            self._budgets.move_to_end(key)
+            return True
+
+    def _lease(self, key: str, index: int, total: int) -> bool:
+        "Stores the budget leased from the shared counter (now at `total`)"
+        granted = min(self.lease_size, self.num_requests - (total - self.lease_size))  # type: ignore
+        with self._lock:
+            self._budgets[key] = [index, granted - 1 if granted > 0 else -1]
+            self._budgets.move_to_end(key)
+            while len(self._budgets) > self.max_local_keys:
+                self._budgets.popitem(last=False)
+        if granted > 0:
+            return True
+        return self.throttle_failure()
+
+    def _cache_failed(self) -> bool:
+        logger.warning(
+            "Throttle cache failed, request %s",
+            "allowed" if self.fail_open else "rejected",
+            exc_info=True,
+        )
+        return self.fail_open or self.throttle_failure()
+
+    def wait(self) -> Optional[float]:
+        """
+        Returns the seconds until the next window.
+        """
+        return self.window_end - self.now
+
+
+class LocalConcurrencyBackend:
+    """
+    Counts the in-flight requests in the memory of the process
+    """
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: int) -> bool:
+        with self._lock:
+            count = self.counts.get(key, 0)
+            if count >= limit:
+                return False
+            self.counts[key] = count + 1
+            return True
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            count = self.counts.get(key, 0) - 1
+            if count > 0:
+                self.counts[key] = count
+            else:
+                self.counts.pop(key, None)
+
+    async def aacquire(self, key: str, limit: int) -> bool:
+        return self.acquire(key, limit)
+
+    async def arelease(self, key: str) -> None:
+        self.release(key)
+
+
+class CacheConcurrencyBackend:
+    """
+    Counts the in-flight requests in the cache (shared by all processes) with
+    atomic `add`/`incr`/`decr`. The counters expire after `timeout` seconds
+    without new requests, so the slots of a killed process are not lost forever.
+    """
+
+    def __init__(self, cache: Optional[BaseCache] = None, timeout: int = 300) -> None:
+        self.cache = default_cache if cache is None else cache
+        self.timeout = timeout
+
+    def acquire(self, key: str, limit: int) -> bool:
+        self.cache.add(key, 0, self.timeout)
+        if self.cache.incr(key) > limit:
+            self.release(key)
+            return False
+        return True
+
+    def release(self, key: str) -> None:
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            pass  # expired
+
+    async def aacquire(self, key: str, limit: int) -> bool:
+        await self.cache.aadd(key, 0, self.timeout)
+        if await _aincr(self.cache, key) > limit:
+            await self.arelease(key)
+            return False
+        return True
+
+    async def arelease(self, key: str) -> None:
+        try:
+            await _aincr(self.cache, key, -1)
+        except ValueError:
+            pass  # expired
+
+
+ConcurrencyBackend = Union[LocalConcurrencyBackend, CacheConcurrencyBackend]
+
+
+class ConcurrencyThrottle(SimpleRateThrottle):
+    """
+    Limits the number of requests of the same client being processed at the same
+    time (instead of the number of requests per period).
+
+    The slot is taken in the throttle check and released when the operation
+    returns its response (or when a streaming response is closed).
+
+    Use together with a scope throttle (for the identity of the client) -
+    `class MyThrottle(ConcurrencyThrottle, AuthRateThrottle)` or with one of the builtin
+    `AnonConcurrencyThrottle`, `AuthConcurrencyThrottle`, `UserConcurrencyThrottle`
+    """
+
+    cache_format = "throttle_concurrency_%(scope)s_%(ident)s"
+    retry_after: Optional[float] = 1
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        backend: Optional[ConcurrencyBackend] = None,
+        retry_after: Optional[float] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.backend = LocalConcurrencyBackend() if backend is None else backend
+        if retry_after is not None:
+            self.retry_after = retry_after
+
+    def allow_request(self, request: HttpRequest) -> bool:
+        key = self.get_cache_key(request)
+        if key is None:
+            return True
+        if not self.backend.acquire(key, self.max_concurrent):
+            return self.throttle_failure()
+        self._taken(request, key)
+        return True
+
+    async def aallow_request(self, request: HttpRequest) -> bool:
+        key = self.get_cache_key(request)
+        if key is None:
+            return True
+        if not await self.backend.aacquire(key, self.max_concurrent):
+            return self.throttle_failure()
+        self._taken(request, key)
+        return True
+
+    def _taken(self, request: HttpRequest, key: str) -> None:
+        slots = request.__dict__.setdefault(CONCURRENCY_SLOTS, [])
+        slots.append((self.backend, key))
+
+    def wait(self) -> Optional[float]:
+        """
+        Returns `retry_after` - there is no way to know when a slot is released.
+        """
+        return self.retry_after
+
+
+class AnonGCRAThrottle(GCRARateThrottle, AnonRateThrottle):
+    "AnonRateThrottle with the GCRA algorithm"
+
+
+class AuthGCRAThrottle(GCRARateThrottle, AuthRateThrottle):
+    "AuthRateThrottle with the GCRA algorithm"
+
+
+class UserGCRAThrottle(GCRARateThrottle, UserRateThrottle):
+    "UserRateThrottle with the GCRA algorithm"
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle, AnonRateThrottle):
+    "AnonRateThrottle with the sliding window counter algorithm"
+
+
+class AuthSlidingWindowThrottle(SlidingWindowRateThrottle, AuthRateThrottle):
+    "AuthRateThrottle with the sliding window counter algorithm"
+
+
+class UserSlidingWindowThrottle(SlidingWindowRateThrottle, UserRateThrottle):
+    "UserRateThrottle with the sliding window counter algorithm"
+
+
+class AnonTwoTierThrottle(TwoTierRateThrottle, AnonRateThrottle):
+    "AnonRateThrottle with the two tier (local budget + shared counter) algorithm"
+
+
+class AuthTwoTierThrottle(TwoTierRateThrottle, AuthRateThrottle):
+    "AuthRateThrottle with the two tier (local budget + shared counter) algorithm"
+
+
+class UserTwoTierThrottle(TwoTierRateThrottle, UserRateThrottle):
+    "UserRateThrottle with the two tier (local budget + shared counter) algorithm"
+
+
+class AnonConcurrencyThrottle(ConcurrencyThrottle, AnonRateThrottle):
+    "Limits the concurrent requests of anonymous clients (by IP address)"
+
+
+class AuthConcurrencyThrottle(ConcurrencyThrottle, AuthRateThrottle):
+    "Limits the concurrent requests by `request.auth` (IP address for anonymous ones)"
+
+
+class UserConcurrencyThrottle(ConcurrencyThrottle, UserRateThrottle):
+    "Limits the concurrent requests by django user (IP address for anonymous ones)"
+
+
+_implements: Dict[Tuple[type, str], bool] = {}
+
+# the hooks of `allow_request` - a subclass may override them instead of it
+_HOOKS = ("allow_request", "throttle_success", "throttle_failure")
+
+
+def _implements_allow_request(
+    throttle: BaseThrottle, name: str, also: Tuple[str, ...] = ()
+) -> bool:
+    """
+    True if the method `name` of the throttle does the same checks as its
+    `allow_request` - False if `allow_request`, its `throttle_success` /
+    `throttle_failure` hooks (or one of the methods `also`) were overridden in
+    a subclass (then using `name` would skip the override)
+    """
+    throttle_class = type(throttle)
+    result = _implements.get((throttle_class, name))
+    if result is None:
+        mro = throttle_class.__mro__
+
+        def defined_at(name: str) -> int:
+            return next(
+                (i for i, cls in enumerate(mro) if name in cls.__dict__), len(mro)
+            )
+
+        result = defined_at(name) <= min(map(defined_at, _HOOKS + also))
+        _implements[(throttle_class, name)] = result
+    return result
+
+
+def has_aallow_request(throttle: BaseThrottle) -> bool:
+    "True if async operations can use `aallow_request` of the throttle"
+    return _implements_allow_request(throttle, "aallow_request")
+
+
+def is_batchable(throttle: BaseThrottle) -> bool:
+    "True if the throttle can be checked with the others in one cache round-trip"
+    if getattr(throttle, "lock_state", False):
+        return False  # the key must be locked for the check
+    return _implements_allow_request(throttle, "allow_cached")
+
+
+BatchedThrottles = Dict[int, Tuple[BaseCache, List[Tuple[SimpleRateThrottle, str]]]]
+
+
+def _collect_batched(
+    request: HttpRequest, throttles: List[BaseThrottle]
+) -> Tuple[BatchedThrottles, List[BaseThrottle]]:
+    "Splits the throttles to the batched ones (with their keys, by cache) and the rest"
+    batched: BatchedThrottles = {}
+    others = []
+    for throttle in throttles:
+        if not is_batchable(throttle):
+            others.append(throttle)
+            continue
+        rate_throttle = cast(SimpleRateThrottle, throttle)
+        if rate_throttle.num_requests is None:
+            continue
+        key = rate_throttle.get_cache_key(request)
+        if key is None:
+            continue
+        rate_throttle.key = key
+        cache = rate_throttle.cache
+        batched.setdefault(id(cache), (cache, []))[1].append((rate_throttle, key))
+    return batched, others
+
+
+def _check_batched(
+    items: List[Tuple[SimpleRateThrottle, str]],
+    values: Dict[str, Any],
+    durations: List[Optional[float]],
+) -> Tuple[Dict[str, Any], int]:
+    "Checks the throttles against the fetched `values`; returns the values to store"
+    updates = {}
+    timeout = 0
+    for throttle, key in items:
+        allowed, value = throttle.allow_cached(values.get(key))
+        if not allowed:
+            durations.append(throttle.wait())
+        elif value is not None:
+            # the next throttle with the same key sees this update
+            values[key] = updates[key] = value
+            # one write for all - kept as long as the longest throttle period needs
+            timeout = max(timeout, throttle.duration)  # type: ignore
+    return updates, timeout
+
+
+def check_throttles(
+    request: HttpRequest, throttles: List[BaseThrottle]
+) -> List[Optional[float]]:
+    """
+    Checks all the throttles of an operation for the request - with one `get_many`
+    and one `set_many` per cache for the throttles that support it (`allow_cached`),
+    instead of a `get` and a `set` for each of them.
+
+    Returns the `wait()` of every throttle that rejected the request.
+    """
+    durations: List[Optional[float]] = []
+    batched, others = _collect_batched(request, throttles)
+    for cache, items in batched.values():
+        values = cache.get_many({key for _, key in items})
+        updates, timeout = _check_batched(items, values, durations)
+        if updates:
+            cache.set_many(updates, timeout)
+
+    for throttle in others:
+        if not throttle.allow_request(request):
+            durations.append(throttle.wait())
+    return durations
+
+
+async def acheck_throttles(
+    request: HttpRequest, throttles: List[BaseThrottle]
+) -> List[Optional[float]]:
+    "Async version of `check_throttles`"
+    durations: List[Optional[float]] = []
+    batched, others = _collect_batched(request, throttles)
+    for cache, items in batched.values():
+        values = await cache.aget_many({key for _, key in items})
+        updates, timeout = _check_batched(items, values, durations)
+        if updates:
+            await cache.aset_many(updates, timeout)
+
+    for throttle in others:
+        if _implements_allow_request(throttle, "_acheck", ("aallow_request", "wait")):
+            # the wait of this request - not of a concurrent one, checked meanwhile
+            allowed, wait = await throttle._acheck(request)  # type: ignore[attr-defined]
+            if not allowed:
+                durations.append(wait)
+            continue
+        if has_aallow_request(throttle):
+            allowed = await throttle.aallow_request(request)
+        elif throttle.blocking:
+            allowed = await sync_to_async(throttle.allow_request)(request)
+        else:
+            allowed = throttle.allow_request(request)
+        if not allowed:
+            durations.append(throttle.wait())
+    return durations
+
+
+def release_concurrency_slots(
+    request: HttpRequest, response: Optional[HttpResponseBase] = None
+) -> None:
+    """
+    Releases the slots taken by the concurrency throttles for the request -
+    when a streaming `response` is closed, or right away
+    """
+    slots = request.__dict__.pop(CONCURRENCY_SLOTS, None)
+    if not slots:
+        return
+
+    def release() -> None:
+        for backend, key in slots:
+            backend.release(key)
+
+    if response is not None and response.streaming:
+        response._resource_closers.append(release)  # type: ignore[attr-defined]
+    else:
+        release()
+
+
+async def arelease_concurrency_slots(
+    request: HttpRequest, response: Optional[HttpResponseBase] = None
+) -> None:
+    "Async version of `release_concurrency_slots`"
+    if response is not None and response.streaming:
+        release_concurrency_slots(request, response)
+        return
+    for backend, key in request.__dict__.pop(CONCURRENCY_SLOTS, None) or ():
+        await backend.arelease(key)
@@ -0,0 +1,121 @@
+"""
+Compares the JSON renderer and parser backends on realistic payloads.
+
+    python scripts/benchmarks/json_backends.py [--number 200]
+
+ORJSON backends are skipped when orjson is not installed.
+"""
+
+import argparse
+import datetime
+import json
+import sys
+import timeit
+import uuid
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+django.setup()
+
+from pydantic import BaseModel  # noqa: E402
+from pydantic_core import Url  # noqa: E402
+
+from penta.parser import ORJSONParser, Parser  # noqa: E402
+from penta.renderers import JSONRenderer, ORJSONRenderer  # noqa: E402
+
+
+class Status(str, Enum):
+    ACTIVE = "active"
+    BLOCKED = "blocked"
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    zip_code: str
+
+
+def make_row(i: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "uuid": uuid.UUID(int=i),
+        "name": f"Customer {i}",
+        "email": f"customer{i}@example.com",
+        "status": Status.ACTIVE if i % 3 else Status.BLOCKED,
+        "balance": Decimal(f"{i}.{i % 100:02d}"),
+        "created": datetime.datetime(2024, 1, 1, 12, 0, 0, i % 1000000),
+        "birthday": datetime.date(1990, 1 + i % 12, 1 + i % 28),
+        "website": Url(f"https://example.com/{i}"),
+        "address": Address(street=f"{i} Main st", city="Springfield", zip_code="12345"),
+        "tags": ["a", "b", "c"],
+        "score": i / 7,
+    }
+
+
+PAYLOADS = {
+    "small object": make_row(1),
+    "list of 100": [make_row(i) for i in range(100)],
+    "list of 10000": [make_row(i) for i in range(10000)],
+}
+
+
+class FakeRequest:
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+def bench(func: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--number", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    renderers: List[Any] = [JSONRenderer()]
+    parsers: List[Any] = [Parser()]
+    try:
+        renderers.append(ORJSONRenderer())
+        parsers.append(ORJSONParser())
+    except Exception as e:
+        print(f"Skipping orjson backends: {e}")
+
+    print(f"{'payload':<16}{'backend':<16}{'render us':>14}{'parse us':>14}")
+    for name, payload in PAYLOADS.items():
+        body = JSONRenderer().render(None, payload, response_status=200).encode()
+        request = FakeRequest(body)
+        for renderer, parser in zip(renderers, parsers):
+            render_time = bench(
+                lambda r=renderer, p=payload: r.render(None, p, response_status=200),
+                args.number,
+            )
+            parse_time = bench(
+                lambda ps=parser, rq=request: ps.parse_body(rq),
+                args.number,
+            )
+            backend = type(renderer).__name__.replace("Renderer", "")
+            print(f"{name:<16}{backend:<16}{render_time:>14.1f}{parse_time:>14.1f}")
+
+    # sanity check: both backends produce the same data
+    for renderer in renderers[1:]:
+        for payload in PAYLOADS.values():
+            expected = json.loads(
+                JSONRenderer().render(None, payload, response_status=200)
+            )
+            assert (
+                json.loads(renderer.render(None, payload, response_status=200))
+                == expected
+            )
+
+
+if __name__ == "__main__":
+    main()
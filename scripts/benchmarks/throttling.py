@@ -0,0 +1,72 @@
+"""
+Per-request cost of the throttles at growing rate limits, with django's
+local memory cache (pickles the values, like the shared caches do).
+
+SimpleRateThrottle keeps every request timestamp of the period, so its cost grows
+with the rate; GCRA and the sliding window counter keep a constant-size state.
+
+    python scripts/benchmarks/throttling.py [--number 2000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+django.setup()
+
+from django.http import HttpRequest  # noqa: E402
+
+from penta.throttling import (  # noqa: E402
+    AnonGCRAThrottle,
+    AnonRateThrottle,
+    AnonSlidingWindowThrottle,
+)
+
+RATES = ["10/d", "1000/d", "10000/d"]
+THROTTLES = [AnonRateThrottle, AnonGCRAThrottle, AnonSlidingWindowThrottle]
+
+
+def bench(throttle_class: Any, rate: str, number: int) -> float:
+    throttle = throttle_class(rate)
+    throttle.cache.clear()
+    request = HttpRequest()
+    request.META["REMOTE_ADDR"] = "127.0.0.1"
+    request.auth = None  # type: ignore
+
+    # fill the state up to the limit (requests are never rejected below it)
+    clock = [0.0]
+    throttle.timer = lambda: clock[0]
+    for _i in range(throttle.num_requests - 1):
+        clock[0] += 0.001
+        throttle.allow_request(request)
+
+    def call() -> None:
+        clock[0] += 0.001
+        throttle.allow_request(request)
+
+    return min(timeit.repeat(call, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--number", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    print(f"{'rate':<12}" + "".join(f"{t.__name__ + ' us':>32}" for t in THROTTLES))
+    for rate in RATES:
+        times = [bench(t, rate, args.number) for t in THROTTLES]
+        print(f"{rate:<12}" + "".join(f"{t:>32.1f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
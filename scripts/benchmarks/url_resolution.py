@@ -0,0 +1,127 @@
+"""
+URL resolution time on an api with ~2000 routes (500 paths x GET/POST/PUT/DELETE),
+one url pattern per operation (previous behaviour) vs one pattern per path
+vs the prefix tree (radix_routing=True).
+
+    python scripts/benchmarks/url_resolution.py [--paths 500] [--number 2000]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(ROOT_URLCONF=__name__)
+django.setup()
+
+from django.urls import URLPattern, URLResolver  # noqa: E402
+from django.urls import path as django_path  # noqa: E402
+from django.urls.resolvers import RegexPattern  # noqa: E402
+
+from penta import Penta, Router  # noqa: E402
+from penta.router import ReverseOnlyPattern  # noqa: E402
+from penta.utils import normalize_path, replace_path_param_notation  # noqa: E402
+
+urlpatterns: List[Any] = []
+
+
+def build_api(paths: int, radix_routing: bool = False) -> Penta:
+    api = Penta(radix_routing=radix_routing)
+    for i in range(paths):
+        router = Router()
+
+        def view(item_id: int) -> int:
+            return item_id  # pragma: no cover
+
+        route = f"/resource{i}/{{item_id}}"
+        router.get(route, url_name=f"get_{i}")(view)
+        router.post(route, url_name=f"post_{i}")(view)
+        router.put(route, url_name=f"put_{i}")(view)
+        router.delete(route, url_name=f"delete_{i}")(view)
+        api.add_router("", router)
+    return api
+
+
+def per_operation_patterns(api: Penta) -> List[URLPattern]:
+    "The url patterns as they were generated before: one per operation"
+    result = []
+    for prefix, router in api._routers:
+        prefix = replace_path_param_notation(prefix)
+        for path, path_view in router.path_operations.items():
+            for operation in path_view.operations:
+                route = "/".join([
+                    i for i in (prefix, replace_path_param_notation(path)) if i
+                ])
+                route = normalize_path(route).lstrip("/")
+                result.append(
+                    django_path(route, path_view.get_view(), name=operation.url_name)
+                )
+    return result
+
+
+def resolver(patterns: List[Any]) -> URLResolver:
+    return URLResolver(RegexPattern(r"^/"), patterns)
+
+
+def bench(func: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--paths", type=int, default=500)
+    arg_parser.add_argument("--number", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    api = build_api(args.paths)
+    old = resolver(per_operation_patterns(api))
+    new = resolver(api.urls[0])
+    radix = resolver(build_api(args.paths, radix_routing=True).urls[0])
+
+    random.seed(0)
+    targets = [
+        f"/resource{random.randrange(args.paths)}/{i}" for i in range(args.number)
+    ]
+    first, middle, last = (
+        "/resource0/1",
+        f"/resource{args.paths // 2}/1",
+        f"/resource{args.paths - 1}/1",
+    )
+
+    resolving = [
+        p for p in new.url_patterns if not isinstance(p.pattern, ReverseOnlyPattern)
+    ]
+    print(f"{len(old.url_patterns)} patterns before, {len(resolving)} now")
+    print(f"{'url':<24}{'before us':>14}{'now us':>14}{'radix us':>14}")
+    for name, url in [("first", first), ("middle", middle), ("last", last)]:
+        times = [
+            bench(lambda r=r, u=url: r.resolve(u), args.number)
+            for r in (old, new, radix)
+        ]
+        print(f"{name:<24}" + "".join(f"{t:>14.1f}" for t in times))
+
+    times = [
+        bench(lambda r=r: [r.resolve(u) for u in targets], 1) / len(targets)
+        for r in (old, new, radix)
+    ]
+    print(f"{'random mix':<24}" + "".join(f"{t:>14.1f}" for t in times))
+
+    # sanity check: the same views are resolved and all names still reverse
+    for url in (first, middle, last):
+        assert old.resolve(url).func == new.resolve(url).func
+        assert radix.resolve(url).url_name == new.resolve(url).url_name
+    for i in (0, args.paths - 1):
+        for method in ("get", "post", "put", "delete"):
+            for r in (new, radix):
+                assert r.reverse(f"{method}_{i}", item_id=1) == f"resource{i}/1"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+import pytest
+from django.http import HttpResponse
+
+from penta import Penta, Router
+from penta.asgi import PentaASGIHandler
+from penta.request import Request
+
+api = Penta(urls_namespace="asgi-fast-lane")
+router = Router()
+
+
+@router.get("/items/{int:item_id}")
+async def get_item(item_id: int):
+    return {"id": item_id, "request": type(get_request()).__name__}
+
+
+@router.post("/items")
+def create_item(name: str):
+    return {"name": name}
+
+
+@router.get("/headers")
+async def headers(response: HttpResponse):
+    return "ok"
+
+
+api.add_router("/", router)
+
+
+def get_request():
+    from penta import context
+
+    return context.request.get()
+
+
+class HeaderMiddleware:
+    async_capable = True
+    sync_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    async def __call__(self, request):
+        response = await self.get_response(request)
+        response["X-Fast-Lane"] = "yes"
+        return response
+
+
+class SyncOnlyMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.sync_middleware = True
+        response = self.get_response(request)
+        response["X-Sync"] = "yes"
+        return response
+
+
+class FallbackApp:
+    def __init__(self):
+        self.scopes = []
+
+    async def __call__(self, scope, receive, send):
+        self.scopes.append(scope)
+        if scope["type"] != "http":
+            return
+        await send({"type": "http.response.start", "status": 299, "headers": []})
+        await send({"type": "http.response.body", "body": b"django"})
+
+
+async def call(app, method, path, body=b"", query_string=b""):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()  # no disconnect
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = sent[0]["status"]
+    headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+    content = b"".join(m.get("body", b"") for m in sent[1:])
+    return status, headers, content
+
+
+@pytest.fixture
+def fallback():
+    return FallbackApp()
+
+
+@pytest.mark.asyncio
+async def test_api_requests(fallback):
+    app = api.asgi_app("api/", fallback, middleware=[HeaderMiddleware])
+    assert isinstance(app, PentaASGIHandler)
+
+    status, headers, content = await call(app, "GET", "/api/items/1")
+    assert status == 200
+    assert json.loads(content) == {"id": 1, "request": Request.__name__}
+    assert headers["X-Fast-Lane"] == "yes"
+
+    status, headers, content = await call(
+        app, "POST", "/api/items", query_string=b"name=x"
+    )
+    assert json.loads(content) == {"name": "x"}
+
+    status, _, content = await call(app, "PUT", "/api/items")
+    assert status == 405
+
+    assert fallback.scopes == []
+
+
+@pytest.mark.asyncio
+async def test_other_requests_go_to_django(fallback):
+    app = api.asgi_app("api/", fallback)
+
+    for path in ["/admin/", "/api/unknown", "/api/items/x"]:
+        status, _headers, content = await call(app, "GET", path)
+        assert (status, content) == (299, b"django")
+    assert [s["path"] for s in fallback.scopes] == [
+        "/admin/",
+        "/api/unknown",
+        "/api/items/x",
+    ]
+
+    await app({"type": "lifespan"}, None, None)
+    assert fallback.scopes[-1] == {"type": "lifespan"}
+
+
+@pytest.mark.asyncio
+async def test_only_opted_in_middleware(fallback):
+    app = api.asgi_app(
+        "api/", fallback, middleware=["tests.test_asgi.SyncOnlyMiddleware"]
+    )
+    status, headers, _ = await call(app, "GET", "/api/headers")
+    assert status == 200
+    assert headers["X-Sync"] == "yes"
+    # project middleware (settings.MIDDLEWARE) is not used:
+    assert "X-Frame-Options" not in headers
+
+    app = api.asgi_app("api/", fallback)
+    _, headers, _ = await call(app, "GET", "/api/headers")
+    assert "X-Sync" not in headers
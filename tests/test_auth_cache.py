@@ -0,0 +1,230 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from penta import Penta
+from penta.security import APIKeyHeader, HttpBasicAuth, HttpBearer
+from penta.testing import TestAsyncClient, TestClient
+
+
+class CachedBearer(HttpBearer):
+    cache_ttl = 60
+    cache_size = 2
+
+    def __init__(self):
+        self.calls = []
+        super().__init__()
+
+    def authenticate(self, request, token):
+        self.calls.append(token)
+        if token.startswith("valid"):
+            return {"token": token}
+
+
+class User:
+    def __init__(self, pk):
+        self.pk = pk
+
+
+def build_request(headers):
+    return TestClient(None)._build_request("GET", "/", {}, {"headers": headers})
+
+
+def bearer(token):
+    return build_request({"Authorization": f"Bearer {token}"})
+
+
+def test_cached_results():
+    auth = CachedBearer()
+    assert auth(bearer("valid1")) == {"token": "valid1"}
+    assert auth(bearer("valid1")) == {"token": "valid1"}
+    assert auth.calls == ["valid1"]
+
+    # failures are not cached
+    assert auth(bearer("invalid")) is None
+    assert auth(bearer("invalid")) is None
+    assert auth.calls == ["valid1", "invalid", "invalid"]
+
+    # the raw token is never a key
+    assert not any("valid1" in key for key in auth.auth_cache._entries)
+
+    auth.invalidate("valid1")
+    auth(bearer("valid1"))
+    assert auth.calls[-1] == "valid1"
+    assert len(auth.calls) == 4
+
+
+def test_lru_and_ttl():
+    auth = CachedBearer()
+    for token in ["valid1", "valid2", "valid1", "valid3"]:
+        auth(bearer(token))
+    # size 2 - "valid2" was the least recently used
+    assert auth.calls == ["valid1", "valid2", "valid3"]
+    auth(bearer("valid1"))
+    auth(bearer("valid2"))
+    assert auth.calls == ["valid1", "valid2", "valid3", "valid2"]
+
+    with mock.patch("penta.security.cache.time.monotonic", return_value=1e12):
+        auth(bearer("valid2"))
+    assert auth.calls[-1] == "valid2"
+    assert len(auth.calls) == 5
+
+    auth.auth_cache.clear()
+    auth(bearer("valid1"))
+    assert len(auth.calls) == 6
+
+
+def test_not_cached_by_default():
+    class Bearer(HttpBearer):
+        def authenticate(self, request, token):
+            return token
+
+    auth = Bearer()
+    assert auth.auth_cache is None
+    auth.invalidate("token")  # no op
+
+
+def test_shared_cache():
+    class SharedBearer(CachedBearer):
+        cache_alias = "default"
+        cache_namespace = "shared"  # as if in two processes
+
+    cache.clear()
+    first, second = SharedBearer(), SharedBearer()
+    assert first(bearer("valid1")) == {"token": "valid1"}
+    assert second(bearer("valid1")) == {"token": "valid1"}
+    assert second.calls == []
+
+    first.invalidate("valid1")
+    second.auth_cache.clear()
+    second(bearer("valid1"))
+    assert second.calls == ["valid1"]
+
+
+def test_results_are_copied():
+    auth = CachedBearer()
+    result = auth(bearer("valid1"))
+    result["token"] = "changed by a request"
+    assert auth(bearer("valid1")) == {"token": "valid1"}
+    assert auth.calls == ["valid1"]
+
+
+def test_namespace_per_instance():
+    class SharedBearer(CachedBearer):
+        cache_alias = "default"
+
+    cache.clear()
+    first, second = SharedBearer(), SharedBearer()
+    assert first.auth_cache.namespace.endswith("SharedBearer#1")
+    assert second.auth_cache.namespace.endswith("SharedBearer#2")
+    first(bearer("valid1"))
+    second(bearer("valid1"))
+    assert second.calls == ["valid1"]  # not the result of the other instance
+
+
+def test_basic_and_api_key():
+    class Basic(HttpBasicAuth):
+        cache_ttl = 60
+        calls = 0
+
+        def authenticate(self, request, username, password):
+            Basic.calls += 1
+            if password == "secret":
+                return username
+
+    class Key(APIKeyHeader):
+        param_name = "X-API-Key"
+        cache_ttl = 60
+        calls = 0
+
+        def authenticate(self, request, key):
+            Key.calls += 1
+            return key
+
+    basic = Basic()
+    headers = {"Authorization": "Basic YWRtaW46c2VjcmV0"}  # admin:secret
+    assert basic(build_request(headers)) == "admin"
+    assert basic(build_request(headers)) == "admin"
+    assert Basic.calls == 1
+    basic.invalidate("admin", "secret")
+    assert basic(build_request(headers)) == "admin"
+    assert Basic.calls == 2
+    # without the password
+    basic.invalidate_principal("admin")
+    assert basic.auth_cache._principals == {}
+    assert basic(build_request(headers)) == "admin"
+    assert Basic.calls == 3
+
+    key = Key()
+    assert key(build_request({"X-API-Key": "k"})) == "k"
+    assert key(build_request({"X-API-Key": "k"})) == "k"
+    assert Key.calls == 1
+    # missing credentials are passed through
+    key(build_request({}))
+    key(build_request({}))
+    assert Key.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_async_authenticate():
+    class AsyncBearer(HttpBearer):
+        cache_ttl = 60
+        cache_alias = "default"
+        calls = []
+
+        async def authenticate(self, request, token):
+            self.calls.append(token)
+            return token
+
+    cache.clear()
+    auth = AsyncBearer()
+    assert auth.is_async is True
+    api = Penta(auth=auth)
+
+    @api.get("/")
+    async def view():
+        return "OK"
+
+    client = TestAsyncClient(api)
+    for _i in range(3):
+        response = await client.get("/", headers={"Authorization": "Bearer t"})
+        assert response.status_code == 200
+    assert AsyncBearer.calls == ["t"]
+
+    auth.auth_cache.clear()
+    await client.get("/", headers={"Authorization": "Bearer t"})
+    assert AsyncBearer.calls == ["t"]  # from the shared cache
+
+    await auth.ainvalidate("t")
+    await client.get("/", headers={"Authorization": "Bearer t"})
+    assert AsyncBearer.calls == ["t", "t"]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_principal_shared():
+    class SharedBearer(CachedBearer):
+        cache_alias = "default"
+        cache_size = 10
+
+        def authenticate(self, request, token):
+            self.calls.append(token)
+            return User(int(token[-1]))
+
+    cache.clear()
+    auth = SharedBearer()
+    for token in ["valid1", "other1", "valid2"]:
+        auth(bearer(token))
+    assert auth(bearer("valid1")).pk == 1
+
+    auth.invalidate_principal(1)
+    assert len(auth.auth_cache._entries) == 1
+    auth.auth_cache.clear()  # the shared cache is invalidated too
+    for token in ["valid1", "other1", "valid2"]:
+        auth(bearer(token))
+    assert auth.calls == ["valid1", "other1", "valid2", "valid1", "other1"]
+
+    await auth.ainvalidate_principal(2)
+    auth.auth_cache.clear()
+    auth(bearer("valid2"))
+    assert auth.calls[-1] == "valid2"
@@ -0,0 +1,167 @@
+import asyncio
+import time
+
+import pytest
+
+from penta import Penta, Router, context
+from penta.errors import ConfigError
+from penta.testing import TestAsyncClient
+
+
+class SlowAuth:
+    "Succeeds with `value` (or raises it) after `delay` seconds"
+
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.started = self.cancelled = False
+
+    async def __call__(self, request):
+        self.started = True
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+def create_client(*auth, strategy="race"):
+    api = Penta()
+
+    @api.get("/", auth=list(auth), auth_strategy=strategy)
+    async def view():
+        return "OK"
+
+    return api, TestAsyncClient(api)
+
+
+@pytest.mark.asyncio
+async def test_concurrent():
+    first, second, third = SlowAuth(None, 0.2), SlowAuth(None, 0.2), SlowAuth("u", 0.2)
+    api, client = create_client(first, second, third)
+    assert api.execution_plans()["GET /"].auth_strategy == "race"
+
+    started = time.monotonic()
+    response = await client.get("/")
+    assert response.status_code == 200
+    assert time.monotonic() - started < 0.5  # not 0.6 sequentially
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    # a later callback that succeeds first waits for the earlier ones
+    first, second = SlowAuth("first", 0.1), SlowAuth("second")
+    api = Penta()
+
+    @api.get("/", auth=[first, second], auth_strategy="race")
+    async def view():
+        return context.request.get().auth
+
+    response = await TestAsyncClient(api).get("/")
+    assert response.json() == "first"
+
+
+@pytest.mark.asyncio
+async def test_losers_cancelled():
+    first, second = SlowAuth("first"), SlowAuth("second", 10)
+    _api, client = create_client(first, second)
+    response = await client.get("/")
+    assert response.status_code == 200
+    await asyncio.sleep(0)
+    assert second.started and second.cancelled
+
+
+@pytest.mark.asyncio
+async def test_failure_semantics():
+    # all fail -> 401
+    _api, client = create_client(SlowAuth(None), SlowAuth(None, 0.01))
+    assert (await client.get("/")).status_code == 401
+
+    # an exception before a success is returned, as it would be sequentially
+    error = ConfigError("boom")
+    with pytest.raises(ConfigError):
+        _api, client = create_client(SlowAuth(error), SlowAuth("u"))
+        await client.get("/")
+
+    # an exception after a success is ignored
+    _api, client = create_client(SlowAuth("u", 0.05), SlowAuth(error))
+    assert (await client.get("/")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_sync_callbacks_keep_their_place():
+    calls = []
+
+    def sync_auth(request):
+        calls.append("sync")
+        return None
+
+    sync_auth.blocking = False  # called in the event loop
+    slow = SlowAuth("u", 0.01)
+    _api, client = create_client(sync_auth, SlowAuth(None), slow)
+    assert (await client.get("/")).status_code == 200
+    assert calls == ["sync"]
+
+
+@pytest.mark.asyncio
+async def test_threaded_callbacks_not_started_early():
+    calls = []
+
+    def sync_auth(request):
+        calls.append("sync")
+        return "sync"
+
+    first = SlowAuth("first")
+    api, client = create_client(SlowAuth(None, 0.01), first, sync_auth, SlowAuth(2))
+    assert [s.runs for s in api.execution_plans()["GET /"].steps[:4]] == [
+        "await",
+        "await",
+        "thread",
+        "await",
+    ]
+    assert (await client.get("/")).status_code == 200
+    assert calls == []  # the awaited callback before it won
+
+    api, client = create_client(SlowAuth(None), sync_auth, SlowAuth(None))
+    assert (await client.get("/")).status_code == 200
+    assert calls == ["sync"]
+
+
+def test_strategy():
+    router = Router(auth_strategy="race")
+    api = Penta()
+
+    @router.get("/single", auth=SlowAuth("u"))
+    async def single():
+        pass
+
+    @router.get(
+        "/sequential", auth=[SlowAuth(1), SlowAuth(2)], auth_strategy="sequential"
+    )
+    async def sequential():
+        pass
+
+    @router.get("/threaded", auth=[SlowAuth(1), lambda request: 2])
+    async def threaded():
+        pass
+
+    @router.get("/inherited", auth=[SlowAuth(1), SlowAuth(2)])
+    async def inherited():
+        pass
+
+    api.add_router("/", router)
+    plans = api.execution_plans()
+    # a single callback has nothing to race with
+    assert plans["GET /single"].auth_strategy == "sequential"
+    assert plans["GET /threaded"].auth_strategy == "sequential"
+    assert plans["GET /sequential"].auth_strategy == "sequential"
+    assert plans["GET /inherited"].dict()["auth_strategy"] == "race"
+
+    with pytest.raises(ConfigError, match="unknown auth_strategy 'fastest'"):
+
+        @api.get("/", auth_strategy="fastest")
+        async def view():
+            pass
@@ -0,0 +1,158 @@
+from importlib import import_module
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import logout
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, RequestFactory
+
+from penta import Penta
+from penta.security import (
+    CachedSessionAuth,
+    CachedSessionAuthIsStaff,
+    CachedSessionAuthSuperUser,
+)
+from penta.testing import TestClient
+
+
+def session_request(session_key, method="get"):
+    request = getattr(RequestFactory(), method)("/")
+    request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+    engine = import_module(settings.SESSION_ENGINE)
+    request.session = engine.SessionStore(session_key)
+    return request
+
+
+def login(user):
+    client = Client()
+    client.force_login(user)
+    return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user("john", password="secret")
+
+
+@pytest.mark.django_db
+def test_cached_user(user, django_assert_num_queries):
+    auth = CachedSessionAuth()
+    session_key = login(user)
+
+    with django_assert_num_queries(2):  # session + user
+        request = session_request(session_key)
+        assert auth(request) == user
+    assert request.user == user
+
+    with django_assert_num_queries(0):
+        request = session_request(session_key)
+        assert auth(request) == user
+        assert request.user.username == "john"
+
+    # no session / unknown session
+    assert auth(RequestFactory().get("/")) is None
+    assert auth(session_request("unknown")) is None
+
+
+@pytest.mark.django_db
+def test_user_copied_per_request(user):
+    auth = CachedSessionAuth()
+    session_key = login(user)
+    first = auth(session_request(session_key))
+    first.first_name = "changed"
+    first._state.db = "other"
+
+    request = session_request(session_key)
+    second = auth(request)
+    assert second == user and second is not first
+    assert request.user is second
+    assert second.first_name == ""
+    assert second._state.db == "default"
+
+
+@pytest.mark.django_db
+def test_invalidated_on_logout(user):
+    auth = CachedSessionAuth()
+    session_key = login(user)
+    assert auth(session_request(session_key)) == user
+
+    request = session_request(session_key)
+    request.user = user
+    logout(request)
+    assert auth(session_request(session_key)) is None
+
+
+@pytest.mark.django_db
+def test_invalidated_on_user_save(user):
+    auth = CachedSessionAuth()
+    session_key = login(user)
+    assert auth(session_request(session_key)) == user
+
+    # a password change invalidates the session hash
+    user.set_password("new")
+    user.save()
+    assert auth(session_request(session_key)) is None
+
+    session_key = login(user)
+    assert auth(session_request(session_key)) == user
+    user.delete()
+    assert auth(session_request(session_key)) is None
+
+
+@pytest.mark.django_db
+def test_invalidated_in_shared_cache(user):
+    class SharedSessionAuth(CachedSessionAuth):
+        cache_alias = "default"
+
+    cache.clear()
+    auth = SharedSessionAuth()
+    session_key = login(user)
+    assert auth(session_request(session_key)) == user
+
+    user.is_active = False
+    user.save()
+    auth.auth_cache.clear()  # not taken back from the shared cache
+    assert auth(session_request(session_key)) is None
+
+
+@pytest.mark.django_db
+def test_csrf_for_unsafe_methods(user):
+    auth = CachedSessionAuth()
+    session_key = login(user)
+    request = session_request(session_key, "post")
+    request._dont_enforce_csrf_checks = False
+
+    assert auth(session_request(session_key)) == user
+    with pytest.raises(Exception, match="CSRF check Failed"):
+        auth(request)
+
+
+@pytest.mark.django_db
+def test_superuser_and_staff(user):
+    session_key = login(user)
+    assert CachedSessionAuthSuperUser()(session_request(session_key)) is None
+    assert CachedSessionAuthIsStaff()(session_request(session_key)) is None
+
+    user.is_staff = True
+    user.save()
+    assert CachedSessionAuthSuperUser()(session_request(session_key)) is None
+    assert CachedSessionAuthIsStaff()(session_request(session_key)) == user
+
+    user.is_superuser = True
+    user.save()
+    assert CachedSessionAuthSuperUser()(session_request(session_key)) == user
+
+
+@pytest.mark.django_db
+def test_operation(user):
+    api = Penta(auth=CachedSessionAuth())
+
+    @api.get("/me")
+    def me():
+        return "OK"
+
+    client = TestClient(api)
+    assert client.get("/me").status_code == 401
+    response = client.get("/me", COOKIES={settings.SESSION_COOKIE_NAME: login(user)})
+    assert response.status_code == 200
@@ -0,0 +1,121 @@
+from base64 import urlsafe_b64encode
+from unittest import mock
+
+import pytest
+from django.conf import settings
+
+from penta import Penta
+from penta.errors import ConfigError
+from penta.security import SignedTokenBearer
+from penta.testing import TestClient
+
+
+def test_create_and_verify():
+    auth = SignedTokenBearer(keys={"k1": "secret"})
+    with mock.patch("penta.security.tokens.time.time", return_value=1000):
+        token = auth.create_token({"sub": "billing"}, expires_in=60)
+    assert token.startswith("k1.")
+
+    with mock.patch("penta.security.tokens.time.time", return_value=1059):
+        assert auth.verify(token) == {"iat": 1000, "exp": 1060, "sub": "billing"}
+        # from the verification cache
+        claims = auth.verify(token)
+        assert claims == {"iat": 1000, "exp": 1060, "sub": "billing"}
+        claims["sub"] = "changed"
+        assert auth.verify(token)["sub"] == "billing"
+
+    with mock.patch("penta.security.tokens.time.time", return_value=1061):
+        assert auth.verify(token) is None  # expired (and dropped from the cache)
+        assert auth.verify(token) is None
+
+    assert auth.verify(auth.create_token({}, expires_in=None)) is not None
+
+
+def test_invalid_tokens():
+    auth = SignedTokenBearer(keys={"k1": "secret"})
+    token = auth.create_token({"sub": "a"})
+    key_id, body, signature = token.split(".")
+
+    other = auth.create_token({"sub": "b"}).split(".")[1]
+    assert auth.verify(f"{key_id}.{other}.{signature}") is None
+    assert auth.verify(f"unknown.{body}.{signature}") is None
+    assert auth.verify(f"{key_id}.{body}") is None
+    assert auth.verify("garbage") is None
+    assert auth.verify(f"{key_id}.{body}.{signature[:-1]}é") is None
+    assert SignedTokenBearer(keys={"k1": "other"}).verify(token) is None
+
+    # signed tokens with claims that are not an object, or with invalid times
+    for claims in [b"[1]", b'{"exp": "soon"}', b'{"exp": [1]}', b'{"nbf": NaN}']:
+        signed = "k1." + urlsafe_b64encode(claims).decode()
+        assert auth.verify(f"{signed}.{auth._sign('k1', signed)}") is None
+
+
+def test_not_before_and_leeway():
+    auth = SignedTokenBearer(keys={"k1": "secret"}, leeway=5)
+    with mock.patch("penta.security.tokens.time.time", return_value=1000):
+        token = auth.create_token({"nbf": 1010}, expires_in=20)
+        assert auth.verify(token) is None
+    with mock.patch("penta.security.tokens.time.time", return_value=1006):
+        assert auth.verify(token) is not None
+    with mock.patch("penta.security.tokens.time.time", return_value=1024):
+        assert auth.verify(token) is not None
+    with mock.patch("penta.security.tokens.time.time", return_value=1026):
+        assert auth.verify(token) is None
+
+
+def test_key_rotation():
+    auth = SignedTokenBearer(keys={"old": "secret1"})
+    old_token = auth.create_token({"sub": "a"})
+
+    auth.set_keys({"new": "secret2", "old": "secret1"})
+    new_token = auth.create_token({"sub": "a"})
+    assert new_token.startswith("new.")
+    assert auth.verify(old_token) is not None
+    assert auth.verify(new_token) is not None
+
+    # the old key retired - its tokens are rejected even if verified before
+    auth.set_keys({"new": "secret2"})
+    assert auth.verify(old_token) is None
+    assert auth.verify(new_token) is not None
+
+    assert auth.create_token({}, key_id="new").startswith("new.")
+
+
+def test_config_errors():
+    with pytest.raises(ConfigError, match="at least one key"):
+        SignedTokenBearer(keys={})
+    with pytest.raises(ConfigError, match="can't contain"):
+        SignedTokenBearer(keys={"a.b": "secret"})
+    with pytest.raises(ConfigError, match="Unknown signing key"):
+        SignedTokenBearer(keys={"a": "secret"}, signing_key="b")
+    # defaults to a key derived from the SECRET_KEY
+    auth = SignedTokenBearer()
+    assert auth.signing_key == "default"
+    assert auth.keys["default"] == SignedTokenBearer.default_key()
+    assert settings.SECRET_KEY.encode() not in auth.keys.values()
+
+
+def test_cache_size():
+    auth = SignedTokenBearer(keys={"k1": b"secret"}, verify_cache_size=2)
+    tokens = [auth.create_token({"n": n}) for n in range(3)]
+    for token in tokens:
+        auth.verify(token)
+    assert list(auth._verified) == tokens[1:]
+
+
+def test_operation():
+    auth = SignedTokenBearer(keys={"k1": "secret"})
+    api = Penta(auth=auth)
+
+    @api.get("/")
+    def view():
+        return "OK"
+
+    client = TestClient(api)
+    token = auth.create_token({"sub": "billing"})
+    response = client.get("/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    response = client.get("/", headers={"Authorization": "Bearer k1.e30.invalid"})
+    assert response.status_code == 401
+    response = client.get("/", headers={"Authorization": "Bearer k1.e30.ïnvälid"})
+    assert response.status_code == 401
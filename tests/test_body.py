@@ -1,10 +1,12 @@
 from typing import Any, Dict, List
+from unittest import mock
 
 import pytest
 from pydantic import field_validator
 
 from penta import Body, Form, Penta, Schema
 from penta.errors import ConfigError, ValidationError, ValidationErrorContext
+from penta.parser import Parser
 from penta.testing import TestClient
 
 api = Penta()
@@ -129,3 +131,83 @@ def test_body_custom_validation_error():
             "message": "Value error, invalid email",
         }
     ]
+
+
+class Item(Schema):
+    id: int
+    tags: List[str] = []
+
+
+raw_api = Penta()
+
+
+@raw_api.post("/items")
+def create_items(items: List[Item]):
+    return [item.id for item in items]
+
+
+@raw_api.post("/item")
+def create_item(item: Item):
+    return item.dict()
+
+
+@raw_api.post("/limited")
+def create_limited(value: int = Body(..., gt=0)):
+    return value
+
+
+raw_client = TestClient(raw_api)
+
+
+def test_body_validated_from_raw_json():
+    body_model = (
+        raw_api.default_router.path_operations["/items"].operations[0].models[0]
+    )
+    assert body_model._get_body_adapter() is not None
+
+    with mock.patch.object(
+        body_model, "_map_data_paths", side_effect=AssertionError
+    ), mock.patch.object(raw_api.parser, "parse_body", side_effect=AssertionError):
+        resp = raw_client.post("/items", json=[{"id": 1}, {"id": 2, "tags": ["a"]}])
+    assert resp.json() == [1, 2]
+
+
+def test_body_raw_json_errors():
+    resp = raw_client.post("/item", json={"id": "x"})
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == [
+        {
+            "type": "int_parsing",
+            "loc": ["body", "item", "id"],
+            "msg": "Input should be a valid integer, unable to parse string as an integer",
+        }
+    ]
+
+    resp = raw_client.post("/item", data=b'{"id": 1')
+    assert resp.status_code == 400
+    assert resp.json() == {"detail": "Cannot parse request body"}
+
+
+def test_body_field_constraints_use_regular_path():
+    body_model = (
+        raw_api.default_router.path_operations["/limited"].operations[0].models[0]
+    )
+    assert body_model._get_body_adapter() is None
+
+    assert raw_client.post("/limited", json=1).json() == 1
+    assert raw_client.post("/limited", json=0).status_code == 422
+
+
+def test_body_custom_parser_uses_regular_path():
+    class PlusOneParser(Parser):
+        def parse_body(self, request):
+            data = super().parse_body(request)
+            return {**data, "id": data["id"] + 1}
+
+    api = Penta(parser=PlusOneParser())
+    api.post("/item")(create_item)
+
+    assert TestClient(api).post("/item", json={"id": 1}).json() == {
+        "id": 2,
+        "tags": [],
+    }
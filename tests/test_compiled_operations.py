@@ -0,0 +1,176 @@
+from typing import List
+
+import pytest
+from django.http import HttpResponse
+
+from penta import Penta, Schema
+from penta.errors import HttpError
+from penta.security import APIKeyQuery
+from penta.testing import TestAsyncClient, TestClient
+from penta.throttling import AnonRateThrottle
+
+
+class KeyQuery(APIKeyQuery):
+    def authenticate(self, request, key):
+        if key == "secret":
+            return key
+
+
+class Item(Schema):
+    id: int
+    name: str
+
+
+def build_api(compile_operations: bool) -> Penta:
+    api = Penta(compile_operations=compile_operations)
+
+    @api.get("/plain")
+    def plain():
+        return {"ok": True}
+
+    @api.get("/items", response=List[Item])
+    def items():
+        return [{"id": 1, "name": "one", "extra": 1}]
+
+    @api.get("/empty", response={204: None})
+    def empty():
+        return 204, None
+
+    @api.get("/status", response={200: Item, 404: dict})
+    def status(found: int):
+        if found:
+            return 200, {"id": 1, "name": "one"}
+        return 404, {"detail": "missing"}
+
+    @api.get("/temporal")
+    def temporal(response: HttpResponse):
+        response["X-Test"] = "yes"
+        return "temporal"
+
+    @api.get("/protected", auth=KeyQuery())
+    def protected():
+        return "protected"
+
+    @api.get("/raw")
+    def raw():
+        return HttpResponse("raw")
+
+    @api.get("/error")
+    def error():
+        raise HttpError(418, "teapot")
+
+    return api
+
+
+@pytest.mark.parametrize(
+    "path,expected_status,expected_content",
+    [
+        ("/plain", 200, b'{"ok": true}'),
+        ("/items", 200, b'[{"id": 1, "name": "one"}]'),
+        ("/empty", 204, b""),
+        ("/status?found=1", 200, b'{"id": 1, "name": "one"}'),
+        ("/status?found=0", 404, b'{"detail": "missing"}'),
+        ("/status?found=x", 422, None),
+        ("/temporal", 200, b'"temporal"'),
+        ("/protected", 401, b'{"detail": "Unauthorized"}'),
+        ("/protected?key=secret", 200, b'"protected"'),
+        ("/raw", 200, b"raw"),
+        ("/error", 418, b'{"detail": "teapot"}'),
+    ],
+)
+def test_compiled_same_as_default(path, expected_status, expected_content):
+    default = TestClient(build_api(compile_operations=False)).get(path)
+    compiled = TestClient(build_api(compile_operations=True)).get(path)
+
+    assert compiled.status_code == default.status_code == expected_status
+    assert compiled.content == default.content
+    if expected_content is not None:
+        assert compiled.content == expected_content
+
+
+def test_compiled_temporal_response_headers():
+    client = TestClient(build_api(compile_operations=True))
+    response = client.get("/temporal")
+    assert response["X-Test"] == "yes"
+
+
+def test_compiled_only_needed_stages():
+    api = build_api(compile_operations=True)
+    operations = {
+        op.path: op
+        for view in api.default_router.path_operations.values()
+        for op in view.operations
+    }
+    assert operations["/plain"]._build_checks() == []
+    assert not operations["/plain"]._needs_temporal_response()
+    assert operations["/temporal"]._needs_temporal_response()
+    assert len(operations["/protected"]._build_checks()) == 1
+
+    default_api = build_api(compile_operations=False)
+    for view in default_api.default_router.path_operations.values():
+        for op in view.operations:
+            assert op._executor is None
+
+
+def test_compiled_custom_temporal_response():
+    class CustomPenta(Penta):
+        def create_temporal_response(self, request):
+            response = super().create_temporal_response(request)
+            response["X-Custom"] = "1"
+            return response
+
+    api = CustomPenta(compile_operations=True)
+
+    @api.get("/check")
+    def check():
+        return "OK"
+
+    response = TestClient(api).get("/check")
+    assert response.status_code == 200
+    assert response["X-Custom"] == "1"
+
+
+def test_compiled_throttling():
+    th = AnonRateThrottle("1/s")
+    th.timer = lambda: 0
+    api = Penta(compile_operations=True, throttle=th)
+
+    @api.get("/check")
+    def check():
+        return "OK"
+
+    client = TestClient(api)
+    assert client.get("/check").status_code == 200
+    assert client.get("/check").status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_compiled_async():
+    api = Penta(compile_operations=True)
+
+    class AsyncKeyQuery(APIKeyQuery):
+        async def authenticate(self, request, key):
+            if key == "secret":
+                return key
+
+    @api.get("/async", auth=AsyncKeyQuery(), response=Item)
+    async def async_view(payload: int):
+        return {"id": payload, "name": "async"}
+
+    @api.post("/async")
+    def sync_view():
+        return "sync"
+
+    client = TestAsyncClient(api)
+
+    res = await client.get("/async?payload=1")
+    assert res.status_code == 401
+
+    res = await client.get("/async?payload=1&key=secret")
+    assert res.json() == {"id": 1, "name": "async"}
+
+    res = await client.get("/async?payload=x&key=secret")
+    assert res.status_code == 422
+
+    res = await client.post("/async")
+    assert res.json() == "sync"
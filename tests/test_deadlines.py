@@ -0,0 +1,127 @@
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+from django.http import HttpRequest
+
+from penta import Penta, Router
+from penta.deadlines import Deadline, get_deadline, remaining
+from penta.testing import TestAsyncClient, TestClient
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compile_operations", [False, True])
+async def test_async_timeout(compile_operations):
+    api = Penta(compile_operations=compile_operations)
+    cancelled = []
+
+    @api.get("/slow", timeout=0.05)
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    @api.get("/fast", timeout=1)
+    async def fast():
+        return remaining()
+
+    client = TestAsyncClient(api)
+    response = await client.get("/slow")
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded."}
+    assert cancelled == [True]
+
+    response = await client.get("/fast")
+    assert response.status_code == 200
+    assert 0.5 < response.json() <= 1
+
+
+@pytest.mark.asyncio
+async def test_router_timeout():
+    router = Router(timeout=0.01)
+
+    @router.get("/slow")
+    async def slow():
+        await asyncio.sleep(10)
+
+    @router.get("/own", timeout=5)
+    async def own():
+        return get_deadline().timeout
+
+    api = Penta()
+    api.add_router("/", router)
+    client = TestAsyncClient(api)
+    assert (await client.get("/slow")).status_code == 504
+    assert (await client.get("/own")).json() == 5
+
+
+@pytest.mark.asyncio
+async def test_deadline_header():
+    with mock.patch("penta.conf.settings.DEADLINE_HEADER", "X-Request-Timeout"):
+        api = Penta()
+
+        @api.get("/budget", timeout=2)
+        async def budget():
+            return get_deadline().timeout
+
+        @api.get("/no-timeout")
+        async def no_timeout():
+            return remaining()
+
+    client = TestAsyncClient(api)
+    headers = {"X-Request-Timeout": "0.5"}
+    assert (await client.get("/budget", headers=headers)).json() == 0.5
+    # the operation timeout is the upper bound
+    headers = {"X-Request-Timeout": "30"}
+    assert (await client.get("/budget", headers=headers)).json() == 2
+    headers = {"X-Request-Timeout": "invalid"}
+    assert (await client.get("/budget", headers=headers)).json() == 2
+    assert (await client.get("/no-timeout")).json() is None
+
+    # the budget is used up before the request arrived
+    headers = {"X-Request-Timeout": "0"}
+    assert (await client.get("/budget", headers=headers)).status_code == 504
+
+
+def test_sync_soft_timeout(caplog):
+    api = Penta()
+
+    @api.get("/slow", timeout=0.01)
+    def slow():
+        time.sleep(0.02)
+        return get_deadline().expired
+
+    @api.get("/fast", timeout=1)
+    def fast():
+        return remaining() > 0.5
+
+    client = TestClient(api)
+    with caplog.at_level("WARNING", logger="django"):
+        response = client.get("/slow")
+    assert response.status_code == 200
+    assert response.json() is True
+    assert "GET /slow took" in caplog.text
+    assert "over its 0.010s deadline" in caplog.text
+
+    assert client.get("/fast").json() is True
+
+
+def test_deadline():
+    deadline = Deadline(10)
+    assert deadline.expired is False
+    assert 9 < deadline.remaining() <= 10
+    deadline.check()
+    assert "timeout=10" in repr(deadline)
+
+    deadline = Deadline(0)
+    assert deadline.remaining() == 0
+    with pytest.raises(Exception, match="deadline exceeded"):
+        deadline.check()
+
+    assert Deadline.parse_header("1.5") == 1.5
+    assert Deadline.parse_header("") is None
+    assert Deadline.parse_header("nan") is None
+    assert get_deadline(HttpRequest()) is None
@@ -0,0 +1,156 @@
+import operator
+import threading
+from typing import List
+from unittest import mock
+
+import pytest
+from someapp.models import Category
+
+from penta import Penta, Router, Schema
+from penta.errors import ConfigError
+from penta.executors import (
+    INLINE,
+    THREAD_SENSITIVE,
+    ExecutorPool,
+    executor_stats,
+    get_executor_pool,
+    run_sync,
+)
+from penta.testing import TestAsyncClient, TestClient
+
+
+def thread_name():
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_executor_pool_metrics():
+    pool = ExecutorPool("metrics", max_workers=2)
+    try:
+        assert await pool.run(operator.add, 1, 2) == 3
+        assert (await pool.run(thread_name)).startswith("penta-metrics")
+
+        stats = pool.stats()
+        assert stats["max_workers"] == 2
+        assert stats["queued"] == 0
+        assert stats["active"] == 0
+        assert stats["completed"] == 2
+        assert stats["wait_time_max"] >= stats["wait_time_avg"] >= 0
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_sync_policies():
+    main_thread = threading.current_thread().name
+    assert await run_sync(INLINE, thread_name) == main_thread
+    assert await run_sync(THREAD_SENSITIVE, thread_name) != main_thread
+
+    with mock.patch("penta.conf.settings.SYNC_EXECUTORS", {"policies": 1}):
+        assert (await run_sync("policies", thread_name)).startswith("penta-policies")
+        assert get_executor_pool("policies") is get_executor_pool("policies")
+    assert executor_stats()["policies"]["completed"] == 1
+
+
+def test_unknown_executor():
+    with pytest.raises(ConfigError, match="Unknown sync executor 'missing'"):
+        Penta().get("/", sync_executor="missing")(thread_name)
+
+    with pytest.raises(ConfigError):
+        get_executor_pool("missing")
+
+
+def test_atomic_requests():
+    databases = {"default": {"ATOMIC_REQUESTS": True}}
+    with mock.patch("django.conf.settings.DATABASES", databases):
+        api = Penta()
+        api.get("/thread")(thread_name)
+        api.get("/inline", sync_executor=INLINE)(thread_name)
+
+        # thread sensitive views stay sync, so django can wrap them in a transaction
+        api.default_router.path_operations["/thread"].get_view()
+        with pytest.raises(ConfigError, match="with ATOMIC_REQUESTS"):
+            api.default_router.path_operations["/inline"].get_view()
+
+
+@pytest.mark.asyncio
+async def test_operation_executors():
+    api = Penta()
+    api.get("/default")(thread_name)
+    api.get("/inline", sync_executor=INLINE)(thread_name)
+
+    router = Router(sync_executor=INLINE)
+    router.get("/router")(thread_name)
+    router.get("/override", sync_executor=THREAD_SENSITIVE)(thread_name)
+    api.add_router("/r", router)
+
+    operation = api.default_router.path_operations["/default"].operations[0]
+    assert operation.sync_executor == THREAD_SENSITIVE
+    assert not api.default_router.path_operations["/default"].is_async
+    assert router.path_operations["/router"].operations[0].sync_executor == INLINE
+
+    main_thread = threading.current_thread().name
+    client = TestAsyncClient(api)
+    assert (await client.get("/inline")).json() == main_thread
+    assert (await client.get("/r/router")).json() == main_thread
+    # thread_sensitive sync views are left to django (sync_to_async under ASGI)
+    assert router.path_operations["/override"].get_view() == (
+        router.path_operations["/override"]._sync_view
+    )
+
+
+@pytest.mark.asyncio
+async def test_operation_pool():
+    with mock.patch("penta.conf.settings.SYNC_EXECUTORS", {"reports": 2}):
+        api = Penta()
+        api.get("/report", sync_executor="reports")(thread_name)
+        client = TestAsyncClient(api)
+        response = await client.get("/report")
+
+    assert response.json().startswith("penta-reports")
+    assert executor_stats()["reports"]["completed"] >= 1
+
+
+def test_settings_default():
+    with mock.patch("penta.conf.settings.SYNC_EXECUTOR", INLINE):
+        api = Penta()
+        api.get("/")(thread_name)
+        api.urls  # noqa: B018
+
+    assert api.default_router.path_operations["/"].operations[0].sync_executor == (
+        INLINE
+    )
+
+
+class CategorySchema(Schema):
+    id: int
+    title: str
+
+
+@pytest.mark.django_db(transaction=True)
+def test_streaming_operation_not_in_pool():
+    for i in range(5):
+        Category.objects.create(title=f"pool {i}")
+
+    with mock.patch("penta.conf.settings.SYNC_EXECUTORS", {"reports": 2}), mock.patch(
+        "penta.conf.settings.STREAM_CHUNK_SIZE", 2
+    ):
+        api = Penta()
+
+        @api.get(
+            "/categories",
+            response=List[CategorySchema],
+            stream=True,
+            sync_executor="reports",
+        )
+        def categories():
+            return Category.objects.filter(title__startswith="pool").order_by("id")
+
+    # the QuerySet is read after the view returned - the pool would close its
+    # database connection after the first chunk
+    path_view = api.default_router.path_operations["/categories"]
+    assert path_view.operations[0].sync_executor == THREAD_SENSITIVE
+    assert path_view.get_view() == path_view._sync_view
+
+    response = TestClient(api).get("/categories")
+    assert [c["title"] for c in response.json()] == [f"pool {i}" for i in range(5)]
@@ -0,0 +1,149 @@
+from typing import List
+from unittest import mock
+
+import pytest
+
+from penta import Body, Cookie, Header, Penta, Query, Schema
+from penta.params.models import FusedParamModel
+from penta.parser import Parser
+from penta.testing import TestClient
+
+
+class Filters(Schema):
+    min_price: int = 0
+    max_price: int = 100
+
+
+class ItemIn(Schema):
+    name: str
+    price: int
+
+
+api = Penta()
+
+
+@api.post("/shops/{shop_id}/items")
+def create_item(
+    shop_id: int,
+    item: ItemIn,
+    tags: List[str] = Query([]),
+    dry_run: bool = False,
+    token: str = Header(...),
+    session: str = Cookie("none"),
+):
+    return {
+        "shop_id": shop_id,
+        "item": item.dict(),
+        "tags": tags,
+        "dry_run": dry_run,
+        "token": token,
+        "session": session,
+    }
+
+
+@api.get("/shops/{shop_id}/items")
+def list_items(shop_id: int, filters: Filters = Query(...)):
+    return {"shop_id": shop_id, **filters.dict()}
+
+
+@api.post("/numbers")
+def numbers(a: int = Body(...), b: int = Body(...), scale: int = 1):
+    return (a + b) * scale
+
+
+client = TestClient(api)
+
+
+def get_operation(path, method="GET"):
+    for operation in api.default_router.path_operations[path].operations:
+        if method in operation.methods:
+            return operation
+
+
+def test_fused_model():
+    operation = get_operation("/shops/{shop_id}/items", "POST")
+    fused = operation.fused_model
+    assert set(fused.__penta_models__) == {"path", "query", "header", "cookie"}
+    # single body param is validated from raw json (see BodyModel.resolve)
+    assert [m.__penta_param_source__ for m in operation._unfused_models] == ["body"]
+
+    assert get_operation("/numbers", "POST").fused_model is not None
+    assert FusedParamModel.create(operation.models[:1]) is None
+
+
+def test_fused_values():
+    response = client.post(
+        "/shops/1/items?tags=a&tags=b&dry_run=true&unused=1",
+        json={"name": "x", "price": 10},
+        headers={"token": "t"},
+        COOKIES={"session": "s"},
+    )
+    assert response.json() == {
+        "shop_id": 1,
+        "item": {"name": "x", "price": 10},
+        "tags": ["a", "b"],
+        "dry_run": True,
+        "token": "t",
+        "session": "s",
+    }
+
+    assert client.get("/shops/2/items?max_price=10").json() == {
+        "shop_id": 2,
+        "min_price": 0,
+        "max_price": 10,
+    }
+    assert client.post("/numbers?scale=2", json={"a": 1, "b": 2}).json() == 6
+
+
+def test_fused_validation_errors():
+    response = client.post(
+        "/shops/x/items?dry_run=maybe", json={"name": "x", "price": "free"}
+    )
+    assert response.status_code == 422
+    assert [e["loc"] for e in response.json()["detail"]] == [
+        ["path", "shop_id"],
+        ["body", "item", "price"],
+        ["query", "dry_run"],
+        ["header", "token"],
+    ]
+
+    response = client.get("/shops/1/items?min_price=low")
+    assert response.json()["detail"] == [
+        {
+            "type": "int_parsing",
+            "loc": ["query", "min_price"],
+            "msg": "Input should be a valid integer, unable to parse string as an integer",
+        }
+    ]
+
+
+def test_query_declared_keys_only():
+    with mock.patch.object(
+        Parser, "parse_querydict", side_effect=AssertionError
+    ) as parse_querydict:
+        response = client.get(
+            "/shops/1/items?min_price=5&" + "&".join(f"other{i}=1" for i in range(10))
+        )
+    assert response.json()["min_price"] == 5
+    parse_querydict.assert_not_called()
+
+
+def test_custom_querydict_parser():
+    class UpperParser(Parser):
+        def parse_querydict(self, data, list_fields, request):
+            result = super().parse_querydict(data, list_fields, request)
+            return {k.lower(): v for k, v in result.items()}
+
+    custom_api = Penta(parser=UpperParser())
+    custom_api.get("/shops/{shop_id}/items")(list_items)
+
+    response = TestClient(custom_api).get("/shops/1/items?MIN_PRICE=5")
+    assert response.json()["min_price"] == 5
+
+
+@pytest.mark.parametrize("compile_operations", [False, True])
+def test_fused_compiled(compile_operations):
+    compiled_api = Penta(compile_operations=compile_operations)
+    compiled_api.get("/shops/{shop_id}/items")(list_items)
+    response = TestClient(compiled_api).get("/shops/3/items?min_price=1")
+    assert response.json() == {"shop_id": 3, "min_price": 1, "max_price": 100}
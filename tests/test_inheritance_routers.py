@@ -1,6 +1,8 @@
 import pytest
 
 from penta import Penta, Router
+from penta.limiter import AIMDLimiter
+from penta.scheduling import FairScheduler
 from penta.testing import TestClient
 
 api = Penta()
@@ -100,3 +102,50 @@ def test_tags():
 
     e2 = schema["paths"]["/api/first/second/endpoint_2"]["get"]
     assert e2["tags"] == ["two"]
+
+
+@pytest.mark.parametrize(
+    "option,value",
+    [
+        ("sync_executor", "inline"),
+        ("limiter", AIMDLimiter(target_latency=1)),
+        ("scheduler", FairScheduler()),
+        ("timeout", 2.5),
+        ("auth_strategy", "race"),
+    ],
+)
+@pytest.mark.parametrize("attached", [False, True])
+def test_nested_router_options(option, value, attached):
+    api = Penta()
+    parent = Router(**{option: value})
+    child = Router()
+    grandchild = Router()
+    reset = Router(**{option: None})  # None does not inherit
+
+    @child.get("/")
+    async def child_op():
+        pass
+
+    @grandchild.get("/")
+    async def grandchild_op():
+        pass
+
+    @reset.get("/")
+    async def reset_op():
+        pass
+
+    if attached:
+        api.add_router("/parent", parent)
+    parent.add_router("/child", child)
+    child.add_router("/grandchild", grandchild)
+    parent.add_router("/reset", reset)
+    if not attached:
+        api.add_router("/parent", parent)
+
+    for router in (child, grandchild):
+        assert getattr(router, option) == value
+        operation = router.path_operations["/"].operations[0]
+        assert getattr(operation, option) == value
+    assert getattr(reset, option) is None
+    operation = reset.path_operations["/"].operations[0]
+    assert getattr(operation, option) != value
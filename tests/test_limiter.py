@@ -0,0 +1,198 @@
+import asyncio
+import time
+
+import pytest
+
+from penta import Penta, Router
+from penta.limiter import AdaptiveLimiter, AIMDLimiter, GradientLimiter
+from penta.testing import TestAsyncClient, TestClient
+
+
+def test_aimd():
+    limiter = AIMDLimiter(target_latency=0.1, initial_limit=4, max_limit=5)
+
+    assert all(limiter.acquire() for _i in range(4))
+    assert limiter.acquire() is False
+    assert limiter.stats() == {"limit": 4, "in_flight": 4, "shed": 1, "completed": 0}
+
+    # fast requests while the limit is used - grows by 1/limit each
+    for _i in range(4):
+        limiter.release(0.01)
+    # (the last two releases leave less than half of the limit in flight)
+    assert limiter.limit == pytest.approx(4 + 1 / 4 + 1 / 4.25)
+    assert limiter.stats()["in_flight"] == 0
+
+    # not growing while the limit is not used
+    limit = limiter.limit
+    limiter.acquire()
+    limiter.release(0.01)
+    assert limiter.limit == limit
+
+    for _i in range(10):
+        limiter.acquire()
+        limiter.release(1.0)
+    assert limiter.limit == pytest.approx(limit * 0.9**10)
+
+    for _i in range(5):
+        limiter.acquire()
+        limiter.release(0.01, failed=True)
+    assert limiter.limit == 1  # min_limit
+
+
+def test_aimd_max_limit():
+    limiter = AIMDLimiter(target_latency=1, initial_limit=2, max_limit=3)
+    for _i in range(100):
+        limiter.acquire()
+        limiter.acquire()
+        limiter.release(0)
+        limiter.release(0)
+    assert limiter.limit == 3
+
+
+def test_gradient():
+    limiter = GradientLimiter(initial_limit=10)
+
+    # steady latency while the limit is used - grows
+    for _i in range(5):
+        for _j in range(int(limiter.limit)):
+            limiter.acquire()
+        for _j in range(limiter.in_flight):
+            limiter.release(0.1)
+    grown = limiter.limit
+    assert grown > 10
+
+    # requests 10 times slower - shrinks
+    for _i in range(10):
+        limiter.acquire()
+        limiter.acquire()
+        limiter.release(1.0)
+        limiter.release(1.0)
+    assert limiter.limit < grown / 2
+
+    limit = limiter.limit
+    limiter.acquire()
+    limiter.release(0.0)
+    limiter.acquire()
+    limiter.release(0.1, failed=True)
+    assert limiter.limit < limit
+
+
+def test_base_limiter():
+    limiter = AdaptiveLimiter()
+    limiter.acquire()
+    with pytest.raises(NotImplementedError):
+        limiter.release(0.1)
+
+
+def test_shedding():
+    limiter = AIMDLimiter(target_latency=10, initial_limit=1, retry_after=3)
+    api = Penta()
+    client = TestClient(api)
+    inner = []
+
+    @api.get("/report", limiter=limiter)
+    def report():
+        inner.append(client.get("/report"))
+        return "OK"
+
+    @api.get("/other")
+    def other():
+        return "OK"
+
+    response = client.get("/report")
+    assert response.status_code == 200
+    assert inner[0].status_code == 503
+    assert inner[0]["Retry-After"] == "3"
+    assert inner[0].json() == {
+        "detail": "Service temporarily overloaded, try again later."
+    }
+    assert limiter.stats() == {"limit": 2, "in_flight": 0, "shed": 1, "completed": 1}
+
+    assert api.default_router.path_operations["/other"].operations[0].limiter is None
+
+
+def test_shedding_before_auth():
+    calls = []
+
+    def auth(request):
+        calls.append(request)  # pragma: no cover
+
+    limiter = AIMDLimiter(target_latency=10, initial_limit=1)
+    limiter.acquire()
+    api = Penta(auth=auth)
+    router = Router(limiter=limiter)
+    router.get("/report")(lambda: "OK")
+    api.add_router("/r", router)
+
+    assert TestClient(api).get("/r/report").status_code == 503
+    assert calls == []
+
+
+def test_failed_requests():
+    limiter = AIMDLimiter(target_latency=10, initial_limit=10)
+    api = Penta(compile_operations=True)
+
+    @api.get("/fail", limiter=limiter, response={500: str})
+    def fail():
+        return 500, "error"
+
+    @api.get("/raise", limiter=limiter)
+    def raise_error():
+        raise RuntimeError("boom")
+
+    client = TestClient(api)
+    assert client.get("/fail").status_code == 500
+    assert limiter.limit == 9
+    with pytest.raises(RuntimeError):
+        client.get("/raise")
+    assert limiter.limit == pytest.approx(8.1)
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_async_shedding():
+    limiter = GradientLimiter(initial_limit=2)
+    api = Penta()
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    @api.get("/slow", limiter=limiter)
+    async def slow():
+        started.set()
+        await finish.wait()
+        return "OK"
+
+    client = TestAsyncClient(api)
+    requests = [asyncio.create_task(client.get("/slow")) for _i in range(2)]
+    await started.wait()
+    await asyncio.sleep(0)
+
+    response = await client.get("/slow")
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+
+    finish.set()
+    assert [(await r).status_code for r in requests] == [200, 200]
+    assert limiter.stats()["shed"] == 1
+    assert limiter.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sync_shedding_in_event_loop():
+    # sync operations are shed before they wait for the thread sensitive thread
+    limiter = AIMDLimiter(target_latency=10, initial_limit=2)
+    api = Penta()
+
+    @api.get("/slow", limiter=limiter)
+    def slow():
+        time.sleep(0.05)
+        return "OK"
+
+    path_view = api.default_router.path_operations["/slow"]
+    assert path_view.get_view() == path_view._async_view
+    assert api.execution_plans()["GET /slow"].notes
+
+    client = TestAsyncClient(api)
+    responses = await asyncio.gather(*[client.get("/slow") for _i in range(10)])
+    assert sorted(r.status_code for r in responses) == [200] * 2 + [503] * 8
+    assert limiter.stats() == {"limit": 2, "in_flight": 0, "shed": 8, "completed": 2}
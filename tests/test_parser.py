@@ -1,9 +1,12 @@
 from typing import List
+from unittest import mock
 
+import pytest
 from django.http import HttpRequest, QueryDict
 
 from penta import Penta
-from penta.parser import Parser
+from penta.errors import ConfigError
+from penta.parser import ORJSONParser, Parser
 from penta.testing import TestClient
 
 
@@ -38,3 +41,35 @@ def test_parser():
     response = client.post("/test?emptyparam", body="test\nbar")
     assert response.status_code == 200, response.content
     assert response.json() == {"emptyparam": None, "body": ["test", "bar"]}
+
+
+def test_orjson_parser():
+    pytest.importorskip("orjson")
+
+    orjson_api = Penta(parser=ORJSONParser())
+
+    @orjson_api.post("/test")
+    def operation(body: List[int]):
+        return {"body": body}
+
+    client = TestClient(orjson_api)
+    response = client.post("/test", body=b"[1, 2, 3]")
+    assert response.status_code == 200, response.content
+    assert response.json() == {"body": [1, 2, 3]}
+
+    response = client.post("/test", body=b"[1, 2")
+    assert response.status_code == 400
+
+
+def test_parser_setting():
+    pytest.importorskip("orjson")
+
+    with mock.patch("penta.conf.settings.PARSER_CLASS", "penta.parser.ORJSONParser"):
+        api = Penta()
+    assert isinstance(api.parser, ORJSONParser)
+
+
+def test_orjson_parser_not_installed():
+    with mock.patch("penta.parser.orjson", None):
+        with pytest.raises(ConfigError):
+            ORJSONParser()
@@ -0,0 +1,68 @@
+from django.urls import URLResolver
+from django.urls.resolvers import RegexPattern
+
+from penta import Penta, Router
+from penta.router import ReverseOnlyPattern
+from penta.testing import TestClient
+
+api = Penta(urls_namespace="path-view")
+router = Router()
+
+
+@router.get("/items/{item_id}", url_name="get_item")
+def get_item(item_id: int):
+    return f"GET {item_id}"
+
+
+@router.put("/items/{item_id}", url_name="put_item")
+def put_item(item_id: int):
+    return f"PUT {item_id}"
+
+
+@router.api_operation(["PATCH", "DELETE"], "/items/{item_id}")
+def change_item(item_id: int):
+    return f"CHANGE {item_id}"
+
+
+@router.delete("/items/{item_id}")
+def delete_item(item_id: int):
+    return "never called"  # pragma: no cover
+
+
+api.add_router("/", router)
+client = TestClient(router)
+
+
+def test_method_dispatch():
+    path_view = router.path_operations["/items/{item_id}"]
+    assert list(path_view.operations_by_method) == ["GET", "PUT", "PATCH", "DELETE"]
+    # the first operation registered for a method wins
+    assert path_view.operations_by_method["DELETE"].view_func.__name__ == "change_item"
+
+    assert client.get("/items/1").json() == "GET 1"
+    assert client.put("/items/1").json() == "PUT 1"
+    assert client.patch("/items/1").json() == "CHANGE 1"
+    assert client.delete("/items/1").json() == "CHANGE 1"
+
+    response = client.post("/items/1")
+    assert response.status_code == 405
+    assert response["Allow"] == "GET, PUT, PATCH, DELETE"
+
+
+def test_one_url_pattern_per_path():
+    patterns = api.urls[0]
+    resolving = [p for p in patterns if not isinstance(p.pattern, ReverseOnlyPattern)]
+    assert [str(p.pattern) for p in resolving].count("items/<item_id>") == 1
+    # reverse only patterns are at the end
+    assert all(
+        isinstance(p.pattern, ReverseOnlyPattern) for p in patterns[len(resolving) :]
+    )
+
+    resolver = URLResolver(RegexPattern(r"^/"), patterns)
+    assert resolver.resolve("/items/1").url_name == "get_item"
+
+
+def test_reverse_all_operation_names():
+    resolver = URLResolver(RegexPattern(r"^/"), api.urls[0])
+    for name in ("get_item", "put_item", "change_item", "delete_item"):
+        assert resolver.reverse(name, item_id=1) == "items/1"
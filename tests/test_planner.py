@@ -0,0 +1,159 @@
+import warnings
+
+import pytest
+
+from penta import Depends, Penta, Router
+from penta.planner import ExecutionPlanWarning
+from penta.security import SignedTokenBearer
+from penta.testing import TestAsyncClient, TestClient
+from penta.throttling import AnonRateThrottle, BaseThrottle
+
+
+class SyncThrottle(BaseThrottle):
+    def allow_request(self, request):
+        return True
+
+
+def sync_auth(request):
+    return request.headers.get("X-Key")
+
+
+async def async_auth(request):
+    return request.headers.get("X-Key")
+
+
+def dependency():
+    return 1
+
+
+async def async_dependency():
+    return 2
+
+
+def steps(plan):
+    return [(s.stage, s.mode, s.runs) for s in plan.steps]
+
+
+def test_sync_operation_plan():
+    api = Penta()
+
+    @api.get("/sync", auth=sync_auth, throttle=AnonRateThrottle("10/s"))
+    def sync_view(value: int = Depends(dependency)):
+        return value
+
+    plan = api.execution_plans()["GET /sync"]
+    assert steps(plan) == [
+        ("auth", "sync", "call"),
+        ("throttle", "sync", "call"),
+        ("dependency", "sync", "call"),
+        ("view", "sync", "call"),
+    ]
+    assert plan.hops == []
+    assert plan.dict()["mode"] == "sync"
+    assert (
+        repr(plan)
+        == "<ExecutionPlan test_sync_operation_plan.<locals>.sync_view sync hops=0>"
+    )
+
+
+def test_async_operation_plan():
+    router = Router()
+
+    with pytest.warns(ExecutionPlanWarning) as record:
+
+        @router.get(
+            "/async",
+            auth=[async_auth, sync_auth, SignedTokenBearer(keys={"k": "s"})],
+            throttle=[AnonRateThrottle("10/s"), SyncThrottle()],
+        )
+        async def async_view(
+            a: int = Depends(async_dependency), b: int = Depends(dependency)
+        ):
+            return a + b
+
+        api = Penta()
+        api.add_router("/r", router)
+
+    plan = api.execution_plans()["GET /r/async"]
+    assert steps(plan) == [
+        ("auth", "async", "await"),
+        ("auth", "sync", "thread"),
+        ("auth", "sync", "call"),  # blocking = False
+        ("throttle", "async", "await"),
+        ("throttle", "sync", "thread"),
+        ("dependency", "async", "await"),
+        ("dependency", "sync", "thread"),
+        ("view", "async", "await"),
+    ]
+    assert [s.name for s in plan.hops] == ["sync_auth", "SyncThrottle", "dependency"]
+    assert plan.dict()["hops"] == 3
+
+    messages = [str(w.message) for w in record]
+    assert "auth sync_auth is sync and runs via thread" in messages[0]
+    assert "blocking = False" in messages[0]
+    assert "throttle SyncThrottle is sync and runs via thread" in messages[1]
+    assert "implement aallow_request" in messages[1]
+    assert "dependency dependency is sync" in messages[2]
+
+
+def test_sync_operation_with_async_auth():
+    calls = []
+
+    async def auth(request):
+        calls.append(request)
+        return "user"
+
+    api = Penta()
+    with pytest.warns(ExecutionPlanWarning, match="runs via loop_bridge") as record:
+
+        @api.get("/sync", auth=auth)
+        def view():
+            return "OK"
+
+    # reported at the view definition, not inside penta
+    assert record[0].filename == __file__
+    assert record[0].lineno == view.__code__.co_firstlineno
+    assert api.execution_plans()["GET /sync"].auth_runs() == ["loop_bridge"]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # no "coroutine was never awaited"
+        assert TestClient(api).get("/sync").status_code == 200
+    assert len(calls) == 1  # called once
+
+
+@pytest.mark.asyncio
+async def test_sync_auth_runs_in_thread():
+    import threading
+
+    threads = []
+
+    def auth(request):
+        threads.append(threading.current_thread())
+        return "user"
+
+    api = Penta()
+    with pytest.warns(ExecutionPlanWarning):
+
+        @api.get("/async", auth=auth)
+        async def view():
+            return "OK"
+
+    assert (await TestAsyncClient(api).get("/async")).status_code == 200
+    assert threads[0] is not threading.current_thread()
+
+
+def test_sync_executor_plan():
+    from unittest import mock
+
+    with mock.patch("penta.conf.settings.SYNC_EXECUTORS", {"reports": 1}):
+        api = Penta()
+
+        @api.get("/report", sync_executor="reports")
+        def report():
+            return "OK"
+
+    plan = api.execution_plans()["GET /report"]
+    assert steps(plan) == [("view", "sync", "thread")]
+    assert plan.dict()["notes"] == [
+        "runs in the 'reports' pool from an async path view - "
+        "under WSGI every request also goes through async_to_sync"
+    ]
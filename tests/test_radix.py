@@ -0,0 +1,153 @@
+import uuid
+from unittest import mock
+
+import pytest
+from django.urls import URLResolver
+from django.urls.exceptions import Resolver404
+from django.urls.resolvers import RegexPattern
+
+from penta import Penta, Router
+from penta.radix import RadixTree, RadixURLPattern
+from penta.router import ReverseOnlyPattern
+from penta.testing import TestClient
+
+
+def build_api(radix_routing: bool) -> Penta:
+    api = Penta(radix_routing=radix_routing, urls_namespace="radix")
+    router = Router()
+
+    @router.get("/items/{item_id}")
+    def get_item(item_id: str):
+        return f"item {item_id}"
+
+    @router.get("/items/new")
+    def new_item():
+        return "shadowed by /items/{item_id}"  # pragma: no cover
+
+    @router.get("/users/new")
+    def new_user():
+        return "new user"
+
+    @router.get("/users/{int:user_id}", url_name="user")
+    def get_user(user_id: int):
+        return user_id
+
+    @router.put("/users/{int:user_id}", url_name="update_user")
+    def update_user(user_id: int):
+        return user_id
+
+    @router.get("/users/{int:user_id}/report-{int:year}.csv")
+    def report(user_id: int, year: int):
+        return [user_id, year]
+
+    @router.get("/objects/{uuid:object_id}")
+    def get_object(object_id: uuid.UUID):
+        return str(object_id)
+
+    @router.get("/files/{path:file_path}")
+    def get_file(file_path: str):
+        return file_path
+
+    @router.get("/trailing/")
+    def trailing():
+        return "trailing"
+
+    api.add_router("/", router)
+    return api
+
+
+def resolver(api: Penta) -> URLResolver:
+    return URLResolver(RegexPattern(r"^/"), api.urls[0])
+
+
+OBJECT_ID = uuid.UUID(int=1)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/items/1",
+        "/items/new",
+        "/users/new",
+        "/users/42",
+        "/users/42/report-2024.csv",
+        f"/objects/{OBJECT_ID}",
+        "/files/a/b/c.txt",
+        "/trailing/",
+        "/",
+        "/openapi.json",
+    ],
+)
+def test_resolve_same_as_django(path):
+    expected = resolver(build_api(radix_routing=False)).resolve(path)
+    match = resolver(build_api(radix_routing=True)).resolve(path)
+    assert match.kwargs == expected.kwargs
+    assert match.url_name == expected.url_name
+    assert match.route == expected.route
+
+
+@pytest.mark.parametrize(
+    "path", ["/users/abc", "/users/42/report-x.csv", "/trailing", "/nothing/here"]
+)
+def test_not_found(path):
+    with pytest.raises(Resolver404):
+        resolver(build_api(radix_routing=True)).resolve(path)
+
+
+def test_one_resolving_pattern():
+    patterns = build_api(radix_routing=True).urls[0]
+    radix = [p for p in patterns if isinstance(p, RadixURLPattern)]
+    assert len(radix) == 1
+    assert radix[0].tree.fallback == [6]  # the {path:...} route
+    assert len(radix[0].patterns) == 8  # one per path
+
+    names = {p.name for p in patterns if isinstance(p.pattern, ReverseOnlyPattern)}
+    assert {"get_item", "user", "update_user", "get_file"} <= names
+
+
+def test_reverse():
+    url_resolver = resolver(build_api(radix_routing=True))
+    assert url_resolver.reverse("user", user_id=1) == "users/1"
+    assert url_resolver.reverse("update_user", user_id=1) == "users/1"
+    assert url_resolver.reverse("get_file", file_path="a/b") == "files/a/b"
+
+
+def test_views():
+    client = TestClient(build_api(radix_routing=True))
+    assert client.get("/users/42/report-2024.csv").json() == [42, 2024]
+
+
+@pytest.mark.parametrize("radix_routing", [False, True])
+def test_root_operation(radix_routing):
+    api = Penta(radix_routing=radix_routing, urls_namespace=f"root-{radix_routing}")
+
+    @api.get("/")
+    def root():
+        return "root"
+
+    @api.get("/items")
+    def items():
+        return "items"
+
+    # the api root url (default home page) comes after the operations
+    assert resolver(api).resolve("/").url_name == "root"
+    client = TestClient(api)
+    assert client.get("/").json() == "root"
+    assert client.get("/items").json() == "items"
+
+
+def test_setting():
+    assert not Penta().radix_routing
+    with mock.patch("penta.conf.settings.RADIX_ROUTING", True):
+        assert Penta().radix_routing
+
+
+def test_tree_candidates_order():
+    tree = RadixTree()
+    tree.add("a/<x>", 0)
+    tree.add("a/b", 1)
+    tree.add("a/<int:x>", 2)
+    tree.add("<path:rest>", 3)
+    assert tree.match("a/b") == [0, 1, 3]
+    assert tree.match("a/1") == [0, 2, 3]
+    assert tree.match("b") == [3]
@@ -1,11 +1,29 @@
+import datetime
+import ipaddress
+import json
+import uuid
+from decimal import Decimal
+from enum import Enum
 from io import StringIO
+from typing import List, Optional
+from unittest import mock
 
+import pydantic
 import pytest
 from django.utils.encoding import force_str
 from django.utils.xmlutils import SimplerXMLGenerator
+from pydantic import TypeAdapter
+from pydantic_core import Url
 
-from penta import Penta
-from penta.renderers import BaseRenderer
+from penta import Field, Penta, Schema
+from penta.errors import ConfigError
+from penta.renderers import (
+    BaseRenderer,
+    JSONRenderer,
+    ORJSONRenderer,
+    PydanticJSONRenderer,
+    ValidatedResponse,
+)
 from penta.testing import TestClient
 
 
@@ -101,3 +119,169 @@ def test_implment_render():
     renderer = FooRenderer()
     with pytest.raises(NotImplementedError):
         renderer.render(None, None, response_status=200)
+
+
+class Pet(Schema):
+    pet_name: str = Field(serialization_alias="petName")
+    nickname: Optional[str] = None
+    owner: str
+
+    @staticmethod
+    def resolve_owner(obj, context):
+        return f"{obj.owner_first} ({context['response_status']})"
+
+
+class PetObject:
+    def __init__(self, name, owner_first):
+        self.pet_name = name
+        self.owner_first = owner_first
+        self.nickname = None
+
+
+api_pydantic = Penta(renderer=PydanticJSONRenderer())
+
+
+@api_pydantic.get("/pets", response=List[Pet], by_alias=True, exclude_none=True)
+def pets_view():
+    return [PetObject("Rex", "John"), PetObject("Tom", "Jane")]
+
+
+@api_pydantic.get("/no-schema")
+def no_schema_view():
+    return {"name": "Rex"}
+
+
+@api_pydantic.get("/bad", response=Pet)
+def bad_view():
+    return {"pet_name": "Rex"}
+
+
+def test_pydantic_json_renderer():
+    client = TestClient(api_pydantic)
+
+    response = client.get("/pets")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json; charset=utf-8"
+    assert response.content == (
+        b'[{"petName":"Rex","owner":"John (200)"},'
+        b'{"petName":"Tom","owner":"Jane (200)"}]'
+    )
+
+    response = client.get("/no-schema")
+    assert response.content == b'{"name": "Rex"}'
+
+    with pytest.raises(pydantic.ValidationError):
+        client.get("/bad")
+
+
+def test_pydantic_json_renderer_same_data_as_default():
+    default_api = Penta()
+    default_api.get("/pets", response=List[Pet], by_alias=True, exclude_none=True)(
+        pets_view
+    )
+    expected = TestClient(default_api).get("/pets").json()
+    assert TestClient(api_pydantic).get("/pets").json() == expected
+
+
+def test_validated_response_dump_python():
+    pet = Pet.model_validate(PetObject("Rex", "John"), context={"response_status": 201})
+    data = ValidatedResponse(pet, TypeAdapter(Pet), {"by_alias": True})
+    assert data.dump_python() == {
+        "petName": "Rex",
+        "nickname": None,
+        "owner": "John (201)",
+    }
+    assert data.dump_json() == b'{"petName":"Rex","nickname":null,"owner":"John (201)"}'
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+class Size(Enum):
+    SMALL = 1
+
+
+class Tag(pydantic.BaseModel):
+    name: str
+
+
+class SizedTag(Tag):
+    size: Size
+
+
+def realistic_payload():
+    return {
+        "id": uuid.UUID("c6b9cb9a-6ad6-4b9e-b0c6-0c7b5b1d2e1f"),
+        "price": Decimal("10.50"),
+        "created": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456),
+        "created_utc": datetime.datetime(
+            2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+        ),
+        "day": datetime.date(2024, 5, 1),
+        "color": Color.RED,
+        "ip": ipaddress.IPv4Address("127.0.0.1"),
+        "network": ipaddress.IPv6Network("2001:db8::/32"),
+        "url": Url("https://example.com"),
+        "tag": Tag(name="x"),
+        "tags": [Tag(name="a"), Tag(name="b")],
+        1: "int key",
+    }
+
+
+def test_orjson_renderer_same_semantics_as_json_renderer():
+    pytest.importorskip("orjson")
+
+    payload = realistic_payload()
+    expected = json.loads(JSONRenderer().render(None, payload, response_status=200))
+    result = ORJSONRenderer().render(None, payload, response_status=200)
+    assert isinstance(result, bytes)
+    assert json.loads(result) == expected
+
+
+def test_orjson_renderer_plain_enums():
+    pytest.importorskip("orjson")
+
+    class CompatORJSONRenderer(ORJSONRenderer):
+        convert_enums = True
+
+    payload = {
+        "size": Size.SMALL,
+        "sizes": (Size.SMALL, Color.RED),
+        "tag": Tag(name="x"),
+        "model": SizedTag(name="y", size=Size.SMALL),
+    }
+    expected = json.loads(JSONRenderer().render(None, payload, response_status=200))
+    assert expected["size"] == "Size.SMALL"
+    assert expected["model"]["size"] == "Size.SMALL"
+
+    result = CompatORJSONRenderer().render(None, payload, response_status=200)
+    assert json.loads(result) == expected
+
+    # by value by default
+    result = json.loads(ORJSONRenderer().render(None, payload, response_status=200))
+    assert result["size"] == result["model"]["size"] == 1
+
+
+def test_orjson_renderer_setting():
+    pytest.importorskip("orjson")
+
+    with mock.patch(
+        "penta.conf.settings.RENDERER_CLASS", "penta.renderers.ORJSONRenderer"
+    ):
+        api = Penta()
+    assert isinstance(api.renderer, ORJSONRenderer)
+
+    @api.get("/test")
+    def view():
+        return {"price": Decimal("1.5")}
+
+    response = TestClient(api).get("/test")
+    assert response["Content-Type"] == "application/json; charset=utf-8"
+    assert response.content == b'{"price":"1.5"}'
+
+
+def test_orjson_not_installed():
+    with mock.patch("penta.renderers.orjson", None):
+        with pytest.raises(ConfigError):
+            ORJSONRenderer()
@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+from django.contrib.auth.models import User
+
+from penta import Penta, Router
+from penta.errors import ConfigError, Overloaded
+from penta.scheduling import FairScheduler
+from penta.testing import TestAsyncClient, TestClient
+
+
+async def admitted_order(scheduler, keys):
+    "Queues requests of `keys` behind a running one, returns the order they run"
+    order = []
+    await scheduler.acquire("running")
+
+    async def request(key):
+        await scheduler.acquire(key)
+        order.append(key)
+        scheduler.release()
+
+    tasks = [asyncio.create_task(request(key)) for key in keys]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_fair_order():
+    scheduler = FairScheduler(max_concurrency=1)
+    order = await admitted_order(scheduler, ["flood"] * 5 + ["other", "other"])
+    assert order == ["flood", "other", "flood", "other", "flood", "flood", "flood"]
+    assert scheduler.stats()["running"] == 0
+    assert scheduler.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_weights():
+    scheduler = FairScheduler(max_concurrency=1, weights={"gold": 2})
+    order = await admitted_order(scheduler, ["basic"] * 3 + ["gold"] * 6)
+    assert order[:6].count("gold") == 4
+    assert order[-1] == "gold"
+
+
+@pytest.mark.asyncio
+async def test_max_queue():
+    scheduler = FairScheduler(max_concurrency=1, max_queue=1, retry_after=2)
+    await scheduler.acquire("a")
+    waiting = asyncio.create_task(scheduler.acquire("a"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(Overloaded) as exc_info:
+        await scheduler.acquire("a")
+    assert exc_info.value.wait == 2
+
+    # other keys still queue
+    other = asyncio.create_task(scheduler.acquire("b"))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["queued"] == 2
+
+    # "b" has not run yet - it goes before the second request of "a"
+    scheduler.release()
+    await other
+    assert not waiting.done()
+    scheduler.release()
+    await waiting
+    scheduler.release()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_while_waiting():
+    scheduler = FairScheduler(max_concurrency=1)
+    await scheduler.acquire("a")
+    waiting = asyncio.create_task(scheduler.acquire("b"))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert scheduler.stats()["keys"]["b"]["queued"] == 0
+    scheduler.release()
+    assert scheduler.running == 0
+    await scheduler.acquire("c")
+    assert scheduler.running == 1
+
+
+@pytest.mark.asyncio
+async def test_forget_idle_keys():
+    scheduler = FairScheduler(max_keys=4)
+    for key in range(10):
+        await scheduler.acquire(key)
+        scheduler.release()
+    assert len(scheduler.stats()["keys"]) <= 4
+    assert 9 in scheduler.stats()["keys"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compile_operations", [False, True])
+async def test_operation(compile_operations):
+    scheduler = FairScheduler(
+        max_concurrency=1, key=lambda request: request.headers["X-Tenant"]
+    )
+    api = Penta(compile_operations=compile_operations)
+    finish = asyncio.Event()
+    started = []
+
+    @api.get("/report", scheduler=scheduler)
+    async def report():
+        started.append(True)
+        await finish.wait()
+        return "OK"
+
+    client = TestAsyncClient(api)
+    first = asyncio.create_task(client.get("/report", headers={"X-Tenant": "a"}))
+    second = asyncio.create_task(client.get("/report", headers={"X-Tenant": "b"}))
+    await asyncio.sleep(0.01)
+    assert started == [True]
+    assert scheduler.stats()["keys"]["b"]["queued"] == 1
+
+    finish.set()
+    assert (await first).status_code == 200
+    assert (await second).status_code == 200
+    stats = scheduler.stats()["keys"]
+    assert stats["a"] == {"admitted": 1, "queued": 0, "delay_avg": 0, "delay_max": 0}
+    assert stats["b"]["delay_max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_operation_queue_full():
+    scheduler = FairScheduler(max_concurrency=1, max_queue=0, retry_after=5)
+    router = Router(scheduler=scheduler)
+    finish = asyncio.Event()
+
+    @router.get("/report")
+    async def report():
+        await finish.wait()
+        return "OK"
+
+    api = Penta()
+    api.add_router("/", router)
+    client = TestAsyncClient(api)
+    first = asyncio.create_task(client.get("/report"))
+    await asyncio.sleep(0.01)
+
+    response = await client.get("/report")
+    assert response.status_code == 503
+    assert response["Retry-After"] == "5"
+
+    finish.set()
+    assert (await first).status_code == 200
+
+
+def test_default_key():
+    scheduler = FairScheduler()
+    request = TestClient(None)._build_request("GET", "/", {}, {})
+
+    request.auth = None
+    assert scheduler.get_key(request) == ("ident", "127.0.0.1")
+    request.auth = "token"
+    assert scheduler.get_key(request) == ("auth", "token")
+    request.auth = {"tenant": 1}
+    assert scheduler.get_key(request) == ("auth", "{'tenant': 1}")
+    request.auth = User(pk=5)
+    assert scheduler.get_key(request) == ("User", 5)
+
+
+def test_sync_operations():
+    router = Router(scheduler=FairScheduler())
+    router.get("/sync")(lambda: "OK")
+    api = Penta()
+    api.add_router("/", router)
+    operation = router.path_operations["/sync"].operations[0]
+    assert operation.scheduler is None
+    assert TestClient(api).get("/sync").json() == "OK"
+
+    api = Penta()
+    with pytest.raises(ConfigError, match="works only with async operations"):
+        api.get("/sync", scheduler=FairScheduler())(lambda: "OK")
+        api.urls  # noqa: B018
@@ -0,0 +1,129 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from penta.shared_memory import SharedMemoryCache
+from penta.testing import TestClient
+from penta.throttling import (
+    AnonGCRAThrottle,
+    AnonSlidingWindowThrottle,
+    AnonTwoTierThrottle,
+    check_throttles,
+)
+
+
+@pytest.fixture
+def shm_cache(tmp_path):
+    return SharedMemoryCache(str(tmp_path / "throttle"), {"OPTIONS": {"buckets": 4}})
+
+
+def test_cache_api(shm_cache):
+    assert shm_cache.get("a") is None
+    assert shm_cache.get("a", 5) == 5
+    assert shm_cache.add("a", 1) is True
+    assert shm_cache.add("a", 2) is False
+    assert shm_cache.incr("a", 10) == 11
+    assert shm_cache.decr("a") == 10
+    shm_cache.set("b", 1.5, 60)
+    assert shm_cache.get_many(["a", "b", "c"]) == {"a": 10, "b": 1.5}
+    shm_cache.set_many({"c": 0, "d": -3})
+    assert shm_cache.get("c") == 0
+    assert shm_cache.touch("d", 60) is True
+    assert shm_cache.delete("d") is True
+    assert shm_cache.delete("d") is False
+    assert shm_cache.touch("d") is False
+
+    with pytest.raises(ValueError, match="not found"):
+        shm_cache.incr("missing")
+    with pytest.raises(ValueError, match="stores only numbers"):
+        shm_cache.set("list", [1, 2])
+
+    shm_cache.clear()
+    assert shm_cache.get("a") is None
+
+
+def test_expiry_and_eviction(shm_cache):
+    shm_cache.set("expired", 1, 0)
+    assert shm_cache.get("expired") is None
+    assert shm_cache.add("expired", 2) is True
+
+    # 4 buckets x 8 slots - the entries expiring first make room
+    shm_cache.set("forever", 1, None)
+    for i in range(100):
+        shm_cache.set(f"key{i}", i, 10 + i)
+    assert shm_cache.get("forever") == 1
+    assert shm_cache.get("key99") == 99
+    assert shm_cache.get("key0") is None
+
+
+def test_shared_between_instances(shm_cache, tmp_path):
+    other = SharedMemoryCache(str(tmp_path / "throttle"), {"OPTIONS": {"buckets": 4}})
+    shm_cache.set("shared", 42)
+    assert other.get("shared") == 42
+
+
+def _increment(location, count):
+    cache = SharedMemoryCache(location, {"OPTIONS": {"buckets": 4}})
+    for _i in range(count):
+        cache.incr("counter")
+
+
+def test_incr_atomic_between_processes(shm_cache):
+    shm_cache.set("counter", 0)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_increment, args=(shm_cache.location, 500))
+        for _i in range(4)
+    ]
+    for process in processes:
+        process.start()
+    # and threads of this process at the same time
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: shm_cache.incr("counter"), range(500)))
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert shm_cache.get("counter") == 2500
+
+
+def _throttle_allowed(location, results):
+    throttle = AnonSlidingWindowThrottle("50/m")
+    throttle.cache = SharedMemoryCache(location, {"OPTIONS": {"buckets": 4}})
+    request = TestClient(None)._build_request("GET", "/", {}, {})
+    request.auth = None
+    results.put(sum(throttle.allow_request(request) for _i in range(30)))
+
+
+def test_throttle_between_processes(shm_cache):
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [
+        context.Process(target=_throttle_allowed, args=(shm_cache.location, results))
+        for _i in range(3)
+    ]
+    for process in processes:
+        process.start()
+    allowed = sum(results.get(timeout=30) for _i in processes)
+    for process in processes:
+        process.join()
+
+    assert allowed == 50
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "throttle_class", [AnonGCRAThrottle, AnonSlidingWindowThrottle, AnonTwoTierThrottle]
+)
+async def test_throttles(shm_cache, throttle_class):
+    throttle = throttle_class("2/m")
+    throttle.cache = shm_cache
+    throttle.timer = lambda: 0
+    request = TestClient(None)._build_request("GET", "/", {}, {})
+    request.auth = None
+
+    assert throttle.allow_request(request) is True
+    assert await throttle.aallow_request(request) is True
+    assert check_throttles(request, [throttle]) == [throttle.wait()]
+    assert await throttle.aallow_request(request) is False
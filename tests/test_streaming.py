@@ -0,0 +1,325 @@
+import datetime
+from typing import List, Optional
+from unittest import mock
+
+import pydantic
+import pytest
+from django.http import HttpResponse
+from someapp.models import Category
+
+from penta import Penta, Schema
+from penta.errors import ConfigError
+from penta.renderers import PydanticJSONRenderer
+from penta.testing import TestAsyncClient, TestClient
+
+
+class Item(Schema):
+    id: int
+    name: str
+
+
+class CategorySchema(Schema):
+    id: int
+    title: str
+
+
+def items(count):
+    for i in range(count):
+        yield {"id": i, "name": f"item {i}"}
+
+
+async def aitems(count, broken_at=None):
+    for i in range(count):
+        yield {"id": i, "name": f"item {i}"} if i != broken_at else {"id": i}
+
+
+api = Penta()
+
+
+@api.get("/items", response=List[Item], stream=True)
+def stream_items(count: int):
+    return items(count)
+
+
+@api.get("/categories", response=List[CategorySchema], stream=True)
+def stream_categories():
+    return Category.objects.filter(title__startswith="stream").order_by("id")
+
+
+@api.get("/broken", response=List[Item], stream=True)
+def stream_broken(at: int):
+    return ({"id": i, "name": "ok"} if i != at else {"id": i} for i in range(5))
+
+
+@api.get("/multi", response={200: List[Item], 404: dict}, stream=True)
+def stream_multi(found: bool):
+    if not found:
+        return 404, {"detail": "not found"}
+    return items(2)
+
+
+@api.get("/headers", response=List[Item], stream=True)
+def stream_headers(response: HttpResponse):
+    response["X-Total"] = "2"
+    response.set_cookie("exported", "yes")
+    return items(2)
+
+
+client = TestClient(api)
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 10])
+def test_stream_items(count):
+    with mock.patch("penta.conf.settings.STREAM_CHUNK_SIZE", 3):
+        chunked_api = Penta()
+        chunked_api.get("/items", response=List[Item], stream=True)(stream_items)
+
+    response = TestClient(chunked_api).get(f"/items?count={count}")
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/json; charset=utf-8"
+    assert response.json() == [{"id": i, "name": f"item {i}"} for i in range(count)]
+
+    chunks = list(
+        chunked_api.default_router.path_operations["/items"]
+        .operations[0]
+        .run(client._build_request("GET", f"/items?count={count}", {}, {}))
+        .streaming_content
+    )
+    assert len(chunks) == max(1, -(-count // 3)) + (1 if count else 0)
+
+
+def test_stream_same_data_as_regular_response():
+    regular = Penta()
+    regular.get("/items", response=List[Item])(lambda: list(items(5)))
+    expected = TestClient(regular).get("/items").json()
+
+    assert client.get("/items?count=5").json() == expected
+
+
+@pytest.mark.django_db
+def test_stream_queryset():
+    for i in range(5):
+        Category.objects.create(title=f"stream {i}")
+
+    with mock.patch.object(
+        Category.objects.none().__class__,
+        "iterator",
+        autospec=True,
+        side_effect=lambda qs, chunk_size: iter(list(qs)),
+    ) as iterator:
+        response = client.get("/categories")
+
+    iterator.assert_called_once()
+    assert iterator.call_args.kwargs == {"chunk_size": 1000}
+    assert [c["title"] for c in response.json()] == [f"stream {i}" for i in range(5)]
+
+
+def test_stream_validation_error_in_first_chunk():
+    with pytest.raises(pydantic.ValidationError):
+        client.get("/broken?at=0")
+
+
+def test_stream_validation_error_in_later_chunk():
+    with mock.patch("penta.conf.settings.STREAM_CHUNK_SIZE", 2):
+        chunked_api = Penta()
+        chunked_api.get("/broken", response=List[Item], stream=True)(stream_broken)
+
+    with mock.patch("penta.streaming.logger") as logger:
+        response = TestClient(chunked_api).get("/broken?at=3")
+    assert response.status_code == 200
+    assert response.content == b'[{"id": 0, "name": "ok"},{"id": 1, "name": "ok"}'
+    logger.exception.assert_called_once()
+
+
+def test_stream_only_collection_statuses():
+    response = client.get("/multi?found=true")
+    assert response.streaming
+    assert len(response.json()) == 2
+
+    response = client.get("/multi?found=false")
+    assert response.status_code == 404
+    assert not response.streaming
+    assert response.json() == {"detail": "not found"}
+
+
+def test_stream_keeps_temporal_response_headers():
+    response = client.get("/headers")
+    assert response["X-Total"] == "2"
+    assert response.cookies["exported"].value == "yes"
+
+
+def test_stream_pydantic_renderer():
+    fast_api = Penta(renderer=PydanticJSONRenderer())
+
+    class Event(Schema):
+        day: datetime.date
+
+    @fast_api.get("/events", response=List[Event], stream=True)
+    def events():
+        return ({"day": datetime.date(2024, 1, i)} for i in range(1, 3))
+
+    response = TestClient(fast_api).get("/events")
+    assert response.content == b'[{"day":"2024-01-01"},{"day":"2024-01-02"}]'
+
+
+def test_stream_requires_collection_response():
+    config_api = Penta()
+    with pytest.raises(ConfigError):
+
+        @config_api.get("/single", response=Item, stream=True)
+        def single():
+            pass  # pragma: no cover
+
+
+def test_stream_ndjson():
+    ndjson_api = Penta()
+    ndjson_api.get("/items", response=List[Item], stream="ndjson")(stream_items)
+    ndjson_client = TestClient(ndjson_api)
+
+    response = ndjson_client.get("/items?count=3")
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response.content == (
+        b'{"id": 0, "name": "item 0"}\n'
+        b'{"id": 1, "name": "item 1"}\n'
+        b'{"id": 2, "name": "item 2"}\n'
+    )
+    assert ndjson_client.get("/items?count=0").content == b""
+
+
+def test_stream_unknown_format():
+    with pytest.raises(ConfigError, match="unknown stream format"):
+        Penta().get("/items", response=List[Item], stream="xml")(stream_items)
+
+
+async_api = Penta()
+
+
+@async_api.get("/items", response=List[Item], stream=True)
+async def async_items(count: int, broken_at: Optional[int] = None):
+    return aitems(count, broken_at)
+
+
+@async_api.get("/ndjson", response=List[Item], stream="ndjson")
+async def async_ndjson(count: int):
+    return aitems(count)
+
+
+@async_api.get("/sync-items", response=List[Item], stream=True)
+async def async_sync_items(count: int):
+    return items(count)
+
+
+@async_api.get("/categories", response=List[CategorySchema], stream=True)
+async def async_categories():
+    return Category.objects.order_by("id")
+
+
+async_client = TestAsyncClient(async_api)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [0, 1, 3, 10])
+async def test_async_stream_items(count):
+    with mock.patch("penta.conf.settings.STREAM_CHUNK_SIZE", 3):
+        chunked_api = Penta()
+        chunked_api.get("/items", response=List[Item], stream=True)(async_items)
+        chunked_api.get("/sync", response=List[Item], stream=True)(async_sync_items)
+    chunked_client = TestAsyncClient(chunked_api)
+
+    expected = [{"id": i, "name": f"item {i}"} for i in range(count)]
+    response = await chunked_client.get(f"/items?count={count}")
+    assert response.status_code == 200
+    assert response.streaming
+    assert response.json() == expected
+
+    response = await chunked_client.get(f"/sync?count={count}")
+    assert response.json() == expected
+
+
+@pytest.mark.asyncio
+async def test_async_stream_is_async():
+    operation = async_api.default_router.path_operations["/items"].operations[0]
+    request = async_client._build_request("GET", "/items?count=2", {}, {})
+    response = await operation.run(request)
+    assert response.is_async
+    chunks = [chunk async for chunk in response.streaming_content]
+    assert b"".join(chunks) == (
+        b'[{"id": 0, "name": "item 0"},{"id": 1, "name": "item 1"}]'
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_stream_ndjson():
+    response = await async_client.get("/ndjson?count=2")
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response.content == (
+        b'{"id": 0, "name": "item 0"}\n{"id": 1, "name": "item 1"}\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_stream_validation_errors():
+    with pytest.raises(pydantic.ValidationError):
+        await async_client.get("/items?count=5&broken_at=0")
+
+    with mock.patch("penta.conf.settings.STREAM_CHUNK_SIZE", 2):
+        chunked_api = Penta()
+        chunked_api.get("/items", response=List[Item], stream=True)(async_items)
+
+    with mock.patch("penta.streaming.logger") as logger:
+        response = await TestAsyncClient(chunked_api).get("/items?count=5&broken_at=3")
+    assert response.status_code == 200
+    assert (
+        response.content == b'[{"id": 0, "name": "item 0"},{"id": 1, "name": "item 1"}'
+    )
+    logger.exception.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_stream_queryset():
+    categories = [Category(id=i, title=f"stream {i}") for i in range(3)]
+
+    async def aiterator(qs, chunk_size):
+        for category in categories:
+            yield category
+
+    with mock.patch.object(
+        Category.objects.none().__class__,
+        "aiterator",
+        autospec=True,
+        side_effect=aiterator,
+    ) as mocked:
+        response = await async_client.get("/categories")
+
+    assert mocked.call_args.kwargs == {"chunk_size": 1000}
+    assert response.json() == [{"id": i, "title": f"stream {i}"} for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_async_stream_old_django():
+    with mock.patch("penta.operation.ASYNC_STREAMING", False):
+        with pytest.raises(ConfigError, match="requires Django 4.2"):
+            await async_client.get("/items?count=2")
+        with pytest.raises(ConfigError, match="async_categories"):
+            await async_client.get("/categories")
+
+        # sync iterables are still streamed synchronously
+        response = await async_client.get("/sync-items?count=2")
+        assert response.json() == [
+            {"id": 0, "name": "item 0"},
+            {"id": 1, "name": "item 1"},
+        ]
+
+
+@pytest.mark.asyncio
+async def test_async_stream_compiled():
+    compiled_api = Penta(compile_operations=True)
+    compiled_api.get("/items", response=List[Item], stream=True)(async_items)
+    client = TestAsyncClient(compiled_api)
+
+    response = await client.get("/items?count=2")
+    assert response.json() == [{"id": 0, "name": "item 0"}, {"id": 1, "name": "item 1"}]
+
+    with pytest.raises(pydantic.ValidationError):
+        await client.get("/items?count=2&broken_at=0")
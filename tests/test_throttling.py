@@ -1,3 +1,10 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from unittest import mock
+
 import pytest
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
@@ -5,11 +12,30 @@ from django.core.exceptions import ImproperlyConfigured
 from penta import Penta, Router
 from penta.testing import TestAsyncClient, TestClient
 from penta.throttling import (
+    AnonConcurrencyThrottle,
+    AnonGCRAThrottle,
     AnonRateThrottle,
+    AnonSlidingWindowThrottle,
+    AnonTwoTierThrottle,
+    AuthConcurrencyThrottle,
+    AuthGCRAThrottle,
     AuthRateThrottle,
+    AuthSlidingWindowThrottle,
+    AuthTwoTierThrottle,
     BaseThrottle,
+    CacheConcurrencyBackend,
+    GCRARateThrottle,
+    LocalConcurrencyBackend,
     SimpleRateThrottle,
+    UserConcurrencyThrottle,
+    UserGCRAThrottle,
     UserRateThrottle,
+    UserSlidingWindowThrottle,
+    UserTwoTierThrottle,
+    acheck_throttles,
+    check_throttles,
+    has_aallow_request,
+    release_concurrency_slots,
 )
 
 
@@ -311,6 +337,696 @@ def test_base_classes():
         sample_scope2.get_rate()
 
 
+def test_gcra():
+    th = AuthGCRAThrottle("5/m")
+    set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+
+    # a burst of 5, then one request every 12 seconds
+    for _i in range(5):
+        assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+    assert th.wait() == 12
+
+    set_throttle_timer(th, 6)
+    assert th.allow_request(request) is False
+    assert th.wait() == 6
+
+    set_throttle_timer(th, 12)
+    assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+
+    # the state is a single number
+    assert cache.get(th.get_cache_key(request)) == 72
+    assert th.get_cache_key(request) == "throttle_gcra_auth_8.8.8.8"
+
+    set_throttle_timer(th, 1000)
+    for _i in range(5):
+        assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+
+
+def test_sliding_window():
+    th = AuthSlidingWindowThrottle("10/m")
+    set_throttle_timer(th, 30)
+    request = build_request()
+    request.auth = None
+
+    for _i in range(10):
+        assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+    # next window at 60, the previous 10 weigh 9 at 66
+    assert th.wait() == 36
+    assert th.get_cache_key(request) == "throttle_sliding_auth_8.8.8.8"
+    assert cache.get("throttle_sliding_auth_8.8.8.8:0") == 10
+
+    set_throttle_timer(th, 60)
+    assert th.allow_request(request) is False
+    assert th.wait() == pytest.approx(6)
+
+    set_throttle_timer(th, 66)
+    assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+    assert th.wait() == pytest.approx(6)
+    # rejected requests are not counted
+    assert cache.get("throttle_sliding_auth_8.8.8.8:1") == 1
+
+    # the previous window is not the one right before - it's not counted
+    set_throttle_timer(th, 200)
+    for _i in range(10):
+        assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+
+
+@pytest.mark.parametrize(
+    "throttle_class,scope",
+    [
+        (AnonGCRAThrottle, "anon"),
+        (AuthGCRAThrottle, "auth"),
+        (UserGCRAThrottle, "user"),
+        (AnonSlidingWindowThrottle, "anon"),
+        (AuthSlidingWindowThrottle, "auth"),
+        (UserSlidingWindowThrottle, "user"),
+    ],
+)
+def test_constant_state_throttles_scopes(throttle_class, scope):
+    th = throttle_class("1/s")
+    set_throttle_timer(th, 0)
+    assert th.scope == scope
+
+    request = build_request()
+    request.auth = None
+    request.user.is_authenticated = False
+    assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+    assert th.wait() > 0
+
+    set_throttle_timer(th, 2)
+    assert th.allow_request(request) is True
+
+    if scope == "anon":
+        request.auth = "some"
+        assert th.get_cache_key(request) is None
+        assert th.allow_request(request) is True
+        assert th.allow_request(request) is True
+
+
+def test_constant_state_throttles_in_api():
+    th = AnonGCRAThrottle("1/s")
+    set_throttle_timer(th, 0)
+    api = Penta(throttle=th)
+    api.get("/check")(lambda: "OK")
+    client = TestClient(api)
+
+    assert client.get("/check").status_code == 200
+    resp = client.get("/check")
+    assert resp.status_code == 429
+    assert th.wait() == 1
+
+
+def test_constant_state_throttles_no_rate():
+    from penta.conf import settings
+
+    with mock.patch.dict(settings.DEFAULT_THROTTLE_RATES, {"anon": None}):
+        assert AnonGCRAThrottle().allow_request(build_request()) is True
+        assert AnonSlidingWindowThrottle().allow_request(build_request()) is True
+    assert GCRARateThrottle("1/s").interval == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "throttle_class",
+    [AnonRateThrottle, AnonGCRAThrottle, AnonSlidingWindowThrottle],
+)
+async def test_aallow_request(throttle_class):
+    th = throttle_class("2/m")
+    set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+
+    assert await th.aallow_request(request) is True
+    # shares the state with the sync version
+    assert th.allow_request(request) is True
+    assert await th.aallow_request(request) is False
+    assert th.wait() > 0
+
+    request.auth = "some"
+    assert await th.aallow_request(request) is True
+
+
+@pytest.mark.asyncio
+async def test_async_operation_uses_aallow_request():
+    class CountingThrottle(AnonSlidingWindowThrottle):
+        calls = 0
+
+        async def aallow_request(self, request):
+            CountingThrottle.calls += 1
+            return await super().aallow_request(request)
+
+    class NoReadsThrottle(AnonSlidingWindowThrottle):
+        "overrides only allow_request - the sync version must be used"
+
+        def allow_request(self, request):
+            if request.method == "GET":
+                return True
+            return super().allow_request(request)  # pragma: no cover
+
+    api = Penta()
+
+    @api.get("/counting", throttle=CountingThrottle("1/m"))
+    async def counting():
+        return "OK"
+
+    @api.get("/no-reads", throttle=NoReadsThrottle("1/m"))
+    async def no_reads():
+        return "OK"
+
+    client = TestAsyncClient(api)
+    assert (await client.get("/counting")).status_code == 200
+    assert (await client.get("/counting")).status_code == 429
+    assert CountingThrottle.calls == 2
+
+    for _i in range(3):
+        assert (await client.get("/no-reads")).status_code == 200
+
+    compiled = Penta(compile_operations=True)
+    compiled.get("/counting", throttle=CountingThrottle("1/m"))(counting)
+    assert (await TestAsyncClient(compiled).get("/counting")).status_code == 429
+    assert CountingThrottle.calls == 3
+
+
+def test_has_aallow_request():
+    class CustomThrottle(BaseThrottle):
+        def allow_request(self, request):
+            return True
+
+    assert has_aallow_request(AnonRateThrottle("1/s"))
+    assert has_aallow_request(UserGCRAThrottle("1/s"))
+    assert not has_aallow_request(CustomThrottle())
+
+
+@pytest.mark.asyncio
+async def test_base_throttle_aallow_request():
+    threads = []
+
+    class CustomThrottle(BaseThrottle):
+        def allow_request(self, request):
+            threads.append(threading.current_thread())
+            return False
+
+    class CheapThrottle(CustomThrottle):
+        blocking = False
+
+    assert await CustomThrottle().aallow_request(build_request()) is False
+    assert await CheapThrottle().aallow_request(build_request()) is False
+    # a sync allow_request does not block the event loop
+    assert threads == [mock.ANY, threading.current_thread()]
+    assert threads[0] is not threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_sync_throttle_in_async_operation():
+    threads = []
+
+    class CustomThrottle(BaseThrottle):
+        def allow_request(self, request):
+            threads.append(threading.current_thread())
+            return len(threads) < 2
+
+    api = Penta()
+
+    @api.get("/async", throttle=CustomThrottle())
+    async def view():
+        return "OK"
+
+    client = TestAsyncClient(api)
+    assert (await client.get("/async")).status_code == 200
+    assert (await client.get("/async")).status_code == 429
+    assert threading.current_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_concurrency():
+    th = AnonSlidingWindowThrottle("50/m")
+    set_throttle_timer(th, 0)
+
+    def request_allowed(_):
+        request = build_request()
+        request.auth = None
+        return th.allow_request(request)
+
+    # the counter is incremented atomically - exactly 50 of 200 concurrent requests pass
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        results = list(executor.map(request_allowed, range(200)))
+    assert results.count(True) == 50
+
+    results = await asyncio.gather(*[
+        th.aallow_request(build_request()) for _i in range(20)
+    ])
+    assert not any(results)
+
+
+class SlowCache:
+    "Reads take a while - concurrent requests of a client read the same state"
+
+    def __getattr__(self, name):
+        return getattr(cache, name)
+
+    def get(self, *args, **kwargs):
+        time.sleep(0.001)
+        return cache.get(*args, **kwargs)
+
+    async def aget(self, *args, **kwargs):
+        await asyncio.sleep(0.001)
+        return await cache.aget(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("throttle_class", [AnonRateThrottle, AnonGCRAThrottle])
+async def test_scope_throttles_concurrency(throttle_class):
+    def create_throttle():
+        th = throttle_class("10/m")
+        th.cache = SlowCache()
+        set_throttle_timer(th, 0)
+        return th
+
+    def request_allowed(_):
+        return create_throttle().allow_request(build_request())
+
+    # the state of a key is updated under a lock - exactly 10 of 40 pass
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        results = list(executor.map(request_allowed, range(40)))
+    assert results.count(True) == 10
+
+    cache.clear()
+    th = create_throttle()
+    results = await asyncio.gather(*[th._acheck(build_request()) for _i in range(40)])
+    assert [allowed for allowed, _wait in results].count(True) == 10
+
+    # without the lock the same requests are over-admitted
+    cache.clear()
+    th.lock_state = False
+    results = await asyncio.gather(*[th._acheck(build_request()) for _i in range(40)])
+    assert [allowed for allowed, _wait in results].count(True) > 10
+
+
+@pytest.mark.asyncio
+async def test_concurrent_clients():
+    api = Penta()
+
+    @api.get("/", throttle=AnonSlidingWindowThrottle("1/m"))
+    async def view():
+        return "OK"
+
+    client = TestAsyncClient(api)
+    clients = ["1.1.1.1", "2.2.2.2"] * 5
+    responses = await asyncio.gather(*[
+        client.get("/", META={"REMOTE_ADDR": addr}) for addr in clients
+    ])
+    allowed = [a for a, r in zip(clients, responses) if r.status_code == 200]
+    assert sorted(allowed) == ["1.1.1.1", "2.2.2.2"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "throttle_class",
+    [AnonRateThrottle, AnonGCRAThrottle, AnonSlidingWindowThrottle],
+)
+async def test_concurrent_clients_state(throttle_class):
+    th = throttle_class("1/m")
+    set_throttle_timer(th, 0)
+    assert await th.aallow_request(build_request("1.1.1.1")) is True
+
+    # the requests of another client, checked meanwhile, don't mix up the state
+    clients = ["1.1.1.1", "3.3.3.3", "1.1.1.1", "1.1.1.1"]
+    results = await asyncio.gather(*[th._acheck(build_request(a)) for a in clients])
+    assert [allowed for allowed, _wait in results] == [False, True, False, False]
+    assert len({wait for _allowed, wait in results if wait is not None}) == 1
+    assert await th.aallow_request(build_request("3.3.3.3")) is False
+
+
+class CountingCache:
+    "Wraps the cache counting the calls"
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(cache, name)
+
+        def call(*args, **kwargs):
+            self.calls.append(name)
+            return method(*args, **kwargs)
+
+        return call
+
+
+def test_check_throttles_batches_cache_calls():
+    counting_cache = CountingCache()
+    throttles = [
+        AnonRateThrottle("2/s"),
+        AuthGCRAThrottle("3/m"),
+        UserRateThrottle("10/d"),
+    ]
+    for th in throttles:
+        th.cache = counting_cache
+        th.lock_state = False
+        set_throttle_timer(th, 0)
+
+    request = build_request()
+    request.auth = None
+    request.user.is_authenticated = False
+
+    with mock.patch.object(
+        BaseThrottle, "_parse_ident", autospec=True, return_value="1.2.3.4"
+    ) as parse_ident:
+        assert check_throttles(request, throttles) == []
+        assert check_throttles(request, throttles) == []
+    parse_ident.assert_called_once()
+    assert counting_cache.calls == ["get_many", "set_many"] * 2
+
+    # the same state as with allow_request
+    assert cache.get("throttle_anon_1.2.3.4") == [0, 0]
+    assert cache.get("throttle_gcra_auth_1.2.3.4") == 40
+    assert throttles[0].allow_request(request) is False
+
+    durations = check_throttles(request, throttles)
+    assert durations == [throttles[0].wait()]
+    assert cache.get("throttle_gcra_auth_1.2.3.4") == 60
+    assert check_throttles(request, throttles) == [1.0, 20]
+
+
+def test_check_throttles_not_batched():
+    class NoReadsThrottle(AnonRateThrottle):
+        def allow_request(self, request):
+            return request.method == "GET"
+
+    request = build_request()
+    request.auth = None
+    throttles = [NoReadsThrottle("1/s"), AnonSlidingWindowThrottle("1/s")]
+    for th in throttles:
+        set_throttle_timer(th, 0)
+
+    assert check_throttles(request, throttles) == []
+    assert check_throttles(request, throttles) == [throttles[1].wait()]
+    assert cache.get("throttle_anon_8.8.8.8") is None
+
+
+@pytest.mark.asyncio
+async def test_check_throttles_with_hooks():
+    class LoggedThrottle(AnonRateThrottle):
+        "overrides only the hooks - they must be called"
+
+        calls: List[str] = []
+
+        def throttle_success(self):
+            self.calls.append("success")
+            return super().throttle_success()
+
+        def throttle_failure(self):
+            self.calls.append("failure")
+            return super().throttle_failure()
+
+    th = LoggedThrottle("1/m")
+    set_throttle_timer(th, 0)
+    assert not has_aallow_request(th)
+    request = build_request()
+
+    assert check_throttles(request, [th]) == []
+    assert len(check_throttles(request, [th])) == 1
+    assert LoggedThrottle.calls == ["success", "failure"]
+    assert len(await acheck_throttles(request, [th])) == 1
+    assert LoggedThrottle.calls == ["success", "failure", "failure"]
+
+
+@pytest.mark.asyncio
+async def test_acheck_throttles():
+    throttles = [AnonRateThrottle("1/s"), AnonGCRAThrottle("1/s")]
+    for th in throttles:
+        th.lock_state = False
+        set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+
+    with mock.patch.object(cache, "aget_many", wraps=cache.aget_many) as aget_many:
+        assert await acheck_throttles(request, throttles) == []
+        assert await acheck_throttles(request, throttles) == [1.0, 1.0]
+    assert aget_many.call_count == 2
+
+
+def test_ident_cached_per_request():
+    from penta.conf import settings
+
+    th = AnonRateThrottle("1/s")
+    request = build_request(x_forwarded_for="8.8.8.8,127.0.0.1")
+    with mock.patch.object(settings, "NUM_PROXIES", 1):
+        assert th.get_ident(request) == "127.0.0.1"
+        request.META["HTTP_X_FORWARDED_FOR"] = "1.1.1.1"
+        assert th.get_ident(request) == "127.0.0.1"
+    assert th.get_ident(request) == "1.1.1.1"
+
+
+def test_two_tier_local_budget():
+    counting_cache = CountingCache()
+    th = AnonTwoTierThrottle("100/m", tolerance=0.1)
+    th.cache = counting_cache
+    set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+    assert th.lease_size == 10
+
+    assert all(th.allow_request(request) for _i in range(25))
+    # 3 leases of 10 requests
+    assert counting_cache.calls.count("incr") == 3
+    assert cache.get("throttle_tiered_anon_8.8.8.8:0") == 30
+
+
+def test_two_tier_shared_limit():
+    # two processes sharing the cache
+    workers = [AnonTwoTierThrottle("10/m", tolerance=0.3) for _i in range(2)]
+    for th in workers:
+        set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+
+    results = [th.allow_request(request) for _i in range(10) for th in workers]
+    # never more than the limit, at most one unused lease of 3 per process
+    assert 10 - 2 * 3 <= results.count(True) <= 10
+    assert workers[0].allow_request(request) is False
+    assert workers[0].wait() == 60
+
+    # the exhausted window is remembered - no cache round-trip
+    workers[0].cache = CountingCache()
+    assert workers[0].allow_request(request) is False
+    assert workers[0].cache.calls == []
+
+    set_throttle_timer(workers[0], 60)
+    assert workers[0].allow_request(request) is True
+    assert workers[0].wait() == 60
+
+
+def test_two_tier_partial_lease():
+    th = AnonTwoTierThrottle("5/m", tolerance=0.5)
+    set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+    cache.set("throttle_tiered_anon_8.8.8.8:0", 3)
+
+    # only 2 requests of the lease of 2 fit (3 + 2 = 5)
+    assert th.allow_request(request) is True
+    assert th.allow_request(request) is True
+    assert th.allow_request(request) is False
+
+
+@pytest.mark.parametrize("fail_open", [True, False])
+def test_two_tier_cache_failure(fail_open):
+    th = AnonTwoTierThrottle("5/m", fail_open=fail_open)
+    th.cache = mock.Mock(incr=mock.Mock(side_effect=ConnectionError))
+    set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+
+    with mock.patch("penta.throttling.logger") as logger:
+        assert th.allow_request(request) is fail_open
+    logger.warning.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_two_tier_async():
+    th = AnonTwoTierThrottle("2/m", tolerance=0.5)
+    set_throttle_timer(th, 0)
+    request = build_request()
+    request.auth = None
+
+    assert await th.aallow_request(request) is True
+    assert await th.aallow_request(request) is True
+    assert await th.aallow_request(request) is False
+
+    th.cache = mock.Mock(aadd=mock.AsyncMock(side_effect=ConnectionError))
+    set_throttle_timer(th, 60)
+    with mock.patch("penta.throttling.logger"):
+        assert await th.aallow_request(request) is True
+
+    request.auth = "some"
+    assert await th.aallow_request(request) is True
+    assert AnonTwoTierThrottle().allow_request(request) is True
+
+
+@pytest.mark.asyncio
+async def test_two_tier_concurrent_clients():
+    th = AnonTwoTierThrottle("20/m", tolerance=0.25)
+    set_throttle_timer(th, 0)
+    api = Penta()
+
+    @api.get("/", throttle=th)
+    async def view():
+        return "OK"
+
+    client = TestAsyncClient(api)
+    allowed = {"1.1.1.1": 0, "2.2.2.2": 0}
+    for _i in range(25):
+        responses = await asyncio.gather(*[
+            client.get("/", META={"REMOTE_ADDR": addr}) for addr in allowed
+        ])
+        for addr, response in zip(allowed, responses):
+            allowed[addr] += response.status_code == 200
+    # every lease is stored for the client that took it
+    assert allowed == {"1.1.1.1": 20, "2.2.2.2": 20}
+
+    allowed, wait = await th._acheck(build_request("1.1.1.1"))
+    assert (allowed, wait) == (False, 60)
+
+
+def test_two_tier_local_keys_limit():
+    th = AuthTwoTierThrottle("10/m")
+    th.max_local_keys = 2
+    set_throttle_timer(th, 0)
+    for addr in ("1.1.1.1", "2.2.2.2", "3.3.3.3"):
+        request = build_request(addr)
+        request.auth = None
+        assert th.allow_request(request) is True
+    assert list(th._budgets) == [
+        "throttle_tiered_auth_2.2.2.2",
+        "throttle_tiered_auth_3.3.3.3",
+    ]
+    assert UserTwoTierThrottle("1/s").scope == "user"
+
+
+@pytest.mark.parametrize("compile_operations", [False, True])
+def test_concurrency_throttle(compile_operations):
+    th = AuthConcurrencyThrottle(1, retry_after=5)
+    api = Penta(throttle=th, compile_operations=compile_operations)
+    client = TestClient(api)
+    inner = []
+
+    @api.get("/report")
+    def report():
+        # a second request while this one is in flight
+        inner.append(client.get("/report"))
+        return "OK"
+
+    @api.get("/fail")
+    def fail():
+        raise RuntimeError("boom")
+
+    assert client.get("/report").status_code == 200
+    assert inner[0].status_code == 429
+    assert inner[0]["Retry-After"] == "5"
+    assert th.wait() == 5
+    assert th.backend.counts == {}
+
+    # released when the view raises
+    with pytest.raises(RuntimeError):
+        client.get("/fail")
+    assert th.backend.counts == {}
+    assert client.get("/report").status_code == 200
+
+
+@pytest.mark.django_db  # response.close() sends request_finished
+def test_concurrency_throttle_streaming():
+    th = AnonConcurrencyThrottle(1)
+    api = Penta(throttle=th)
+    api.get("/items", response=List[int], stream=True)(lambda: iter([1, 2]))
+    request = build_request()
+    request.auth = None
+
+    operation = api.default_router.path_operations["/items"].operations[0]
+    response = operation.run(request)
+    assert response.streaming
+    assert th.allow_request(request) is False
+    response.close()
+    assert th.backend.counts == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrency_throttle_async():
+    th = UserConcurrencyThrottle(2, backend=CacheConcurrencyBackend())
+    other = AnonRateThrottle("1/m")
+    api = Penta(throttle=[th, other])
+    client = TestAsyncClient(api)
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    @api.get("/report")
+    async def report():
+        started.set()
+        await finish.wait()
+        return "OK"
+
+    first = asyncio.create_task(client.get("/report"))
+    await started.wait()
+    key = "throttle_concurrency_user_127.0.0.1"
+    assert cache.get(key) == 1
+
+    # rejected by the rate throttle - the slot is released anyway
+    assert (await client.get("/report")).status_code == 429
+    assert cache.get(key) == 1
+
+    finish.set()
+    assert (await first).status_code == 200
+    assert cache.get(key) == 0
+
+
+def test_concurrency_backends():
+    local = LocalConcurrencyBackend()
+    assert local.acquire("a", 2) and local.acquire("a", 2)
+    assert not local.acquire("a", 2)
+    local.release("a")
+    assert local.counts == {"a": 1}
+
+    shared = CacheConcurrencyBackend(timeout=60)
+    assert shared.acquire("a", 1)
+    assert not shared.acquire("a", 1)
+    assert cache.get("a") == 1
+    cache.delete("a")
+    shared.release("a")  # expired - nothing to release
+
+    request = build_request()
+    request.auth = "some"
+    assert AnonConcurrencyThrottle(1).allow_request(request) is True
+    release_concurrency_slots(request)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_backends_async():
+    local = LocalConcurrencyBackend()
+    assert await local.aacquire("a", 1)
+    await local.arelease("a")
+    assert local.counts == {}
+
+    shared = CacheConcurrencyBackend()
+    assert await shared.aacquire("b", 1)
+    assert not await shared.aacquire("b", 1)
+    cache.delete("b")
+    await shared.arelease("b")
+
+    # atomic under concurrent requests
+    results = await asyncio.gather(*[shared.aacquire("c", 3) for _i in range(10)])
+    assert results.count(True) == 3
+    assert cache.get("c") == 3
+
+
 def set_throttle_timer(throttle: BaseThrottle, value: int):
     """
     Explicitly set the timer, overriding time.time()